@@ -1,16 +1,29 @@
 """
 Communication endpoints for Email and SMS
 """
-from fastapi import APIRouter, HTTPException, BackgroundTasks
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Query
+from fastapi.responses import ORJSONResponse, Response
 from pydantic import BaseModel, Field
-from typing import Optional, List, Dict, Any
-from datetime import datetime
-
+from typing import Optional
 from app.services.email_service import email_service
 from app.services.sms_service import sms_service
+from app.timestamps import utc_now
+
+
+router = APIRouter(default_response_class=ORJSONResponse)
 
+# Empty TwiML reply - tells Twilio the message was handled and sends nothing back
+EMPTY_TWIML = '<?xml version="1.0" encoding="UTF-8"?><Response></Response>'
 
-router = APIRouter()
+
+def success_response(**fields) -> ORJSONResponse:
+    """
+    Build a success envelope serialized straight by orjson
+
+    Returning the response object skips FastAPI's jsonable_encoder walk over
+    the payload; every field here is already JSON-native or a datetime.
+    """
+    return ORJSONResponse({"status": "success", **fields, "timestamp": utc_now()})
 
 
 # Request/Response Models
@@ -18,7 +31,7 @@ class EmailForwardRequest(BaseModel):
     subject: str = Field(..., description="Email subject")
     from_email: str = Field(..., alias="from", description="Sender email address")
     body: str = Field(..., description="Email body")
-    attachments: Optional[List[str]] = Field(default=None, description="List of attachment URLs or IDs")
+    attachments: Optional[list[str]] = Field(default=None, description="List of attachment URLs or IDs")
 
 
 class SMSRequest(BaseModel):
@@ -44,12 +57,7 @@ async def get_email_inbox(limit: int = 50):
     """
     try:
         emails = await email_service.get_emails(limit=limit)
-        return {
-            "status": "success",
-            "count": len(emails),
-            "emails": emails,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        return success_response(count=len(emails), emails=emails)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve emails: {str(e)}")
 
@@ -62,14 +70,17 @@ async def forward_email(email_data: EmailForwardRequest, background_tasks: Backg
     Accepts email data and routes it to the appropriate AI agent for processing.
     """
     try:
-        result = await email_service.forward_email_to_agent(email_data.model_dump())
-
-        return {
-            "status": "success",
-            "message": "Email received and queued for processing",
-            "email_id": result.get("email_id"),
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        result = await email_service.forward_email_to_agent(
+            subject=email_data.subject,
+            from_email=email_data.from_email,
+            body=email_data.body,
+            attachments=email_data.attachments
+        )
+
+        return success_response(
+            message="Email received and queued for processing",
+            email_id=result.get("email_id")
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process email: {str(e)}")
 
@@ -88,17 +99,16 @@ async def send_sms(sms_request: SMSRequest):
             message=sms_request.message
         )
 
-        return {
-            "status": "success",
-            "data": result,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        return success_response(data=result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/sms/history", tags=["SMS"])
-async def get_sms_history(limit: int = 50):
+async def get_sms_history(
+    # Sent to Twilio as PageSize, which must be 1-1000
+    limit: int = Query(50, ge=1, le=1000, description="Maximum number of messages to return")
+):
     """
     Get SMS message history
 
@@ -107,17 +117,12 @@ async def get_sms_history(limit: int = 50):
     try:
         messages = await sms_service.get_message_history(limit=limit)
 
-        return {
-            "status": "success",
-            "count": len(messages),
-            "messages": messages,
-            "timestamp": datetime.utcnow().isoformat()
-        }
+        return success_response(count=len(messages), messages=messages)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to retrieve SMS history: {str(e)}")
 
 
-@router.post("/sms/webhook", tags=["SMS"])
+@router.post("/sms/webhook", tags=["SMS"], response_class=Response)
 async def sms_webhook(webhook_data: SMSWebhookRequest):
     """
     Twilio SMS webhook endpoint
@@ -126,13 +131,15 @@ async def sms_webhook(webhook_data: SMSWebhookRequest):
     Configure this URL in your Twilio console: https://your-domain.com/api/sms/webhook
     """
     try:
-        result = await sms_service.receive_webhook(webhook_data.model_dump())
+        await sms_service.receive_webhook(
+            message_sid=webhook_data.MessageSid,
+            from_number=webhook_data.From,
+            to_number=webhook_data.To,
+            body=webhook_data.Body
+        )
 
-        # You can add TwiML response here if needed
-        return {
-            "status": "success",
-            "message": result.get("message")
-        }
+        # Twilio acts on TwiML, so a reply goes inside <Response> rather than a separate send_sms call
+        return Response(content=EMPTY_TWIML, media_type="application/xml")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to process webhook: {str(e)}")
 
@@ -155,5 +162,5 @@ async def get_communication_status():
             "configured": bool(sms_service.account_sid),
             "from_number": sms_service.from_number
         },
-        "timestamp": datetime.utcnow().isoformat()
+        "timestamp": utc_now()
     }
@@ -5,18 +5,51 @@ These endpoints demonstrate the conversational capabilities of Gemini,
 allowing multi-turn conversations with context preservation.
 """
 
-from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel, Field
-from typing import List, Dict, Any, Optional
+from fastapi import APIRouter, HTTPException, Query, Request, status
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Optional
 import os
+import hashlib
 from datetime import datetime
+from functools import lru_cache
 
 from app.specialists.gemini_adapter import GeminiAdapter
+from app.services.conversation_store import conversation_store
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Store active conversations (in production, use Redis or database)
-active_conversations: Dict[str, GeminiAdapter] = {}
+
+@lru_cache(maxsize=1)
+def get_gemini_api_key() -> Optional[str]:
+    """
+    Read the Gemini API key once per worker
+
+    A process can't see changes made to its environment from outside, so
+    after rotating GOOGLE_AI_API_KEY restart the workers to pick it up.
+    """
+    return os.getenv("GOOGLE_AI_API_KEY")
+
+
+# OpenAPI examples for the request models
+CONVERSATION_START_EXAMPLE = {
+    "system_instruction": "You are a legal assistant helping with personal injury cases.",
+    "initial_message": "What are the key elements I need to prove negligence?"
+}
+
+CONVERSATION_CONTINUE_EXAMPLE = {
+    "conversation_id": "conv-1234567890",
+    "message": "Can you give me a specific example?"
+}
+
+MULTI_TURN_CHAT_EXAMPLE = {
+    "system_instruction": "You are a legal research assistant.",
+    "messages": [
+        {"role": "user", "content": "What is negligence?"},
+        {"role": "assistant", "content": "Negligence is a legal concept..."},
+        {"role": "user", "content": "Can you give an example?"}
+    ]
+}
 
 
 class ConversationStartRequest(BaseModel):
@@ -28,13 +61,7 @@ class ConversationStartRequest(BaseModel):
     initial_message: str = Field(..., description="The first message to send")
     conversation_id: Optional[str] = Field(None, description="Optional custom conversation ID")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "system_instruction": "You are a legal assistant helping with personal injury cases.",
-                "initial_message": "What are the key elements I need to prove negligence?"
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra={"example": CONVERSATION_START_EXAMPLE})
 
 
 class ConversationContinueRequest(BaseModel):
@@ -42,37 +69,23 @@ class ConversationContinueRequest(BaseModel):
     conversation_id: str = Field(..., description="The ID of the conversation to continue")
     message: str = Field(..., description="The message to send")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "conversation_id": "conv-1234567890",
-                "message": "Can you give me a specific example?"
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra={"example": CONVERSATION_CONTINUE_EXAMPLE})
 
 
 class ChatMessage(BaseModel):
     """A single chat message"""
     role: str = Field(..., description="Role: 'user' or 'assistant'")
     content: str = Field(..., description="The message content")
+    
+    model_config = ConfigDict(frozen=True)
 
 
 class MultiTurnChatRequest(BaseModel):
     """Request for a multi-turn chat without storing conversation state"""
-    messages: List[ChatMessage] = Field(..., description="List of messages in the conversation")
+    messages: list[ChatMessage] = Field(..., description="List of messages in the conversation")
     system_instruction: Optional[str] = Field(None, description="Optional system instruction")
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "system_instruction": "You are a legal research assistant.",
-                "messages": [
-                    {"role": "user", "content": "What is negligence?"},
-                    {"role": "assistant", "content": "Negligence is a legal concept..."},
-                    {"role": "user", "content": "Can you give an example?"}
-                ]
-            }
-        }
+    model_config = ConfigDict(frozen=True, json_schema_extra={"example": MULTI_TURN_CHAT_EXAMPLE})
 
 
 @router.post("/conversation/start", status_code=status.HTTP_200_OK)
@@ -90,7 +103,7 @@ async def start_conversation(request: ConversationStartRequest):
     """
     try:
         # Check for API key
-        api_key = os.getenv("GOOGLE_AI_API_KEY")
+        api_key = get_gemini_api_key()
         if not api_key:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -110,7 +123,11 @@ async def start_conversation(request: ConversationStartRequest):
         response = await adapter.add_to_conversation(request.initial_message)
         
         # Store conversation
-        active_conversations[conversation_id] = adapter
+        await conversation_store.save(
+            conversation_id,
+            adapter.conversation_history,
+            adapter.system_instruction
+        )
         
         return {
             "status": "success",
@@ -145,17 +162,29 @@ async def continue_conversation(request: ConversationContinueRequest):
     """
     try:
         # Get the conversation
-        if request.conversation_id not in active_conversations:
+        state = await conversation_store.get(request.conversation_id)
+        if state is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Conversation '{request.conversation_id}' not found. It may have expired."
             )
         
-        adapter = active_conversations[request.conversation_id]
+        # Rehydrate the adapter from the stored state
+        adapter = GeminiAdapter(
+            api_key=get_gemini_api_key(),
+            system_instruction=state["system_instruction"]
+        )
+        adapter.conversation_history = state["history"]
         
         # Continue the conversation
         response = await adapter.add_to_conversation(request.message)
         
+        await conversation_store.save(
+            request.conversation_id,
+            adapter.conversation_history,
+            adapter.system_instruction
+        )
+        
         return {
             "status": "success",
             "conversation_id": request.conversation_id,
@@ -178,27 +207,36 @@ async def continue_conversation(request: ConversationContinueRequest):
 
 
 @router.get("/conversation/{conversation_id}/history", status_code=status.HTTP_200_OK)
-async def get_conversation_history(conversation_id: str):
+async def get_conversation_history(
+    conversation_id: str,
+    offset: int = Query(0, ge=0, description="Index of the first message to return"),
+    limit: Optional[int] = Query(None, ge=1, description="Maximum number of messages to return")
+):
     """
-    Get the full history of a conversation
+    Get the history of a conversation
     
-    Returns all messages in the conversation.
+    Returns the messages in the conversation, optionally paginated with offset/limit.
+    Turns older than the adapter's window appear as a single 'system' summary message.
     """
     try:
-        if conversation_id not in active_conversations:
+        state = await conversation_store.get(conversation_id)
+        if state is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Conversation '{conversation_id}' not found"
             )
         
-        adapter = active_conversations[conversation_id]
+        history = state["history"]
+        end = len(history) if limit is None else offset + limit
         
         return {
             "status": "success",
             "conversation_id": conversation_id,
-            "message_count": len(adapter.conversation_history),
-            "history": adapter.conversation_history,
-            "system_instruction": adapter.system_instruction
+            "message_count": len(history),
+            "offset": offset,
+            "limit": limit,
+            "history": history[offset:end],
+            "system_instruction": state["system_instruction"]
         }
         
     except HTTPException:
@@ -210,28 +248,27 @@ async def get_conversation_history(conversation_id: str):
         )
 
 
-@router.delete("/conversation/{conversation_id}", status_code=status.HTTP_200_OK)
+@router.delete(
+    "/conversation/{conversation_id}",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response
+)
 async def end_conversation(conversation_id: str):
     """
     End and delete a conversation
     
     Clears the conversation history and removes it from memory.
+    Returns 204 No Content on success.
     """
     try:
-        if conversation_id not in active_conversations:
+        # Remove the conversation
+        if not await conversation_store.delete(conversation_id):
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Conversation '{conversation_id}' not found"
             )
         
-        # Remove the conversation
-        del active_conversations[conversation_id]
-        
-        return {
-            "status": "success",
-            "message": f"Conversation '{conversation_id}' ended and deleted",
-            "conversation_id": conversation_id
-        }
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
         
     except HTTPException:
         raise
@@ -256,7 +293,7 @@ async def multi_turn_chat(request: MultiTurnChatRequest):
     """
     try:
         # Check for API key
-        api_key = os.getenv("GOOGLE_AI_API_KEY")
+        api_key = get_gemini_api_key()
         if not api_key:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -294,40 +331,53 @@ async def multi_turn_chat(request: MultiTurnChatRequest):
 
 
 @router.get("/conversations/active", status_code=status.HTTP_200_OK)
-async def list_active_conversations():
+async def list_active_conversations(
+    request: Request,
+    limit: int = Query(100, ge=1, le=1000, description="Maximum number of conversations to return"),
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page")
+):
     """
     List all active conversations
     
-    Returns a list of conversation IDs that are currently active.
+    Returns a page of conversation IDs that are currently active. The response
+    carries an ETag; polling clients that send it back in If-None-Match get a
+    304 until a conversation is started, continued or removed.
     """
-    return {
-        "status": "success",
-        "total_conversations": len(active_conversations),
-        "conversations": [
-            {
-                "conversation_id": conv_id,
-                "message_count": len(adapter.conversation_history),
-                "has_system_instruction": adapter.system_instruction is not None
-            }
-            for conv_id, adapter in active_conversations.items()
-        ]
-    }
-
-
-@router.post("/conversations/clear-all", status_code=status.HTTP_200_OK)
+    version = await conversation_store.version()
+    page_key = hashlib.sha1(f"{cursor or ''}:{limit}".encode()).hexdigest()[:16]
+    etag = f'"{version}-{page_key}"'
+    
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+    
+    conversations, next_cursor, total = await conversation_store.list_summaries(limit, cursor)
+    
+    return ORJSONResponse(
+        {
+            "status": "success",
+            "total_conversations": total,
+            "conversations": conversations,
+            "next_cursor": next_cursor
+        },
+        headers={"ETag": etag}
+    )
+
+
+@router.post(
+    "/conversations/clear-all",
+    status_code=status.HTTP_204_NO_CONTENT,
+    response_class=Response
+)
 async def clear_all_conversations():
     """
     Clear all active conversations
     
     Use with caution - this removes all stored conversations.
+    Returns 204 No Content; the number removed is in the X-Cleared-Count header.
     """
-    count = len(active_conversations)
-    active_conversations.clear()
+    count = await conversation_store.clear()
     
-    return {
-        "status": "success",
-        "message": f"Cleared {count} conversation(s)",
-        "cleared_count": count
-    }
-
-
+    return Response(
+        status_code=status.HTTP_204_NO_CONTENT,
+        headers={"X-Cleared-Count": str(count)}
+    )
@@ -5,20 +5,115 @@ Handles document uploads (PDF, images, Word, Excel) and sends
 extracted text to the orchestrator for task detection and routing.
 """
 
-from fastapi import APIRouter, UploadFile, File, HTTPException, status, Form
-from typing import Optional, List
+from fastapi import APIRouter, UploadFile, File, HTTPException, status, Form, Depends
+from fastapi.responses import ORJSONResponse
+from typing import Optional, List, Tuple, Dict, Any
 from pydantic import BaseModel
-import os
+from contextlib import ExitStack
+from functools import lru_cache
+import asyncio
+import hashlib
+import tempfile
 
 from app.services.document_processor import DocumentProcessor
+from app.services.document_cache import document_cache, CONTENT_HASH_LENGTH
 from orchestrator.tender_orchestrator import TenderOrchestrator, SourceType
-from orchestrator.advanced_router import TaskRouter
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Initialize services
-document_processor = DocumentProcessor()
-orchestrator = TenderOrchestrator(use_ai_routing=True)
+
+# Services are created on first use rather than at import time
+@lru_cache(maxsize=1)
+def get_document_processor() -> DocumentProcessor:
+    """Get the shared DocumentProcessor instance"""
+    return DocumentProcessor()
+
+
+@lru_cache(maxsize=1)
+def get_orchestrator() -> TenderOrchestrator:
+    """Get the shared TenderOrchestrator instance"""
+    return TenderOrchestrator(use_ai_routing=True)
+
+
+# Uploads are copied in 1MB chunks and spill to disk above 1MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+SPOOL_MAX_MEMORY = 1024 * 1024
+
+# Maximum number of batch files processed at the same time
+BATCH_CONCURRENCY = 4
+
+def _declared_size(file: UploadFile) -> int:
+    """Get the upload size known before reading it (0 if unknown)"""
+    if file.size is not None:
+        return file.size
+    return int(file.headers.get("content-length", 0) or 0)
+
+
+def _payload_too_large(detail: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=detail
+    )
+
+
+def _check_declared_size(file: UploadFile, max_bytes: int):
+    """Raise 413 if the upload's declared size is over the limit"""
+    if _declared_size(file) > max_bytes:
+        raise _payload_too_large(
+            f"File '{file.filename}' exceeds the maximum allowed size of "
+            f"{max_bytes / 1024 / 1024:.1f}MB"
+        )
+
+
+async def _extract_document(
+    document_processor: DocumentProcessor,
+    file: UploadFile,
+    spooled: tempfile.SpooledTemporaryFile,
+    file_size: int,
+    known_hash: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Run document extraction for a spooled upload on the processor's thread pool
+
+    With the upload's content hash, a cached result for identical bytes is reused.
+    """
+    return await document_processor.process_document_stream(
+        file_obj=spooled,
+        filename=file.filename,
+        content_type=file.content_type,
+        file_size=file_size,
+        known_hash=known_hash
+    )
+
+
+async def _spool_upload(
+    file: UploadFile,
+    max_bytes: int
+) -> Tuple[tempfile.SpooledTemporaryFile, int, str]:
+    """
+    Stream an upload into a spooled temporary file
+
+    Raises 413 as soon as more than max_bytes have been read.
+    Returns the temp file (rewound to the start), the number of bytes written
+    and the truncated SHA-256 of the content.
+    """
+    spooled = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_MEMORY)
+    digest = hashlib.sha256()
+    file_size = 0
+
+    while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+        file_size += len(chunk)
+        if file_size > max_bytes:
+            spooled.close()
+            raise _payload_too_large(
+                f"File '{file.filename}' exceeds the maximum allowed size of "
+                f"{max_bytes / 1024 / 1024:.1f}MB"
+            )
+        spooled.write(chunk)
+        digest.update(chunk)
+
+    spooled.seek(0)
+    return spooled, file_size, digest.hexdigest()[:CONTENT_HASH_LENGTH]
 
 
 class DocumentProcessResponse(BaseModel):
@@ -45,7 +140,9 @@ class DocumentAnalysisResponse(BaseModel):
 async def upload_document(
     file: UploadFile = File(...),
     case_id: Optional[str] = Form(None),
-    auto_process: bool = Form(True)
+    auto_process: bool = Form(True),
+    document_processor: DocumentProcessor = Depends(get_document_processor),
+    orchestrator: TenderOrchestrator = Depends(get_orchestrator)
 ) -> DocumentAnalysisResponse:
     """
     Upload a document for processing
@@ -73,23 +170,26 @@ async def upload_document(
                 detail="No file provided"
             )
 
-        # Read file content
-        file_content = await file.read()
+        # Reject oversized uploads before touching the body
+        max_file_size = document_processor.max_file_size
+        _check_declared_size(file, max_file_size)
 
-        if not file_content:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="Empty file provided"
-            )
+        # Stream file content to a temp file
+        spooled, file_size, content_hash = await _spool_upload(file, max_file_size)
 
-        # Process document to extract text
-        print(f"Processing document: {file.filename} ({len(file_content)} bytes)")
+        with spooled:
+            if not file_size:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Empty file provided"
+                )
 
-        doc_result = await document_processor.process_document(
-            file_content=file_content,
-            filename=file.filename,
-            content_type=file.content_type
-        )
+            # Process document to extract text
+            print(f"Processing document: {file.filename} ({file_size} bytes)")
+
+            doc_result = await _extract_document(
+                document_processor, file, spooled, file_size, content_hash
+            )
 
         if not doc_result.get("success"):
             raise HTTPException(
@@ -140,10 +240,35 @@ async def upload_document(
         )
 
 
+async def _process_batch_file(
+    document_processor: DocumentProcessor,
+    file: UploadFile,
+    spooled: tempfile.SpooledTemporaryFile,
+    file_size: int,
+    semaphore: asyncio.Semaphore
+) -> Dict[str, Any]:
+    """Extract text from one spooled batch file on the OCR pool"""
+    async with semaphore:
+        return await _extract_document(document_processor, file, spooled, file_size)
+
+
+def _batch_result(file: UploadFile, doc_result: Dict[str, Any]) -> Dict[str, Any]:
+    """Summarize one batch file's processing result"""
+    return {
+        "filename": file.filename,
+        "success": doc_result.get("success", False),
+        "text_length": len(doc_result.get("text_content", "")),
+        "pages": doc_result.get("pages", 0),
+        "extraction_method": doc_result.get("extraction_method", "unknown")
+    }
+
+
 @router.post("/batch-upload", status_code=status.HTTP_200_OK)
 async def batch_upload_documents(
     files: List[UploadFile] = File(...),
-    case_id: Optional[str] = Form(None)
+    case_id: Optional[str] = Form(None),
+    document_processor: DocumentProcessor = Depends(get_document_processor),
+    orchestrator: TenderOrchestrator = Depends(get_orchestrator)
 ):
     """
     Upload multiple documents at once
@@ -156,40 +281,101 @@ async def batch_upload_documents(
             detail="No files provided"
         )
 
-    results = []
-    errors = []
+    # Reject the whole batch before reading any file if one can't be processed
+    max_file_size = document_processor.max_file_size
+    max_batch_size = document_processor.max_batch_size
+    declared_sizes = [_declared_size(file) for file in files]
 
     for file in files:
+        if not file.filename:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Every file in a batch must have a filename"
+            )
         try:
-            # Process each file
-            file_content = await file.read()
-
-            doc_result = await document_processor.process_document(
-                file_content=file_content,
-                filename=file.filename,
-                content_type=file.content_type
+            document_processor.resolve_document_type(file.filename, file.content_type)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"File '{file.filename}': {e}"
             )
+        _check_declared_size(file, max_file_size)
+    if sum(declared_sizes) > max_batch_size:
+        raise _payload_too_large(
+            f"Batch exceeds the maximum allowed total size of {max_batch_size / 1024 / 1024}MB"
+        )
 
-            results.append({
-                "filename": file.filename,
-                "success": doc_result.get("success", False),
-                "text_length": len(doc_result.get("text_content", "")),
-                "pages": doc_result.get("pages", 0),
-                "extraction_method": doc_result.get("extraction_method", "unknown")
-            })
+    results = []
+    errors = []
+    remaining_budget = max_batch_size
+
+    with ExitStack() as spooled_files:
+        # Spool every upload first so the batch budget is enforced in order
+        pending = []
+        for file in files:
+            try:
+                spooled, file_size, content_hash = await _spool_upload(
+                    file,
+                    min(max_file_size, remaining_budget)
+                )
+            except HTTPException:
+                raise
+            except Exception as e:
+                errors.append({
+                    "filename": file.filename,
+                    "error": str(e)
+                })
+                continue
+
+            spooled_files.enter_context(spooled)
+            remaining_budget -= file_size
+            pending.append((file, spooled, file_size, content_hash))
+
+        # Look up every file's cached result in one round-trip
+        cached_results = await document_cache.get_many(
+            [content_hash for _, _, _, content_hash in pending]
+        )
+
+        # Process each distinct uncached file concurrently, capped by the semaphore
+        uncached = {}
+        for entry, cached in zip(pending, cached_results):
+            if cached is None:
+                uncached.setdefault(entry[3], entry)
+
+        semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+        outcomes = await asyncio.gather(
+            *[
+                _process_batch_file(document_processor, file, spooled, file_size, semaphore)
+                for file, spooled, file_size, _ in uncached.values()
+            ],
+            return_exceptions=True
+        )
 
-        except Exception as e:
+    processed = dict(zip(uncached.keys(), outcomes))
+    await document_cache.set_many({
+        content_hash: outcome
+        for content_hash, outcome in processed.items()
+        if not isinstance(outcome, Exception) and outcome.get("success")
+    })
+
+    texts_by_file = []
+    for (file, _, _, content_hash), cached in zip(pending, cached_results):
+        outcome = cached if cached is not None else processed[content_hash]
+        if isinstance(outcome, Exception):
             errors.append({
                 "filename": file.filename,
-                "error": str(e)
+                "error": str(outcome)
             })
+        else:
+            results.append(_batch_result(file, outcome))
+            texts_by_file.append((file.filename, outcome.get("text_content", "")))
 
     # Combine all extracted text and send to orchestrator
-    combined_text = "\n\n---\n\n".join([
-        f"Document: {r['filename']}\n{results[i].get('text_content', '')}"
-        for i, r in enumerate(results)
-        if r.get("text_content")
-    ])
+    combined_text = "\n\n---\n\n".join(
+        f"Document: {filename}\n{text}"
+        for filename, text in texts_by_file
+        if text
+    )
 
     orchestrator_result = None
     if combined_text:
@@ -213,35 +399,45 @@ async def batch_upload_documents(
 
 
 @router.get("/supported-types", status_code=status.HTTP_200_OK)
-async def get_supported_types():
+async def get_supported_types(
+    document_processor: DocumentProcessor = Depends(get_document_processor)
+):
     """
     Get list of supported document types
     """
     return {
         "supported_types": document_processor.get_supported_types(),
         "ocr_available": document_processor.ocr_available,
-        "max_file_size_mb": document_processor.max_file_size / 1024 / 1024
+        "max_file_size_mb": document_processor.max_file_size / 1024 / 1024,
+        "max_batch_size_mb": document_processor.max_batch_size / 1024 / 1024
     }
 
 
 @router.post("/extract-text", status_code=status.HTTP_200_OK)
-async def extract_text_only(file: UploadFile = File(...)):
+async def extract_text_only(
+    file: UploadFile = File(...),
+    document_processor: DocumentProcessor = Depends(get_document_processor)
+):
     """
     Extract text from document without sending to orchestrator
 
     Useful for preview or manual review before processing
     """
     try:
-        file_content = await file.read()
+        max_file_size = document_processor.max_file_size
+        _check_declared_size(file, max_file_size)
 
-        doc_result = await document_processor.process_document(
-            file_content=file_content,
-            filename=file.filename,
-            content_type=file.content_type
-        )
+        spooled, file_size, content_hash = await _spool_upload(file, max_file_size)
+
+        with spooled:
+            doc_result = await _extract_document(
+                document_processor, file, spooled, file_size, content_hash
+            )
 
         return doc_result
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
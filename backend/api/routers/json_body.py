@@ -0,0 +1,63 @@
+"""
+JSON request body parsing straight from raw bytes
+
+FastAPI parses a body with json.loads and then validates the resulting dict.
+json_body() validates the raw bytes in one pass with a pydantic TypeAdapter
+instead, for hot endpoints with large or frequent payloads.
+"""
+from typing import Any, Callable, Dict, Type, TypeVar
+
+from fastapi import Request
+from fastapi.exceptions import RequestValidationError
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+def json_body(model: Type[ModelT]) -> Callable[[Request], Any]:
+    """
+    Build a dependency that parses the request body into `model`
+
+    Validation errors are raised as RequestValidationError with "body"
+    locations, so clients get the same 422 response as a declared body.
+    """
+    adapter = TypeAdapter(model)
+
+    async def parse_body(request: Request) -> ModelT:
+        try:
+            return adapter.validate_json(await request.body())
+        except ValidationError as e:
+            raise RequestValidationError([
+                {**error, "loc": ("body", *error["loc"])}
+                for error in e.errors(include_url=False)
+            ])
+
+    return parse_body
+
+
+def json_body_openapi(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    Build openapi_extra documenting `model` as the request body
+
+    Needed because a body read through json_body() isn't visible to FastAPI's
+    schema generation. Nested model definitions are inlined.
+    """
+    schema = model.model_json_schema()
+    definitions = schema.pop("$defs", {})
+
+    def inline(node: Any) -> Any:
+        if isinstance(node, dict):
+            ref = node.get("$ref", "")
+            if ref.startswith("#/$defs/"):
+                return inline(definitions[ref.rsplit("/", 1)[-1]])
+            return {key: inline(value) for key, value in node.items()}
+        if isinstance(node, list):
+            return [inline(item) for item in node]
+        return node
+
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {"application/json": {"schema": inline(schema)}}
+        }
+    }
@@ -1,17 +1,56 @@
-from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, Any, Optional, List
 from enum import Enum
+from functools import lru_cache
+import orjson
 
 from orchestrator.advanced_router import TaskRouter, TaskType, AgentType
+from app.services.routing_cache import routing_cache
+from api.routers.json_body import json_body, json_body_openapi
+from app.timestamps import now_iso
 
-router = APIRouter()
+router = APIRouter(default_response_class=ORJSONResponse)
 
-# Initialize the router
-task_router = TaskRouter()
+
+# The router is created on first use rather than at import time
+@lru_cache(maxsize=1)
+def get_task_router() -> TaskRouter:
+    """Get the shared TaskRouter instance"""
+    return TaskRouter()
+
+
+# Enum listings never change, so their responses are built once
+TASK_TYPE_VALUES = tuple(task_type.value for task_type in TaskType)
+AGENT_VALUES = tuple(agent_type.value for agent_type in AgentType)
+AGENT_BY_VALUE: Dict[str, AgentType] = {agent_type.value: agent_type for agent_type in AgentType}
+
+# Serialized once - the endpoints write these bytes as-is
+TASK_TYPES_JSON = orjson.dumps({
+    "task_types": list(TASK_TYPE_VALUES),
+    "total": len(TASK_TYPE_VALUES)
+})
+
+AGENTS_JSON = orjson.dumps({
+    "agents": list(AGENT_VALUES),
+    "total": len(AGENT_VALUES)
+})
 
 
 # Request/Response Models
+TASK_INPUT_EXAMPLE = {
+    "task_id": "TASK-abc123",
+    "task_type": "retrieve_records",
+    "priority": "high",
+    "description": "Retrieve medical records from Dr. Smith",
+    "extracted_data": {
+        "provider": "Dr. Smith",
+        "document_type": "medical_records"
+    }
+}
+
+
 class TaskInput(BaseModel):
     """Input model for routing a task"""
     task_id: str = Field(..., description="Unique task identifier")
@@ -20,19 +59,7 @@ class TaskInput(BaseModel):
     description: str = Field(..., description="Task description")
     extracted_data: Dict[str, Any] = Field(default_factory=dict)
     
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "task_id": "TASK-abc123",
-                "task_type": "retrieve_records",
-                "priority": "high",
-                "description": "Retrieve medical records from Dr. Smith",
-                "extracted_data": {
-                    "provider": "Dr. Smith",
-                    "document_type": "medical_records"
-                }
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": TASK_INPUT_EXAMPLE})
 
 
 class RoutingResponse(BaseModel):
@@ -67,9 +94,30 @@ class AgentStatusResponse(BaseModel):
     success_rate: float
 
 
+def require_agent(agent_id: str) -> str:
+    """Path dependency that 404s on an unknown agent_id"""
+    if agent_id not in AGENT_BY_VALUE:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Agent '{agent_id}' not found"
+        )
+    return agent_id
+
+
 # Endpoints
-@router.post("/route", response_model=RoutingResponse, status_code=status.HTTP_200_OK)
-async def route_single_task(task: TaskInput):
+# Routing data is built internally, so RoutingResponse only documents the
+# shape instead of re-validating every response. Request bodies are
+# validated straight from the raw JSON bytes (see json_body)
+@router.post(
+    "/route",
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_200_OK: {"model": RoutingResponse}},
+    openapi_extra=json_body_openapi(TaskInput)
+)
+async def route_single_task(
+    task: TaskInput = Depends(json_body(TaskInput)),
+    task_router: TaskRouter = Depends(get_task_router)
+):
     """
     Route a single task to the most appropriate AI specialist
     
@@ -79,75 +127,72 @@ async def route_single_task(task: TaskInput):
     3. Considers current agent load
     4. Returns routing decision with confidence score
     """
-    try:
-        # Convert input to dict for router
-        task_dict = {
-            "id": task.task_id,
-            "task_type": task.task_type,
-            "priority": task.priority,
-            "description": task.description,
-            "extracted_data": task.extracted_data
-        }
-        
-        # Route the task
+    # TaskRouter reads tasks as dicts; model_dump builds one in a single call
+    task_dict = task.model_dump()
+    
+    # Route the task, reusing a cached decision for a repeated task
+    cache_key = routing_cache.make_key(task_dict)
+    routing_decision = await routing_cache.get(cache_key)
+    if routing_decision is None:
         routing_decision = await task_router.route_task(task_dict)
-        
-        return RoutingResponse(
-            task_id=task.task_id,
-            **routing_decision
-        )
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error routing task: {str(e)}"
-        )
+        routing_cache.put(cache_key, routing_decision)
+    
+    return ORJSONResponse({
+        "task_id": task.task_id,
+        **routing_decision
+    })
 
 
-@router.post("/route/batch", status_code=status.HTTP_200_OK)
-async def route_multiple_tasks(batch_input: BatchTaskInput):
+@router.post(
+    "/route/batch",
+    status_code=status.HTTP_200_OK,
+    openapi_extra=json_body_openapi(BatchTaskInput)
+)
+async def route_multiple_tasks(
+    batch_input: BatchTaskInput = Depends(json_body(BatchTaskInput)),
+    task_router: TaskRouter = Depends(get_task_router)
+):
     """
     Route multiple tasks at once
     
     Useful when processing a batch of detected tasks from a single message
     """
-    try:
-        routing_decisions = []
-        
-        for task in batch_input.tasks:
-            task_dict = {
-                "id": task.task_id,
-                "task_type": task.task_type,
-                "priority": task.priority,
-                "description": task.description,
-                "extracted_data": task.extracted_data
-            }
-            
-            decision = await task_router.route_task(
-                task_dict,
-                consider_load=batch_input.consider_load_balancing
-            )
-            
-            routing_decisions.append({
-                "task_id": task.task_id,
-                **decision
-            })
-        
-        return {
-            "total_tasks": len(routing_decisions),
-            "routing_decisions": routing_decisions,
-            "load_balancing_enabled": batch_input.consider_load_balancing
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error routing batch: {str(e)}"
+    consider_load = batch_input.consider_load_balancing
+    task_dicts = [task.model_dump() for task in batch_input.tasks]
+    # Load-aware decisions depend on current agent load (and must count
+    # towards it), so they're never served from or stored in the cache
+    cache_keys = [routing_cache.make_key(task_dict) for task_dict in task_dicts]
+    if consider_load:
+        decisions = [None] * len(task_dicts)
+    else:
+        decisions = [await routing_cache.get(cache_key) for cache_key in cache_keys]
+    
+    # Route every cache miss in one router call
+    misses = [index for index, decision in enumerate(decisions) if decision is None]
+    if misses:
+        routed = await task_router.route_tasks(
+            [task_dicts[index] for index in misses],
+            consider_load=consider_load
         )
+        for index, decision in zip(misses, routed):
+            decisions[index] = decision
+            if not consider_load:
+                routing_cache.put(cache_keys[index], decision)
+    
+    routing_decisions = [
+        {"task_id": task.task_id, **decision}
+        for task, decision in zip(batch_input.tasks, decisions)
+    ]
+    
+    return ORJSONResponse({
+        "total_tasks": len(routing_decisions),
+        "routing_decisions": routing_decisions,
+        "load_balancing_enabled": batch_input.consider_load_balancing
+    })
 
 
 @router.get("/agents/status", status_code=status.HTTP_200_OK)
-async def get_all_agents_status():
+async def get_all_agents_status(task_router: TaskRouter = Depends(get_task_router)):
     """
     Get current status of all AI agents
     
@@ -157,48 +202,30 @@ async def get_all_agents_status():
     - Success rate
     - Whether agent is enabled
     """
-    try:
-        status_data = task_router.get_agent_status()
-        return {
-            "timestamp": "2024-10-25T12:00:00Z",
-            "agents": status_data
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error fetching agent status: {str(e)}"
-        )
+    status_data = task_router.get_agent_status()
+    return ORJSONResponse({
+        "timestamp": now_iso(),
+        "agents": status_data
+    })
 
 
-@router.get("/agents/{agent_id}/status", response_model=AgentStatusResponse)
-async def get_agent_status(agent_id: str):
+@router.get(
+    "/agents/{agent_id}/status",
+    responses={status.HTTP_200_OK: {"model": AgentStatusResponse}}
+)
+async def get_agent_status(
+    agent_id: str = Depends(require_agent),
+    task_router: TaskRouter = Depends(get_task_router)
+):
     """
     Get status of a specific agent
     """
-    try:
-        # Validate agent_id
-        try:
-            AgentType(agent_id)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Agent '{agent_id}' not found"
-            )
-        
-        status_data = task_router.get_agent_status(agent_id)
-        return AgentStatusResponse(**status_data)
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error fetching agent status: {str(e)}"
-        )
+    status_data = task_router.get_agent_status(agent_id)
+    return ORJSONResponse(status_data)
 
 
 @router.get("/stats", status_code=status.HTTP_200_OK)
-async def get_routing_statistics():
+async def get_routing_statistics(task_router: TaskRouter = Depends(get_task_router)):
     """
     Get routing statistics and analytics
     
@@ -208,17 +235,12 @@ async def get_routing_statistics():
     - Distribution by task type
     - Average confidence scores
     """
-    try:
-        stats = task_router.get_routing_stats()
-        return {
-            "statistics": stats,
-            "timestamp": "2024-10-25T12:00:00Z"
-        }
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error fetching statistics: {str(e)}"
-        )
+    stats = task_router.get_routing_stats()
+    return ORJSONResponse({
+        "statistics": stats,
+        "routing_cache": routing_cache.stats(),
+        "timestamp": now_iso()
+    })
 
 
 @router.get("/task-types", status_code=status.HTTP_200_OK)
@@ -226,10 +248,7 @@ async def get_supported_task_types():
     """
     Get list of all supported task types
     """
-    return {
-        "task_types": [task_type.value for task_type in TaskType],
-        "total": len(TaskType)
-    }
+    return Response(content=TASK_TYPES_JSON, media_type="application/json")
 
 
 @router.get("/agents", status_code=status.HTTP_200_OK)
@@ -237,59 +256,34 @@ async def get_available_agents():
     """
     Get list of all available AI agents
     """
-    return {
-        "agents": [agent_type.value for agent_type in AgentType],
-        "total": len(AgentType)
-    }
+    return Response(content=AGENTS_JSON, media_type="application/json")
 
 
 @router.post("/agents/{agent_id}/reset-load", status_code=status.HTTP_200_OK)
-async def reset_agent_load(agent_id: str):
+async def reset_agent_load(
+    agent_id: str = Depends(require_agent),
+    task_router: TaskRouter = Depends(get_task_router)
+):
     """
     Reset load counter for an agent (for testing/maintenance)
     """
-    try:
-        # Validate agent_id
-        try:
-            AgentType(agent_id)
-        except ValueError:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail=f"Agent '{agent_id}' not found"
-            )
-        
-        task_router.reset_agent_load(agent_id)
-        
-        return {
-            "message": f"Load reset for agent '{agent_id}'",
-            "agent_id": agent_id,
-            "new_load": 0
-        }
-        
-    except HTTPException:
-        raise
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error resetting load: {str(e)}"
-        )
+    task_router.reset_agent_load(agent_id)
+    
+    return {
+        "message": f"Load reset for agent '{agent_id}'",
+        "agent_id": agent_id,
+        "new_load": 0
+    }
 
 
 @router.post("/reset-all-loads", status_code=status.HTTP_200_OK)
-async def reset_all_agent_loads():
+async def reset_all_agent_loads(task_router: TaskRouter = Depends(get_task_router)):
     """
     Reset load counters for all agents (for testing/maintenance)
     """
-    try:
-        task_router.reset_agent_load()
-        
-        return {
-            "message": "All agent loads reset to 0",
-            "timestamp": "2024-10-25T12:00:00Z"
-        }
-        
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error resetting loads: {str(e)}"
-        )
\ No newline at end of file
+    task_router.reset_agent_load()
+    
+    return {
+        "message": "All agent loads reset to 0",
+        "timestamp": now_iso()
+    }
\ No newline at end of file
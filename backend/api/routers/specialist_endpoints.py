@@ -5,71 +5,157 @@ Direct API endpoints for each AI specialist agent.
 These can be called independently or through the orchestrator.
 """
 
-from fastapi import APIRouter, HTTPException, status
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Response, status
+from pydantic import BaseModel, ConfigDict, Field
 from typing import Dict, Any, Optional, List
 from datetime import datetime
+from functools import lru_cache
+import asyncio
 import os
+import orjson
 
 from app.specialists.records_wrangler import RecordsWrangler
 from app.specialists.voice_scheduler import VoiceScheduler
 from app.specialists.evidence_sorter import EvidenceSorter
 from app.specialists.legal_researcher import LegalResearcher
 from app.specialists.client_communication import ClientCommunicator
-from app.specialists.gemini_adapter import GeminiAdapter
+from app.specialists.gemini_adapter import (
+    GeminiAdapter,
+    CONTEXT_CACHE_TTL_SECONDS,
+    ServiceTier,
+    use_service_tier
+)
+from app.services.semantic_cache import semantic_cache
+from app.services.batch_callbacks import BatchCallbackWatcher, validate_callback_url
 
 router = APIRouter()
 
 # Initialize LLM adapter - prefer Gemini, fallback to mock
 def get_llm_adapter():
-    """Get the configured LLM adapter based on available API keys"""
+    """
+    Get an LLM adapter for one specialist based on available API keys
+
+    Each specialist gets its own adapter so its system instruction is kept
+    (and context-cached) separately; they all share one HTTP client.
+    """
     google_api_key = os.getenv("GOOGLE_AI_API_KEY")
 
     if google_api_key:
-        print("✓ Using Gemini as LLM provider")
-        return GeminiAdapter(api_key=google_api_key)
+        return GeminiAdapter(api_key=google_api_key, context_cache_ttl=CONTEXT_CACHE_TTL_SECONDS)
 
-    print("⚠ No AI API key found - using mock responses")
     return None  # Will use mock adapter
 
-# Initialize specialists with Gemini
-llm_adapter = get_llm_adapter()
-records_wrangler = RecordsWrangler(llm_adapter=llm_adapter)
-voice_scheduler = VoiceScheduler(llm_adapter=llm_adapter)
-evidence_sorter = EvidenceSorter(llm_adapter=llm_adapter)
-legal_researcher = LegalResearcher(llm_adapter=llm_adapter)
-client_communicator = ClientCommunicator(llm_adapter=llm_adapter)
+
+# Specialists are created on first use (or at startup by the app lifespan)
+# rather than at import time, so each worker builds its own.
+# Their results for the text-driven endpoints are cached in semantic_cache,
+# so a repeated request skips the LLM call. Only the free-form endpoints
+# (research, drafts) also reuse results for paraphrases; extraction endpoints
+# match exactly, as a reworded request may carry a different date or amount.
+@lru_cache(maxsize=1)
+def get_records_wrangler() -> RecordsWrangler:
+    """Get the shared RecordsWrangler instance"""
+    return RecordsWrangler(llm_adapter=get_llm_adapter())
+
+
+@lru_cache(maxsize=1)
+def get_voice_scheduler() -> VoiceScheduler:
+    """Get the shared VoiceScheduler instance"""
+    return VoiceScheduler(llm_adapter=get_llm_adapter())
+
+
+@lru_cache(maxsize=1)
+def get_evidence_sorter() -> EvidenceSorter:
+    """Get the shared EvidenceSorter instance"""
+    return EvidenceSorter(llm_adapter=get_llm_adapter())
+
+
+@lru_cache(maxsize=1)
+def get_legal_researcher() -> LegalResearcher:
+    """Get the shared LegalResearcher instance"""
+    return LegalResearcher(llm_adapter=get_llm_adapter())
+
+
+@lru_cache(maxsize=1)
+def get_client_communicator() -> ClientCommunicator:
+    """Get the shared ClientCommunicator instance"""
+    return ClientCommunicator(llm_adapter=get_llm_adapter())
+
+
+SPECIALIST_FACTORIES = (
+    get_records_wrangler,
+    get_voice_scheduler,
+    get_evidence_sorter,
+    get_legal_researcher,
+    get_client_communicator
+)
+
+
+async def warm_specialists():
+    """Build the specialists and their system instruction caches (call from the app lifespan)"""
+    if os.getenv("GOOGLE_AI_API_KEY"):
+        print("✓ Using Gemini as LLM provider")
+    else:
+        print("⚠ No AI API key found - using mock responses")
+
+    specialists = [factory() for factory in SPECIALIST_FACTORIES]
+    await asyncio.gather(*(
+        specialist.llm.create_context_cache()
+        for specialist in specialists
+        if isinstance(specialist.llm, GeminiAdapter)
+    ))
+
+
+# Default Gemini service tier per endpoint: interactive drafting/parsing pays
+# for priority latency, latency-tolerant bulk analysis runs discounted on flex.
+# Other endpoints use the adapter default (standard). Requests can override it.
+PARSE_REQUEST_SERVICE_TIER = "priority"
+COMMUNICATION_DRAFT_SERVICE_TIER = "priority"
+PROCESS_BATCH_SERVICE_TIER = "flex"
+LEGAL_RESEARCH_SERVICE_TIER = "flex"
+
+SERVICE_TIER_DESCRIPTION = "Gemini service tier (standard, priority or flex); defaults per endpoint"
 
 
 # Request Models
+RECORDS_ANALYSIS_EXAMPLE = {
+    "text": "I had an MRI at City Hospital last week and saw Dr. Johnson. The bill was $3,500.",
+    "case_id": "CASE-2024-001",
+    "existing_records": ["Initial consultation notes"]
+}
+
+
 class RecordsAnalysisRequest(BaseModel):
     """Request for records analysis"""
     text: str = Field(..., description="Text to analyze for record needs")
     case_id: Optional[str] = Field(None, description="Case ID")
     existing_records: Optional[List[str]] = Field(default_factory=list, description="Records already on file")
+    service_tier: Optional[ServiceTier] = Field(None, description=SERVICE_TIER_DESCRIPTION)
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "text": "I had an MRI at City Hospital last week and saw Dr. Johnson. The bill was $3,500.",
-                "case_id": "CASE-2024-001",
-                "existing_records": ["Initial consultation notes"]
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": RECORDS_ANALYSIS_EXAMPLE})
+
+
+SCHEDULING_EXAMPLE = {
+    "text": "We need to schedule the deposition for next week, preferably Tuesday or Wednesday afternoon.",
+    "case_id": "CASE-2024-001"
+}
 
 
 class SchedulingRequest(BaseModel):
     """Request for scheduling assistance"""
     text: str = Field(..., description="Text containing scheduling request")
     case_id: Optional[str] = Field(None, description="Case ID")
+    service_tier: Optional[ServiceTier] = Field(None, description=SERVICE_TIER_DESCRIPTION)
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "text": "We need to schedule the deposition for next week, preferably Tuesday or Wednesday afternoon.",
-                "case_id": "CASE-2024-001"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": SCHEDULING_EXAMPLE})
+
+
+DOCUMENT_ANALYSIS_EXAMPLE = {
+    "filename": "medical_records_dr_smith.pdf",
+    "text_content": "Patient: John Doe. Date: 01/15/2024. Diagnosis: Lumbar sprain...",
+    "file_size": 245000,
+    "case_id": "CASE-2024-001"
+}
 
 
 class DocumentAnalysisRequest(BaseModel):
@@ -78,22 +164,33 @@ class DocumentAnalysisRequest(BaseModel):
     text_content: Optional[str] = Field(None, description="Extracted text content")
     file_size: Optional[int] = Field(None, description="File size in bytes")
     case_id: Optional[str] = Field(None, description="Case ID")
+    service_tier: Optional[ServiceTier] = Field(None, description=SERVICE_TIER_DESCRIPTION)
 
-    class Config:
-        json_schema_extra = {
-            "example": {
-                "filename": "medical_records_dr_smith.pdf",
-                "text_content": "Patient: John Doe. Date: 01/15/2024. Diagnosis: Lumbar sprain...",
-                "file_size": 245000,
-                "case_id": "CASE-2024-001"
-            }
-        }
+    model_config = ConfigDict(json_schema_extra={"example": DOCUMENT_ANALYSIS_EXAMPLE})
 
 
 class BatchDocumentRequest(BaseModel):
     """Request for batch document processing"""
     documents: List[Dict[str, Any]] = Field(..., description="List of documents to process")
     case_id: Optional[str] = Field(None, description="Case ID")
+    async_batch: bool = Field(
+        default=False,
+        description="Submit LLM classification as a Gemini Batch API job instead of waiting for it"
+    )
+    callback_url: Optional[str] = Field(
+        None,
+        description="URL to POST the final job status to (async_batch only)"
+    )
+    service_tier: Optional[ServiceTier] = Field(None, description=SERVICE_TIER_DESCRIPTION)
+
+
+async def _batch_status(job_name: str) -> Dict[str, Any]:
+    return await get_evidence_sorter().get_batch_status(job_name)
+
+
+# Final statuses of async_batch jobs are POSTed to their callback_url by this
+# watcher, started and stopped by the app lifespan
+batch_callbacks = BatchCallbackWatcher(_batch_status)
 
 
 class LegalResearchRequest(BaseModel):
@@ -101,6 +198,7 @@ class LegalResearchRequest(BaseModel):
     text: str = Field(..., description="Text to research")
     case_id: Optional[str] = Field(None, description="Case ID")
     metadata: Optional[Dict[str, Any]] = Field(default_factory=dict)
+    service_tier: Optional[ServiceTier] = Field(None, description=SERVICE_TIER_DESCRIPTION)
 
 
 class CommunicationDraftRequest(BaseModel):
@@ -108,11 +206,15 @@ class CommunicationDraftRequest(BaseModel):
     client_name: Optional[str] = Field(None, description="Client name")
     purpose: Optional[str] = Field(None, description="Purpose of communication")
     text: str = Field(..., description="Context for the communication")
+    service_tier: Optional[ServiceTier] = Field(None, description=SERVICE_TIER_DESCRIPTION)
 
 
 # Records Wrangler Endpoints
 @router.post("/records-wrangler/analyze", status_code=status.HTTP_200_OK)
-async def analyze_records_needs(request: RecordsAnalysisRequest):
+async def analyze_records_needs(
+    request: RecordsAnalysisRequest,
+    records_wrangler: RecordsWrangler = Depends(get_records_wrangler)
+):
     """
     Analyze text to identify record needs and draft request letters
 
@@ -123,11 +225,20 @@ async def analyze_records_needs(request: RecordsAnalysisRequest):
         - Draft record request letters
     """
     try:
-        result = await records_wrangler.analyze_records_needs(
-            text=request.text,
-            case_id=request.case_id,
-            existing_records=request.existing_records
+        cache_key = semantic_cache.make_key(
+            "records_analyze",
+            request.text,
+            (request.case_id, tuple(request.existing_records or ()))
         )
+        result = await semantic_cache.get(cache_key)
+        if result is None:
+            with use_service_tier(request.service_tier):
+                result = await records_wrangler.analyze_records_needs(
+                    text=request.text,
+                    case_id=request.case_id,
+                    existing_records=request.existing_records
+                )
+            semantic_cache.put(cache_key, result)
 
         return {
             "status": "success",
@@ -147,7 +258,8 @@ async def draft_provider_outreach(
     provider_name: str,
     record_types: List[str],
     case_id: Optional[str] = None,
-    patient_name: Optional[str] = None
+    patient_name: Optional[str] = None,
+    records_wrangler: RecordsWrangler = Depends(get_records_wrangler)
 ):
     """
     Draft a medical provider outreach letter
@@ -175,7 +287,10 @@ async def draft_provider_outreach(
 
 # Voice Scheduler Endpoints
 @router.post("/voice-scheduler/parse-request", status_code=status.HTTP_200_OK)
-async def parse_scheduling_request(request: SchedulingRequest):
+async def parse_scheduling_request(
+    request: SchedulingRequest,
+    voice_scheduler: VoiceScheduler = Depends(get_voice_scheduler)
+):
     """
     Parse a scheduling request from text
 
@@ -186,10 +301,15 @@ async def parse_scheduling_request(request: SchedulingRequest):
         - Urgency level
     """
     try:
-        result = await voice_scheduler.parse_scheduling_request(
-            text=request.text,
-            case_id=request.case_id
-        )
+        cache_key = semantic_cache.make_key("voice_parse", request.text, (request.case_id,))
+        result = await semantic_cache.get(cache_key)
+        if result is None:
+            with use_service_tier(request.service_tier or PARSE_REQUEST_SERVICE_TIER):
+                result = await voice_scheduler.parse_scheduling_request(
+                    text=request.text,
+                    case_id=request.case_id
+                )
+            semantic_cache.put(cache_key, result)
 
         return {
             "status": "success",
@@ -207,7 +327,8 @@ async def parse_scheduling_request(request: SchedulingRequest):
 @router.post("/voice-scheduler/generate-options", status_code=status.HTTP_200_OK)
 async def generate_scheduling_options(
     appointment_type: str,
-    duration_minutes: int = 60
+    duration_minutes: int = 60,
+    voice_scheduler: VoiceScheduler = Depends(get_voice_scheduler)
 ):
     """
     Generate available scheduling options
@@ -236,15 +357,20 @@ async def draft_scheduling_message(
     recipient_name: Optional[str],
     appointment_type: str,
     proposed_slot_ids: List[str],
-    case_id: Optional[str] = None
+    case_id: Optional[str] = None,
+    voice_scheduler: VoiceScheduler = Depends(get_voice_scheduler)
 ):
     """
     Draft a scheduling coordination message
     """
     try:
-        # Generate slots (in production, would retrieve from database)
-        all_slots = await voice_scheduler.generate_scheduling_options(appointment_type)
-        proposed_slots = [s for s in all_slots if s["slot_id"] in proposed_slot_ids]
+        proposed_slots = voice_scheduler.get_offered_slots(proposed_slot_ids)
+        if len(proposed_slots) < len(set(proposed_slot_ids)):
+            # Slots offered by another worker or before a restart aren't in
+            # this scheduler's store; regenerate them (in production, would
+            # retrieve from database)
+            all_slots = await voice_scheduler.generate_scheduling_options(appointment_type)
+            proposed_slots = [s for s in all_slots if s["slot_id"] in proposed_slot_ids]
 
         result = await voice_scheduler.draft_scheduling_message(
             recipient_name=recipient_name,
@@ -268,7 +394,10 @@ async def draft_scheduling_message(
 
 # Evidence Sorter Endpoints
 @router.post("/evidence-sorter/analyze-document", status_code=status.HTTP_200_OK)
-async def analyze_document(request: DocumentAnalysisRequest):
+async def analyze_document(
+    request: DocumentAnalysisRequest,
+    evidence_sorter: EvidenceSorter = Depends(get_evidence_sorter)
+):
     """
     Analyze and classify a single document
 
@@ -279,12 +408,21 @@ async def analyze_document(request: DocumentAnalysisRequest):
         - Filing recommendation
     """
     try:
-        result = await evidence_sorter.analyze_document(
-            filename=request.filename,
-            text_content=request.text_content,
-            file_size=request.file_size,
-            case_id=request.case_id
+        cache_key = semantic_cache.make_key(
+            "document_analyze",
+            request.text_content,
+            (request.filename, request.file_size, request.case_id)
         )
+        result = await semantic_cache.get(cache_key)
+        if result is None:
+            with use_service_tier(request.service_tier):
+                result = await evidence_sorter.analyze_document(
+                    filename=request.filename,
+                    text_content=request.text_content,
+                    file_size=request.file_size,
+                    case_id=request.case_id
+                )
+            semantic_cache.put(cache_key, result)
 
         return {
             "status": "success",
@@ -300,10 +438,17 @@ async def analyze_document(request: DocumentAnalysisRequest):
 
 
 @router.post("/evidence-sorter/process-batch", status_code=status.HTTP_200_OK)
-async def process_document_batch(request: BatchDocumentRequest):
+async def process_document_batch(
+    request: BatchDocumentRequest,
+    evidence_sorter: EvidenceSorter = Depends(get_evidence_sorter)
+):
     """
     Process multiple documents at once
 
+    With async_batch, the LLM classification is submitted as a single Gemini
+    Batch API job and the job name is returned straight away; poll
+    /evidence-sorter/batch-status/{job_name} (or pass callback_url) for results.
+
     Returns:
         - Batch processing results
         - Category breakdown
@@ -311,10 +456,21 @@ async def process_document_batch(request: BatchDocumentRequest):
         - Summary statistics
     """
     try:
-        result = await evidence_sorter.process_batch(
-            documents=request.documents,
-            case_id=request.case_id
-        )
+        if request.async_batch:
+            if request.callback_url:
+                await validate_callback_url(request.callback_url)
+            result = await evidence_sorter.process_batch_async(
+                documents=request.documents,
+                case_id=request.case_id
+            )
+            if request.callback_url:
+                await batch_callbacks.add(result["batch_job_name"], request.callback_url)
+        else:
+            with use_service_tier(request.service_tier or PROCESS_BATCH_SERVICE_TIER):
+                result = await evidence_sorter.process_batch(
+                    documents=request.documents,
+                    case_id=request.case_id
+                )
 
         return {
             "status": "success",
@@ -322,6 +478,11 @@ async def process_document_batch(request: BatchDocumentRequest):
             "data": result
         }
 
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -329,8 +490,44 @@ async def process_document_batch(request: BatchDocumentRequest):
         )
 
 
+@router.get("/evidence-sorter/batch-status/{job_name:path}", status_code=status.HTTP_200_OK)
+async def get_document_batch_status(
+    job_name: str,
+    evidence_sorter: EvidenceSorter = Depends(get_evidence_sorter)
+):
+    """
+    Get the state of an async_batch classification job
+
+    Returns:
+        - Job state (BATCH_STATE_PENDING, BATCH_STATE_RUNNING, BATCH_STATE_SUCCEEDED, ...)
+        - LLM classifications keyed "doc_<index>" once the job has succeeded
+    """
+    try:
+        result = await evidence_sorter.get_batch_status(job_name)
+
+        return {
+            "status": "success",
+            "specialist": "Evidence Sorter",
+            "data": result
+        }
+
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Error getting batch status: {str(e)}"
+        )
+
+
 @router.post("/evidence-sorter/salesforce-payload", status_code=status.HTTP_200_OK)
-async def generate_salesforce_payload(document_analysis: Dict[str, Any]):
+async def generate_salesforce_payload(
+    document_analysis: Dict[str, Any],
+    evidence_sorter: EvidenceSorter = Depends(get_evidence_sorter)
+):
     """
     Generate Salesforce-compatible upload payload
     """
@@ -352,7 +549,10 @@ async def generate_salesforce_payload(document_analysis: Dict[str, Any]):
 
 # Legal Researcher Endpoints
 @router.post("/legal-researcher/analyze", status_code=status.HTTP_200_OK)
-async def legal_research_analysis(request: LegalResearchRequest):
+async def legal_research_analysis(
+    request: LegalResearchRequest,
+    legal_researcher: LegalResearcher = Depends(get_legal_researcher)
+):
     """
     Conduct legal research analysis
 
@@ -363,10 +563,19 @@ async def legal_research_analysis(request: LegalResearchRequest):
         - Research brief
     """
     try:
-        result = await legal_researcher.analyze(
-            text=request.text,
-            metadata=request.metadata
+        cache_key = semantic_cache.make_key(
+            "legal_research",
+            request.text,
+            (orjson.dumps(request.metadata, option=orjson.OPT_SORT_KEYS),)
         )
+        result = await semantic_cache.get(cache_key, allow_similar=True)
+        if result is None:
+            with use_service_tier(request.service_tier or LEGAL_RESEARCH_SERVICE_TIER):
+                result = await legal_researcher.analyze(
+                    text=request.text,
+                    metadata=request.metadata
+                )
+            semantic_cache.put(cache_key, result, allow_similar=True)
 
         return {
             "status": "success",
@@ -383,7 +592,10 @@ async def legal_research_analysis(request: LegalResearchRequest):
 
 # Client Communication Guru Endpoints
 @router.post("/client-communication/draft", status_code=status.HTTP_200_OK)
-async def draft_client_communication(request: CommunicationDraftRequest):
+async def draft_client_communication(
+    request: CommunicationDraftRequest,
+    client_communicator: ClientCommunicator = Depends(get_client_communicator)
+):
     """
     Draft client communication message
 
@@ -393,11 +605,20 @@ async def draft_client_communication(request: CommunicationDraftRequest):
         - Suggested follow-ups
     """
     try:
-        result = await client_communicator.draft(
-            client_name=request.client_name,
-            purpose=request.purpose,
-            text=request.text
+        cache_key = semantic_cache.make_key(
+            "communication_draft",
+            request.text,
+            (request.client_name, request.purpose)
         )
+        result = await semantic_cache.get(cache_key, allow_similar=True)
+        if result is None:
+            with use_service_tier(request.service_tier or COMMUNICATION_DRAFT_SERVICE_TIER):
+                result = await client_communicator.draft(
+                    client_name=request.client_name,
+                    purpose=request.purpose,
+                    text=request.text
+                )
+            semantic_cache.put(cache_key, result, allow_similar=True)
 
         return {
             "status": "success",
@@ -413,85 +634,95 @@ async def draft_client_communication(request: CommunicationDraftRequest):
 
 
 # Specialist Information Endpoints
+# Specialist descriptions never change, so the payload is built once
+SPECIALISTS_INFO = {
+    "records_wrangler": {
+        "name": "Records Wrangler",
+        "description": "Pulls missing bills or records from client messages",
+        "capabilities": [
+            "Identify medical providers",
+            "Detect missing records",
+            "Draft HIPAA-compliant record requests",
+            "Track billing items"
+        ],
+        "endpoints": [
+            "/specialists/records-wrangler/analyze",
+            "/specialists/records-wrangler/draft-outreach"
+        ]
+    },
+    "voice_scheduler": {
+        "name": "Voice Bot Scheduler",
+        "description": "Coordinates depositions, mediations, and appointments",
+        "capabilities": [
+            "Parse scheduling requests",
+            "Generate time slot options",
+            "Draft scheduling messages",
+            "Create confirmation messages"
+        ],
+        "endpoints": [
+            "/specialists/voice-scheduler/parse-request",
+            "/specialists/voice-scheduler/generate-options",
+            "/specialists/voice-scheduler/draft-message"
+        ]
+    },
+    "evidence_sorter": {
+        "name": "Evidence Sorter",
+        "description": "Extracts and labels attachments for case management",
+        "capabilities": [
+            "Classify documents automatically",
+            "Extract metadata",
+            "Detect duplicates",
+            "Generate Salesforce payloads"
+        ],
+        "endpoints": [
+            "/specialists/evidence-sorter/analyze-document",
+            "/specialists/evidence-sorter/process-batch",
+            "/specialists/evidence-sorter/batch-status/{job_name}",
+            "/specialists/evidence-sorter/salesforce-payload"
+        ]
+    },
+    "legal_researcher": {
+        "name": "Legal Researcher",
+        "description": "Finds supporting verdicts and citations",
+        "capabilities": [
+            "Identify legal issues",
+            "Find relevant citations",
+            "Suggest legal strategies",
+            "Draft research briefs"
+        ],
+        "endpoints": [
+            "/specialists/legal-researcher/analyze"
+        ]
+    },
+    "client_communication_guru": {
+        "name": "Client Communication Guru",
+        "description": "Drafts clear, empathetic messages to clients",
+        "capabilities": [
+            "Draft client messages",
+            "Generate subject lines",
+            "Suggest follow-ups",
+            "Maintain empathetic tone"
+        ],
+        "endpoints": [
+            "/specialists/client-communication/draft"
+        ]
+    }
+}
+
+# The specialist listings never change, so they are encoded once
+SPECIALISTS_JSON = orjson.dumps({"specialists": SPECIALISTS_INFO})
+SPECIALIST_INFO_JSON = {
+    name: orjson.dumps({"specialist": name, "info": info})
+    for name, info in SPECIALISTS_INFO.items()
+}
+
+
 @router.get("/specialists", status_code=status.HTTP_200_OK)
 async def get_all_specialists():
     """
     Get information about all available specialists
     """
-    return {
-        "specialists": {
-            "records_wrangler": {
-                "name": "Records Wrangler",
-                "description": "Pulls missing bills or records from client messages",
-                "capabilities": [
-                    "Identify medical providers",
-                    "Detect missing records",
-                    "Draft HIPAA-compliant record requests",
-                    "Track billing items"
-                ],
-                "endpoints": [
-                    "/specialists/records-wrangler/analyze",
-                    "/specialists/records-wrangler/draft-outreach"
-                ]
-            },
-            "voice_scheduler": {
-                "name": "Voice Bot Scheduler",
-                "description": "Coordinates depositions, mediations, and appointments",
-                "capabilities": [
-                    "Parse scheduling requests",
-                    "Generate time slot options",
-                    "Draft scheduling messages",
-                    "Create confirmation messages"
-                ],
-                "endpoints": [
-                    "/specialists/voice-scheduler/parse-request",
-                    "/specialists/voice-scheduler/generate-options",
-                    "/specialists/voice-scheduler/draft-message"
-                ]
-            },
-            "evidence_sorter": {
-                "name": "Evidence Sorter",
-                "description": "Extracts and labels attachments for case management",
-                "capabilities": [
-                    "Classify documents automatically",
-                    "Extract metadata",
-                    "Detect duplicates",
-                    "Generate Salesforce payloads"
-                ],
-                "endpoints": [
-                    "/specialists/evidence-sorter/analyze-document",
-                    "/specialists/evidence-sorter/process-batch",
-                    "/specialists/evidence-sorter/salesforce-payload"
-                ]
-            },
-            "legal_researcher": {
-                "name": "Legal Researcher",
-                "description": "Finds supporting verdicts and citations",
-                "capabilities": [
-                    "Identify legal issues",
-                    "Find relevant citations",
-                    "Suggest legal strategies",
-                    "Draft research briefs"
-                ],
-                "endpoints": [
-                    "/specialists/legal-researcher/analyze"
-                ]
-            },
-            "client_communication_guru": {
-                "name": "Client Communication Guru",
-                "description": "Drafts clear, empathetic messages to clients",
-                "capabilities": [
-                    "Draft client messages",
-                    "Generate subject lines",
-                    "Suggest follow-ups",
-                    "Maintain empathetic tone"
-                ],
-                "endpoints": [
-                    "/specialists/client-communication/draft"
-                ]
-            }
-        }
-    }
+    return Response(content=SPECIALISTS_JSON, media_type="application/json")
 
 
 @router.get("/specialists/{specialist_name}/info", status_code=status.HTTP_200_OK)
@@ -499,15 +730,11 @@ async def get_specialist_info(specialist_name: str):
     """
     Get detailed information about a specific specialist
     """
-    specialists_info = await get_all_specialists()
-
-    if specialist_name not in specialists_info["specialists"]:
+    info_json = SPECIALIST_INFO_JSON.get(specialist_name)
+    if info_json is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Specialist '{specialist_name}' not found"
         )
 
-    return {
-        "specialist": specialist_name,
-        "info": specialists_info["specialists"][specialist_name]
-    }
+    return Response(content=info_json, media_type="application/json")
@@ -1,11 +1,26 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 
 from .schemas import ResearchRequest, ResearchResponse
 from .specialists.legal_researcher import LegalResearcher
 from .schemas import CommunicationRequest, CommunicationResponse
 from .specialists.client_communication import ClientCommunicator
 
-app = FastAPI(title="Tender-for-Lawyers - Legal Researcher Agent")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # The OpenAI adapter keeps its HTTP client open between calls
+    if _adapter is not None:
+        await _adapter.aclose()
+
+
+app = FastAPI(
+    title="Tender-for-Lawyers - Legal Researcher Agent",
+    default_response_class=ORJSONResponse,
+    lifespan=lifespan
+)
 
 import os
 from dotenv import load_dotenv
@@ -0,0 +1,170 @@
+"""
+Batch Callback Watcher
+
+Polls Gemini Batch API jobs that were submitted with a callback_url and POSTs
+each job's final status to its URL. The poller is a lifespan-managed task,
+so shutdown never waits on it. Pending callbacks are kept in Redis when it is
+configured, so they survive restarts and any worker can deliver them; the
+worker that removes a finished job's entry is the one that sends it.
+"""
+import os
+import json
+import time
+import asyncio
+import ipaddress
+from typing import Any, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+# Redis is optional - without it pending callbacks live in process memory
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    RedisError = OSError
+
+
+# Jobs are polled until they reach a final state, or given up on after
+# BATCH_POLL_MAX_SECONDS (Gemini expires jobs after 48 hours)
+BATCH_POLL_INTERVAL_SECONDS = int(os.getenv("BATCH_POLL_INTERVAL_SECONDS", "30"))
+BATCH_POLL_MAX_SECONDS = int(os.getenv("BATCH_POLL_MAX_SECONDS", str(48 * 3600)))
+BATCH_CALLBACK_TIMEOUT_SECONDS = 10.0
+BATCH_FINAL_STATES = {
+    "BATCH_STATE_SUCCEEDED",
+    "BATCH_STATE_FAILED",
+    "BATCH_STATE_CANCELLED",
+    "BATCH_STATE_EXPIRED"
+}
+
+
+async def validate_callback_url(callback_url: str):
+    """
+    Check that a callback URL is http(s) and resolves only to public addresses
+
+    Callbacks are POSTed from inside the deployment, so a URL pointing at
+    loopback, private or link-local addresses (e.g. cloud metadata) is refused.
+
+    Raises:
+        ValueError: If the URL isn't allowed
+    """
+    parts = urlsplit(callback_url)
+    if parts.scheme not in ("http", "https") or not parts.hostname:
+        raise ValueError("callback_url must be an http(s) URL")
+
+    try:
+        port = parts.port or (443 if parts.scheme == "https" else 80)
+        addresses = await asyncio.get_running_loop().getaddrinfo(parts.hostname, port)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"callback_url host can't be resolved: {e}")
+
+    for *_, sockaddr in addresses:
+        if not ipaddress.ip_address(sockaddr[0].split("%")[0]).is_global:
+            raise ValueError("callback_url must resolve to a public address")
+
+
+class BatchCallbackWatcher:
+    """
+    Delivers callbacks for Batch API jobs once they finish
+
+    `get_status` returns a job's status dict (with a "state" key); that dict
+    is what gets POSTed to the callback URL.
+    """
+
+    PENDING_KEY = "batch:callbacks"
+
+    def __init__(self, get_status: Callable[[str], Awaitable[Dict[str, Any]]]):
+        self.get_status = get_status
+        self.redis_url = os.getenv("REDIS_URL")
+
+        self.redis = None
+        if REDIS_AVAILABLE and self.redis_url:
+            self.redis = aioredis.from_url(self.redis_url, decode_responses=True)
+
+        # job name -> {"callback_url", "deadline"}, for entries Redis didn't take
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._worker: Optional[asyncio.Task] = None
+
+    async def add(self, job_name: str, callback_url: str):
+        """Deliver job_name's final status to callback_url once it finishes"""
+        entry = {"callback_url": callback_url, "deadline": time.time() + BATCH_POLL_MAX_SECONDS}
+        if self.redis:
+            try:
+                await self.redis.hset(self.PENDING_KEY, job_name, json.dumps(entry))
+                return
+            except RedisError as e:
+                print(f"⚠️ Couldn't persist the callback for batch job {job_name}, keeping it in memory: {e}")
+        self._pending[job_name] = entry
+
+    def start(self):
+        """Start the poller (call from the app lifespan)"""
+        if self._worker is None or self._worker.done():
+            self._worker = asyncio.create_task(self._run_loop())
+
+    async def stop(self):
+        """Cancel the poller; callbacks persisted in Redis are picked up on the next start"""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def _run_loop(self):
+        while True:
+            await asyncio.sleep(BATCH_POLL_INTERVAL_SECONDS)
+            pending = await self._load_pending()
+            await asyncio.gather(*(self._check(job_name, entry) for job_name, entry in pending.items()))
+
+    async def _load_pending(self) -> Dict[str, Dict[str, Any]]:
+        pending = dict(self._pending)
+        if self.redis:
+            try:
+                for job_name, raw in (await self.redis.hgetall(self.PENDING_KEY)).items():
+                    pending[job_name] = json.loads(raw)
+            except RedisError as e:
+                print(f"⚠️ Couldn't load pending batch callbacks: {e}")
+        return pending
+
+    async def _claim(self, job_name: str) -> bool:
+        """Remove a job's entry. Returns True if this call removed it, so the caller acts on it"""
+        if self._pending.pop(job_name, None) is not None:
+            return True
+        if self.redis:
+            return bool(await self.redis.hdel(self.PENDING_KEY, job_name))
+        return False
+
+    async def _check(self, job_name: str, entry: Dict[str, Any]):
+        """Poll one job, delivering its callback if it has finished"""
+        try:
+            if time.time() >= entry["deadline"]:
+                if await self._claim(job_name):
+                    print(f"⚠️ Gave up polling batch job {job_name} after {BATCH_POLL_MAX_SECONDS}s")
+                return
+
+            try:
+                batch_status = await self.get_status(job_name)
+            except httpx.HTTPStatusError as e:
+                # Unknown job, bad key, ... - polling again won't help
+                if e.response.status_code < 500 and await self._claim(job_name):
+                    print(f"⚠️ Stopped polling batch job {job_name}: {e}")
+                    return
+                raise
+
+            if batch_status["state"] in BATCH_FINAL_STATES and await self._claim(job_name):
+                await self._deliver(entry["callback_url"], batch_status)
+        except Exception as e:
+            print(f"⚠️ Failed to poll batch job {job_name}: {e}")
+
+    async def _deliver(self, callback_url: str, batch_status: Dict[str, Any]):
+        # Its own short-lived client, not the shared Gemini pool; the URL is
+        # checked again in case its DNS changed since the job was submitted
+        try:
+            await validate_callback_url(callback_url)
+            async with httpx.AsyncClient(timeout=BATCH_CALLBACK_TIMEOUT_SECONDS) as client:
+                await client.post(callback_url, json=batch_status)
+        except Exception as e:
+            print(f"⚠️ Batch callback to {callback_url} failed: {e}")
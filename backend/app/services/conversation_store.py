@@ -0,0 +1,434 @@
+"""
+Conversation Store for persisting Gemini conversation state
+
+Stores each conversation's history and system instruction in Redis so any
+worker can continue a conversation. Falls back to a bounded in-process LRU
+cache when Redis is not configured, or for a cooldown period after a Redis
+error; conversations saved in memory meanwhile are written back to Redis
+once it is reachable again.
+"""
+import os
+import json
+import time
+import asyncio
+import bisect
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+# Redis is optional - conversations stay in process memory without it
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    RedisError = OSError
+
+
+class LRUConversationCache:
+    """
+    In-memory conversation cache bounded by size and idle time
+
+    Least-recently-used entries are evicted on insert once max_sessions is
+    reached, and entries idle longer than ttl_seconds are dropped lazily on
+    access or by purge_expired().
+    """
+
+    def __init__(self, max_sessions: int, ttl_seconds: int):
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _is_expired(self, last_access: float) -> bool:
+        return time.monotonic() - last_access > self.ttl_seconds
+
+    def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(conversation_id)
+        if entry is None:
+            return None
+
+        last_access, state = entry
+        if self._is_expired(last_access):
+            del self._entries[conversation_id]
+            return None
+
+        self._entries[conversation_id] = (time.monotonic(), state)
+        self._entries.move_to_end(conversation_id)
+        return state
+
+    def set(self, conversation_id: str, state: Dict[str, Any]):
+        if conversation_id in self._entries:
+            self._entries.move_to_end(conversation_id)
+        else:
+            while len(self._entries) >= self.max_sessions:
+                self._entries.popitem(last=False)
+
+        self._entries[conversation_id] = (time.monotonic(), state)
+
+    def pop(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        entry = self._entries.pop(conversation_id, None)
+        if entry is None or self._is_expired(entry[0]):
+            return None
+        return entry[1]
+
+    def pop_if(self, conversation_id: str, state: Dict[str, Any]):
+        """Remove an entry only if it still holds `state` (wasn't replaced since)"""
+        entry = self._entries.get(conversation_id)
+        if entry is not None and entry[1] is state:
+            del self._entries[conversation_id]
+
+    def items(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Get all live entries without refreshing their access time"""
+        self.purge_expired()
+        return [(cid, state) for cid, (_, state) in self._entries.items()]
+
+    def purge_expired(self) -> int:
+        """Drop all expired entries. Returns the number removed"""
+        # Entries are ordered by last access, so stop at the first live one
+        removed = 0
+        while self._entries:
+            cid, (last_access, _) = next(iter(self._entries.items()))
+            if not self._is_expired(last_access):
+                break
+            del self._entries[cid]
+            removed += 1
+        return removed
+
+    def clear(self) -> int:
+        count = len(self._entries)
+        self._entries.clear()
+        return count
+
+
+# Fetch a conversation and refresh its TTL in one atomic round-trip, so reads
+# keep a conversation alive the same way the local LRU's idle timeout does.
+# KEYS: conversation, expiry index; ARGV: TTL, new expiry time, conversation ID
+GET_AND_TOUCH_SCRIPT = """
+local value = redis.call('GET', KEYS[1])
+if not value then
+    return nil
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[3])
+return value
+"""
+
+# Conversation keys expire by TTL without touching the summary hash or the
+# version, so drop the summaries of conversations whose expiry time has passed
+# and bump the version in one atomic step. Costs O(expired), at most
+# PURGE_BATCH_SIZE per call. KEYS: expiry index, summary hash, version; ARGV: now
+PURGE_BATCH_SIZE = 1000
+PURGE_EXPIRED_SCRIPT = f"""
+local expired = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, {PURGE_BATCH_SIZE})
+if #expired == 0 then
+    return 0
+end
+redis.call('ZREM', KEYS[1], unpack(expired))
+redis.call('HDEL', KEYS[2], unpack(expired))
+redis.call('INCR', KEYS[3])
+return #expired
+"""
+
+
+class ConversationStore:
+    """Redis-backed store for conversation state keyed by conversation_id"""
+
+    KEY_PREFIX = "conv:"
+    # Hash of conversation_id -> listing summary, so listing never loads histories
+    SUMMARY_KEY = "conv:summary"
+    # Bumped on every change; backs the ETag of the conversation listing
+    VERSION_KEY = "conv:version"
+    # Sorted set of conversation_id scored by expiry time, so expired
+    # summaries are found without checking every conversation key
+    EXPIRY_KEY = "conv:expiry"
+
+    def __init__(self):
+        self.redis_url = os.getenv("REDIS_URL")
+        self.ttl_seconds = int(os.getenv("CONVERSATION_TTL_SECONDS", "1800"))  # 30 minutes
+        self.max_local_sessions = int(os.getenv("CONVERSATION_MAX_SESSIONS", "1000"))
+        self.sweep_interval_seconds = 60
+        self.redis_retry_seconds = int(os.getenv("CONVERSATION_REDIS_RETRY_SECONDS", "30"))
+
+        self._redis = None
+        self._redis_retry_at = 0.0
+        # Set when conversations may have been saved in memory during an outage
+        self._flush_pending = False
+        if REDIS_AVAILABLE and self.redis_url:
+            self._redis = aioredis.from_url(self.redis_url, decode_responses=True)
+            self._get_and_touch = self._redis.register_script(GET_AND_TOUCH_SCRIPT)
+            self._purge_expired = self._redis.register_script(PURGE_EXPIRED_SCRIPT)
+
+        # Local fallback used when Redis is unavailable
+        self._local = LRUConversationCache(self.max_local_sessions, self.ttl_seconds)
+        self._local_version = 0
+        self._sweeper: Optional[asyncio.Task] = None
+
+    def _key(self, conversation_id: str) -> str:
+        return f"{self.KEY_PREFIX}{conversation_id}"
+
+    @property
+    def redis(self):
+        """The Redis client, or None if Redis isn't configured or is cooling down after a failure"""
+        if time.monotonic() < self._redis_retry_at:
+            return None
+        return self._redis
+
+    def _disable_redis(self, error: Exception):
+        """Use the in-memory store for redis_retry_seconds after a Redis failure"""
+        print(
+            f"⚠️ Redis unavailable, using in-memory conversation store "
+            f"for {self.redis_retry_seconds}s: {error}"
+        )
+        self._redis_retry_at = time.monotonic() + self.redis_retry_seconds
+        self._flush_pending = True
+
+    def _queue_save(self, pipe, conversation_id: str, state: Dict[str, Any]):
+        """Add the commands that store a conversation and its summary to a pipeline"""
+        summary = {
+            "message_count": state["message_count"],
+            "has_system_instruction": state["system_instruction"] is not None
+        }
+        pipe.set(self._key(conversation_id), json.dumps(state), ex=self.ttl_seconds)
+        pipe.hset(self.SUMMARY_KEY, conversation_id, json.dumps(summary))
+        pipe.zadd(self.EXPIRY_KEY, {conversation_id: time.time() + self.ttl_seconds})
+
+    async def _flush_local(self):
+        """
+        Write conversations saved in memory during a Redis outage back to Redis
+
+        Called before each Redis operation; a no-op unless Redis failed
+        earlier. Entries are dropped from memory once written, unless they
+        were saved again meanwhile. Raises RedisError if Redis fails again.
+        """
+        if not self._flush_pending:
+            return
+        self._flush_pending = False
+
+        entries = self._local.items()
+        if not entries:
+            return
+
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                for conversation_id, state in entries:
+                    self._queue_save(pipe, conversation_id, state)
+                pipe.incr(self.VERSION_KEY)
+                await pipe.execute()
+        except RedisError:
+            self._flush_pending = True
+            raise
+
+        for conversation_id, state in entries:
+            self._local.pop_if(conversation_id, state)
+        print(f"Moved {len(entries)} conversation(s) from memory back to Redis")
+
+    async def get(self, conversation_id: str) -> Optional[Dict[str, Any]]:
+        """Get a conversation's state, or None if it does not exist"""
+        if self.redis:
+            try:
+                await self._flush_local()
+                raw = await self._get_and_touch(
+                    keys=[self._key(conversation_id), self.EXPIRY_KEY],
+                    args=[self.ttl_seconds, time.time() + self.ttl_seconds, conversation_id]
+                )
+                if raw:
+                    return json.loads(raw)
+                # Not written back yet (e.g. another call is flushing it)
+                return self._local.get(conversation_id)
+            except RedisError as e:
+                self._disable_redis(e)
+
+        return self._local.get(conversation_id)
+
+    async def save(
+        self,
+        conversation_id: str,
+        history: List[Dict[str, Any]],
+        system_instruction: Optional[str] = None
+    ):
+        """Save a conversation's state and refresh its TTL"""
+        state = {
+            "history": history,
+            "system_instruction": system_instruction,
+            # Counted once per write so listings don't walk every history
+            "message_count": len(history)
+        }
+
+        if self.redis:
+            try:
+                await self._flush_local()
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    self._queue_save(pipe, conversation_id, state)
+                    pipe.incr(self.VERSION_KEY)
+                    await pipe.execute()
+                return
+            except RedisError as e:
+                self._disable_redis(e)
+
+        self._local.set(conversation_id, state)
+        self._local_version += 1
+
+    async def delete(self, conversation_id: str) -> bool:
+        """Delete a conversation. Returns False if it did not exist"""
+        if self.redis:
+            try:
+                await self._flush_local()
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.delete(self._key(conversation_id))
+                    pipe.hdel(self.SUMMARY_KEY, conversation_id)
+                    pipe.zrem(self.EXPIRY_KEY, conversation_id)
+                    pipe.incr(self.VERSION_KEY)
+                    deleted, _, _, _ = await pipe.execute()
+                return bool(deleted)
+            except RedisError as e:
+                self._disable_redis(e)
+
+        if self._local.pop(conversation_id) is None:
+            return False
+        self._local_version += 1
+        return True
+
+    def _purge_local(self) -> int:
+        """Drop expired local conversations, bumping the version if any were removed"""
+        removed = self._local.purge_expired()
+        if removed:
+            self._local_version += 1
+        return removed
+
+    async def _purge_redis(self) -> int:
+        """Drop summaries of conversations that expired in Redis, bumping the version if any were"""
+        return await self._purge_expired(
+            keys=[self.EXPIRY_KEY, self.SUMMARY_KEY, self.VERSION_KEY],
+            args=[time.time()]
+        )
+
+    async def version(self) -> int:
+        """Get a counter that changes whenever the set of conversations changes"""
+        if self.redis:
+            try:
+                await self._flush_local()
+                await self._purge_redis()
+                return int(await self.redis.get(self.VERSION_KEY) or 0)
+            except RedisError as e:
+                self._disable_redis(e)
+
+        self._purge_local()
+        return self._local_version
+
+    async def list_summaries(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], int]:
+        """
+        List conversation summaries without loading their histories
+
+        Conversations are ordered by ID; pass the returned cursor back to get
+        the next page.
+
+        Args:
+            limit: Maximum number of conversations to return (all if None)
+            cursor: Return conversations with IDs after this one
+
+        Returns:
+            The page of summaries, the cursor for the next page (None on the
+            last page) and the total number of conversations
+        """
+        if self.redis:
+            try:
+                # Summary entries outlive their conversation key, so purge
+                # expired ones first and the total counts live conversations
+                # (O(expired), see PURGE_EXPIRED_SCRIPT)
+                await self._flush_local()
+                await self._purge_redis()
+                summaries = await self.redis.hgetall(self.SUMMARY_KEY)
+                conversation_ids = sorted(summaries)
+                page_ids, next_cursor = self._page(conversation_ids, limit, cursor)
+                page = [
+                    {"conversation_id": cid, **json.loads(summaries[cid])}
+                    for cid in page_ids
+                ]
+                return page, next_cursor, len(conversation_ids)
+            except RedisError as e:
+                self._disable_redis(e)
+
+        self._purge_local()
+        states = dict(self._local.items())
+        page_ids, next_cursor = self._page(sorted(states), limit, cursor)
+        page = [
+            {
+                "conversation_id": cid,
+                "message_count": states[cid]["message_count"],
+                "has_system_instruction": states[cid]["system_instruction"] is not None
+            }
+            for cid in page_ids
+        ]
+        return page, next_cursor, len(states)
+
+    @staticmethod
+    def _page(
+        conversation_ids: List[str],
+        limit: Optional[int],
+        cursor: Optional[str]
+    ) -> Tuple[List[str], Optional[str]]:
+        """Slice sorted IDs after the cursor. Returns the page and the next cursor"""
+        if cursor is not None:
+            conversation_ids = conversation_ids[bisect.bisect_right(conversation_ids, cursor):]
+        if limit is None or len(conversation_ids) <= limit:
+            return conversation_ids, None
+        page_ids = conversation_ids[:limit]
+        return page_ids, page_ids[-1]
+
+    async def clear(self) -> int:
+        """Delete all conversations. Returns the number removed"""
+        if self.redis:
+            try:
+                # Conversations still waiting to be written back are cleared too
+                self._flush_pending = False
+                self._local.clear()
+                conversation_ids = await self.redis.hkeys(self.SUMMARY_KEY)
+                if not conversation_ids:
+                    return 0
+
+                async with self.redis.pipeline(transaction=True) as pipe:
+                    pipe.delete(*[self._key(cid) for cid in conversation_ids])
+                    pipe.delete(self.SUMMARY_KEY, self.EXPIRY_KEY)
+                    pipe.incr(self.VERSION_KEY)
+                    deleted, _, _ = await pipe.execute()
+                return deleted
+            except RedisError as e:
+                self._disable_redis(e)
+
+        cleared = self._local.clear()
+        self._local_version += 1
+        return cleared
+
+    async def _sweep_expired(self):
+        """Periodically release memory held by expired local conversations"""
+        while True:
+            await asyncio.sleep(self.sweep_interval_seconds)
+            removed = self._purge_local()
+            if removed:
+                print(f"Purged {removed} expired conversation(s)")
+
+    def start_sweeper(self):
+        """Start the background sweeper (call from the app lifespan)"""
+        if self._sweeper is None or self._sweeper.done():
+            self._sweeper = asyncio.create_task(self._sweep_expired())
+
+    async def stop_sweeper(self):
+        """Cancel the background sweeper"""
+        if self._sweeper:
+            self._sweeper.cancel()
+            try:
+                await self._sweeper
+            except asyncio.CancelledError:
+                pass
+            self._sweeper = None
+
+
+# Singleton instance
+conversation_store = ConversationStore()
@@ -0,0 +1,123 @@
+"""
+Document Cache for extracted text results
+
+Caches DocumentProcessor results keyed by a truncated SHA-256 of the file
+bytes, so re-sent attachments skip parsing and OCR entirely. Results are
+kept in a bounded in-process LRU and, when configured, in Redis so they are
+shared between workers and survive restarts.
+"""
+import os
+import json
+import hashlib
+from datetime import datetime
+from typing import Dict, Any, List, Optional
+
+from cachetools import LRUCache
+
+# Redis is optional - without it every lookup is a miss
+try:
+    import redis.asyncio as aioredis
+    from redis.exceptions import RedisError
+    REDIS_AVAILABLE = True
+except ImportError:
+    REDIS_AVAILABLE = False
+    RedisError = OSError
+
+# Hex characters of the SHA-256 content hash used as the cache key
+CONTENT_HASH_LENGTH = 32
+
+
+def content_hash(data: bytes) -> str:
+    """Get the cache key for a file's bytes"""
+    return hashlib.sha256(data).hexdigest()[:CONTENT_HASH_LENGTH]
+
+
+def _json_default(value: Any) -> str:
+    """Encode values the json module can't (timestamps, PDF metadata objects)"""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class DocumentCache:
+    """Two-level (in-process LRU, then Redis) cache of processing results keyed by content hash"""
+
+    KEY_PREFIX = "doc:"
+
+    def __init__(self):
+        self.redis_url = os.getenv("REDIS_URL")
+        self.ttl_seconds = int(os.getenv("DOCUMENT_CACHE_TTL_SECONDS", "86400"))  # 24 hours
+        self._local: LRUCache = LRUCache(
+            maxsize=int(os.getenv("DOCUMENT_CACHE_LOCAL_SIZE", "512"))
+        )
+
+        self.redis = None
+        if REDIS_AVAILABLE and self.redis_url:
+            self.redis = aioredis.from_url(self.redis_url, decode_responses=True)
+
+    def _key(self, content_hash: str) -> str:
+        return f"{self.KEY_PREFIX}{content_hash}"
+
+    async def get(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Get a cached result, or None on a miss"""
+        return (await self.get_many([content_hash]))[0]
+
+    async def get_many(self, content_hashes: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Get cached results for several hashes
+
+        Local hits are returned as copies so callers can annotate them (e.g.
+        with the uploaded filename); the rest are fetched from Redis in one
+        round-trip.
+        """
+        results: List[Optional[Dict[str, Any]]] = []
+        missing: List[int] = []
+        for i, content_hash in enumerate(content_hashes):
+            cached = self._local.get(content_hash)
+            results.append(dict(cached) if cached is not None else None)
+            if cached is None:
+                missing.append(i)
+
+        if not self.redis or not missing:
+            return results
+
+        try:
+            raw_results = await self.redis.mget([self._key(content_hashes[i]) for i in missing])
+        except RedisError as e:
+            print(f"⚠️ Document cache read failed: {e}")
+            return results
+
+        for i, raw in zip(missing, raw_results):
+            if raw:
+                results[i] = json.loads(raw)
+                self._local[content_hashes[i]] = dict(results[i])
+
+        return results
+
+    async def set(self, content_hash: str, result: Dict[str, Any]):
+        """Cache a processing result"""
+        await self.set_many({content_hash: result})
+
+    async def set_many(self, results: Dict[str, Dict[str, Any]]):
+        """Cache several processing results (one Redis round-trip)"""
+        for content_hash, result in results.items():
+            self._local[content_hash] = dict(result)
+
+        if not self.redis or not results:
+            return
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for content_hash, result in results.items():
+                    pipe.set(
+                        self._key(content_hash),
+                        json.dumps(result, default=_json_default),
+                        ex=self.ttl_seconds
+                    )
+                await pipe.execute()
+        except RedisError as e:
+            print(f"⚠️ Document cache write failed: {e}")
+
+
+# Singleton instance
+document_cache = DocumentCache()
@@ -10,8 +10,15 @@ Handles extraction of text and metadata from various document types:
 
 import os
 import io
-from typing import Dict, Any, List, Optional, BinaryIO
-from datetime import datetime
+import shlex
+import shutil
+import tempfile
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import Dict, Any, Callable, Iterable, List, Optional, Tuple, BinaryIO
 import mimetypes
 
 from PIL import Image
@@ -19,14 +26,195 @@ import PyPDF2
 from docx import Document
 import openpyxl
 
-# OCR imports (optional - will work without if tesseract not installed)
+from app.timestamps import utc_now
+from app.worker_budget import DOCUMENT_WORKERS, PAGE_WORKERS
+from app.services.document_cache import document_cache, content_hash
+
+# PDFium (C) text extraction is much faster than PyPDF2's pure-Python layout
+# reconstruction; PyPDF2 is the fallback when pypdfium2 isn't installed
+try:
+    import pypdfium2 as pdfium
+    PDFIUM_AVAILABLE = True
+except ImportError:
+    PDFIUM_AVAILABLE = False
+
+# tesserocr keeps the tesseract engine loaded in-process; pytesseract (the
+# fallback) starts a tesseract process, reloading the model, for every image.
+# tesserocr is an optional install (it builds against the tesseract headers),
+# see requirements.txt.
+try:
+    from tesserocr import PyTessBaseAPI
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    TESSEROCR_AVAILABLE = False
+
 try:
     import pytesseract
+    PYTESSERACT_AVAILABLE = True
+except ImportError:
+    PYTESSERACT_AVAILABLE = False
+
+# OCR imports (optional - will work without if tesseract not installed)
+try:
     from pdf2image import convert_from_bytes
-    OCR_AVAILABLE = True
+    OCR_AVAILABLE = TESSEROCR_AVAILABLE or PYTESSERACT_AVAILABLE
 except ImportError:
     OCR_AVAILABLE = False
-    print("⚠️ OCR not available. Install pytesseract and pdf2image for image/scanned PDF support")
+
+if not OCR_AVAILABLE:
+    print("⚠️ OCR not available. Install pytesseract (or tesserocr) and pdf2image for image/scanned PDF support")
+
+# PDFs with at least this many pages have their pages processed in parallel;
+# below it the pool overhead outweighs the gain
+PARALLEL_PAGE_THRESHOLD = int(os.getenv("PDF_PARALLEL_PAGE_THRESHOLD", "8"))
+
+# PDF text extraction can't run in parallel threads (PyPDF2 is pure Python and
+# holds the GIL, and PDFium isn't thread-safe), so long documents have their
+# pages extracted in worker processes. The pool is started on first use.
+_page_process_pool: Optional[ProcessPoolExecutor] = None
+_page_process_pool_lock = threading.Lock()
+
+# PDFium is not thread-safe, and the document pool runs several extractions at
+# once - every PDFium call in this process must hold this lock. Worker
+# processes run one page range at a time, so they don't need it.
+_pdfium_lock = threading.Lock()
+
+# Tesseract releases the GIL (tesserocr) or runs as a subprocess (pytesseract),
+# so threads are enough to OCR pages in parallel
+_ocr_page_pool = ThreadPoolExecutor(max_workers=PAGE_WORKERS, thread_name_prefix="page-ocr")
+
+
+# Tesseract time scales with pixel count; ~2500px on the long side keeps
+# scans above 200 DPI effective while cutting most of the work. OEM 1 is the
+# LSTM engine only, PSM 6 skips page layout analysis.
+OCR_MAX_SIDE = int(os.getenv("OCR_MAX_SIDE", "2500"))
+OCR_OEM = int(os.getenv("OCR_OEM", "1"))
+OCR_PSM = int(os.getenv("OCR_PSM", "6"))
+OCR_CONFIG = os.getenv("OCR_CONFIG", f"--oem {OCR_OEM} --psm {OCR_PSM}")
+
+# One tesserocr engine per thread - an engine isn't safe to share, and
+# loading it is the expensive part, so each OCR thread keeps its own
+_tesseract = threading.local()
+
+# Cleared when a tesserocr engine fails to load (e.g. its tessdata isn't
+# found), so OCR falls back to pytesseract from then on
+_use_tesserocr = TESSEROCR_AVAILABLE
+
+
+def _tesserocr_options(config: str) -> Tuple[Dict[str, Any], Dict[str, str]]:
+    """
+    Translate a tesseract command-line config into tesserocr settings
+
+    Returns the PyTessBaseAPI keyword arguments (--psm, --oem, -l,
+    --tessdata-dir) and the variables to set (-c name=value), so OCR_CONFIG
+    means the same thing on both OCR paths.
+    """
+    kwargs: Dict[str, Any] = {"psm": OCR_PSM, "oem": OCR_OEM}
+    variables: Dict[str, str] = {}
+    args = shlex.split(config)
+    for option, value in zip(args, args[1:]):
+        if option == "--psm":
+            kwargs["psm"] = int(value)
+        elif option == "--oem":
+            kwargs["oem"] = int(value)
+        elif option == "-l":
+            kwargs["lang"] = value
+        elif option == "--tessdata-dir":
+            kwargs["path"] = value
+        elif option == "-c" and "=" in value:
+            name, _, setting = value.partition("=")
+            variables[name] = setting
+    return kwargs, variables
+
+
+def _prepare_for_ocr(image: Image.Image) -> Image.Image:
+    """Convert an image to grayscale and cap its longest side at OCR_MAX_SIDE"""
+    image = image.convert("L")
+    width, height = image.size
+    longest = max(width, height)
+    if longest > OCR_MAX_SIDE:
+        scale = OCR_MAX_SIDE / longest
+        image = image.resize((int(width * scale), int(height * scale)), Image.LANCZOS)
+    return image
+
+
+def _tesseract_api() -> "PyTessBaseAPI":
+    """Get this thread's tesseract engine, loading it on first use"""
+    api = getattr(_tesseract, "api", None)
+    if api is None:
+        kwargs, variables = _tesserocr_options(OCR_CONFIG)
+        api = PyTessBaseAPI(**kwargs)
+        for name, value in variables.items():
+            api.SetVariable(name, value)
+        _tesseract.api = api
+    return api
+
+
+def _ocr_image(image: Image.Image) -> str:
+    global _use_tesserocr
+    image = _prepare_for_ocr(image)
+    if _use_tesserocr:
+        try:
+            api = _tesseract_api()
+        except Exception as e:
+            if not PYTESSERACT_AVAILABLE:
+                raise
+            print(f"⚠️ tesserocr failed to load ({e}), falling back to pytesseract")
+            _use_tesserocr = False
+        else:
+            api.SetImage(image)
+            return api.GetUTF8Text()
+    return pytesseract.image_to_string(image, config=OCR_CONFIG)
+
+
+def shutdown_page_pools():
+    """Stop the page extraction and page OCR pools (call from the app lifespan)"""
+    global _page_process_pool
+    _ocr_page_pool.shutdown(wait=False, cancel_futures=True)
+    with _page_process_pool_lock:
+        if _page_process_pool is not None:
+            _page_process_pool.shutdown(wait=False, cancel_futures=True)
+            _page_process_pool = None
+
+
+def _get_page_process_pool() -> ProcessPoolExecutor:
+    global _page_process_pool
+    with _page_process_pool_lock:
+        if _page_process_pool is None:
+            # spawn, not fork: the server process is multi-threaded
+            _page_process_pool = ProcessPoolExecutor(
+                max_workers=PAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _page_process_pool
+
+
+def _pdfium_page_text(pdf: "pdfium.PdfDocument", index: int) -> str:
+    page = pdf[index]
+    textpage = page.get_textpage()
+    try:
+        return textpage.get_text_range()
+    finally:
+        textpage.close()
+        page.close()
+
+
+def _extract_page_range(pdf_path: str, start: int, end: int) -> List[str]:
+    """
+    Extract the text of pages [start, end) (runs in a worker process)
+
+    Page objects can't be pickled, so each worker opens the PDF itself from
+    a file rather than being sent a copy of its bytes.
+    """
+    if PDFIUM_AVAILABLE:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return [_pdfium_page_text(pdf, index) for index in range(start, end)]
+        finally:
+            pdf.close()
+
+    pdf_reader = PyPDF2.PdfReader(pdf_path)
+    return [pdf_reader.pages[index].extract_text() for index in range(start, end)]
 
 
 class DocumentProcessor:
@@ -51,8 +239,79 @@ class DocumentProcessor:
 
     def __init__(self):
         self.max_file_size = 50 * 1024 * 1024  # 50MB
+        self.max_batch_size = 200 * 1024 * 1024  # 200MB across a batch upload
         self.ocr_available = OCR_AVAILABLE
 
+        # Pool for CPU-bound parsing/OCR so it never runs on the event loop.
+        # Threads rather than processes: spooled uploads can't be pickled,
+        # tesserocr releases the GIL, and pdf2image shells out to poppler.
+        self.executor = ThreadPoolExecutor(
+            max_workers=DOCUMENT_WORKERS,
+            thread_name_prefix="document-ocr"
+        )
+
+        # MIME type -> document type, copied so registrations stay per instance
+        self.supported_mime_types = dict(self.SUPPORTED_MIME_TYPES)
+
+        # Extraction method per document type
+        self._processors = {
+            'pdf': self._process_pdf,
+            'image': self._process_image,
+            'docx': self._process_docx,
+            'xlsx': self._process_xlsx,
+            'text': self._process_text,
+        }
+
+    def shutdown(self):
+        """Stop the document pool and the shared page pools (call from the app lifespan)"""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        shutdown_page_pools()
+
+    def register_processor(
+        self,
+        doc_type: str,
+        processor: Callable[[BinaryIO], Dict[str, Any]],
+        mime_types: Iterable[str] = ()
+    ):
+        """
+        Register (or replace) the extraction method for a document type
+
+        Args:
+            doc_type: Document type key (e.g. 'pdf')
+            processor: Synchronous callable taking a seekable file object and
+                returning the extracted fields (text_content, pages, ...)
+            mime_types: MIME types that map to this document type
+        """
+        self._processors[doc_type] = processor
+        for mime_type in mime_types:
+            self.supported_mime_types[mime_type] = doc_type
+
+    def resolve_document_type(self, filename: str, content_type: Optional[str] = None) -> str:
+        """
+        Get the document type for a file without reading it
+
+        Args:
+            filename: Original filename
+            content_type: MIME type (optional, will be detected if not provided)
+
+        Returns:
+            Document type key (e.g. 'pdf', 'image')
+
+        Raises:
+            ValueError: If the file type is unsupported or has no processor
+        """
+        if not content_type:
+            content_type, _ = mimetypes.guess_type(filename)
+
+        doc_type = self.supported_mime_types.get(content_type, 'unknown')
+
+        if doc_type == 'unknown':
+            raise ValueError(f"Unsupported file type: {content_type}")
+        if doc_type not in self._processors:
+            raise ValueError(f"Processing not implemented for type: {doc_type}")
+
+        return doc_type
+
     async def process_document(
         self,
         file_content: bytes,
@@ -62,6 +321,9 @@ class DocumentProcessor:
         """
         Process a document and extract text content and metadata
 
+        Prefer process_document_stream for uploads, so the file never has to
+        be held in memory as a single bytes object.
+
         Args:
             file_content: Raw file bytes
             filename: Original filename
@@ -70,8 +332,88 @@ class DocumentProcessor:
         Returns:
             Dictionary with extracted text, metadata, and processing info
         """
+        return await self.process_document_stream(
+            file_obj=io.BytesIO(file_content),
+            filename=filename,
+            content_type=content_type,
+            file_size=len(file_content),
+            known_hash=content_hash(file_content)
+        )
+
+    async def process_document_stream(
+        self,
+        file_obj: BinaryIO,
+        filename: str,
+        content_type: Optional[str] = None,
+        file_size: Optional[int] = None,
+        known_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Process a document from a seekable file object
+
+        Parsers read from the file object directly, so uploads spooled to a
+        temporary file are never loaded into memory as a single bytes object.
+        Extraction runs on the processor's thread pool.
+
+        When the content hash is given (callers compute it while spooling the
+        upload), results are cached by it, so the same file sent again (e.g.
+        re-attached to a new conversation) is returned without re-parsing,
+        with "cache_hit" set.
+
+        Args:
+            file_obj: Seekable binary file object positioned anywhere
+            filename: Original filename
+            content_type: MIME type (optional, will be detected if not provided)
+            file_size: Size in bytes (optional, measured from file_obj if not provided)
+            known_hash: The file's content_hash, used as the cache key (optional)
+
+        Returns:
+            Dictionary with extracted text, metadata, and processing info
+        """
+        if known_hash:
+            cached = await document_cache.get(known_hash)
+            if cached is not None:
+                return {**cached, "filename": filename, "cache_hit": True}
+
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self.executor,
+            partial(self.process_document_stream_sync, file_obj, filename, content_type, file_size)
+        )
+
+        if known_hash and result.get("success"):
+            await document_cache.set(known_hash, result)
+
+        return result
+
+    def process_document_stream_sync(
+        self,
+        file_obj: BinaryIO,
+        filename: str,
+        content_type: Optional[str] = None,
+        file_size: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Synchronous variant of process_document_stream
+
+        Parsing and OCR are CPU-bound, so async callers should use
+        process_document_stream, which runs this on the processor's pool.
+
+        Args:
+            file_obj: Seekable binary file object positioned anywhere
+            filename: Original filename
+            content_type: MIME type (optional, will be detected if not provided)
+            file_size: Size in bytes (optional, measured from file_obj if not provided)
+
+        Returns:
+            Dictionary with extracted text, metadata, and processing info
+        """
+        if file_size is None:
+            file_size = file_obj.seek(0, io.SEEK_END)
+        file_obj.seek(0)
+
         # Validate file size
-        if len(file_content) > self.max_file_size:
+        if file_size > self.max_file_size:
             raise ValueError(f"File size exceeds maximum allowed size of {self.max_file_size / 1024 / 1024}MB")
 
         # Detect content type if not provided
@@ -79,7 +421,7 @@ class DocumentProcessor:
             content_type, _ = mimetypes.guess_type(filename)
 
         # Determine document type
-        doc_type = self.SUPPORTED_MIME_TYPES.get(content_type, 'unknown')
+        doc_type = self.supported_mime_types.get(content_type, 'unknown')
 
         if doc_type == 'unknown':
             raise ValueError(f"Unsupported file type: {content_type}")
@@ -87,10 +429,10 @@ class DocumentProcessor:
         # Process based on document type
         result = {
             "filename": filename,
-            "file_size": len(file_content),
+            "file_size": file_size,
             "content_type": content_type,
             "document_type": doc_type,
-            "processed_at": datetime.utcnow().isoformat(),
+            "processed_at": utc_now(),
             "text_content": "",
             "metadata": {},
             "pages": 0,
@@ -98,20 +440,11 @@ class DocumentProcessor:
         }
 
         try:
-            if doc_type == 'pdf':
-                extracted = await self._process_pdf(file_content)
-            elif doc_type == 'image':
-                extracted = await self._process_image(file_content)
-            elif doc_type == 'docx':
-                extracted = await self._process_docx(file_content)
-            elif doc_type == 'xlsx':
-                extracted = await self._process_xlsx(file_content)
-            elif doc_type == 'text':
-                extracted = await self._process_text(file_content)
-            else:
+            processor = self._processors.get(doc_type)
+            if processor is None:
                 raise ValueError(f"Processing not implemented for type: {doc_type}")
 
-            result.update(extracted)
+            result.update(processor(file_obj))
             result["success"] = True
 
         except Exception as e:
@@ -120,7 +453,7 @@ class DocumentProcessor:
 
         return result
 
-    async def _process_pdf(self, content: bytes) -> Dict[str, Any]:
+    def _process_pdf(self, file_obj: BinaryIO) -> Dict[str, Any]:
         """Extract text from PDF (with OCR fallback for scanned PDFs)"""
         result = {
             "text_content": "",
@@ -130,17 +463,15 @@ class DocumentProcessor:
         }
 
         try:
-            # Try text extraction first
-            pdf_file = io.BytesIO(content)
-            pdf_reader = PyPDF2.PdfReader(pdf_file)
+            # Try text extraction first (pages are parsed lazily from the stream)
+            result["pages"], result["metadata"], page_texts = self._read_pdf(file_obj)
 
-            result["pages"] = len(pdf_reader.pages)
-            result["metadata"] = pdf_reader.metadata or {}
+            # Longer documents are extracted across the process pool
+            if page_texts is None:
+                page_texts = self._extract_pages_parallel(file_obj, result["pages"])
 
-            # Extract text from all pages
             text_parts = []
-            for page_num, page in enumerate(pdf_reader.pages, 1):
-                page_text = page.extract_text()
+            for page_num, page_text in enumerate(page_texts, 1):
                 if page_text.strip():
                     text_parts.append(f"--- Page {page_num} ---\n{page_text}")
 
@@ -149,7 +480,7 @@ class DocumentProcessor:
             # If we got very little text, try OCR
             if len(extracted_text.strip()) < 100 and self.ocr_available:
                 print(f"PDF appears to be scanned (only {len(extracted_text)} chars), trying OCR...")
-                ocr_result = await self._process_pdf_with_ocr(content)
+                ocr_result = self._process_pdf_with_ocr(file_obj)
                 if ocr_result["text_content"]:
                     result["text_content"] = ocr_result["text_content"]
                     result["extraction_method"] = "pdf_ocr"
@@ -162,26 +493,80 @@ class DocumentProcessor:
             # If text extraction fails, try OCR as fallback
             if self.ocr_available:
                 print(f"PDF text extraction failed, trying OCR: {e}")
-                ocr_result = await self._process_pdf_with_ocr(content)
+                ocr_result = self._process_pdf_with_ocr(file_obj)
                 result.update(ocr_result)
             else:
                 raise Exception(f"Failed to extract text from PDF: {e}")
 
         return result
 
-    async def _process_pdf_with_ocr(self, content: bytes) -> Dict[str, Any]:
+    def _read_pdf(self, file_obj: BinaryIO) -> Tuple[int, Dict[str, Any], Optional[List[str]]]:
+        """
+        Open a PDF and get its page count, metadata and page texts
+
+        Page texts are None when the document is long enough to be extracted
+        in parallel instead.
+        """
+        file_obj.seek(0)
+
+        if PDFIUM_AVAILABLE:
+            with _pdfium_lock:
+                pdf = pdfium.PdfDocument(file_obj)
+                try:
+                    page_count = len(pdf)
+                    metadata = pdf.get_metadata_dict(skip_empty=True)
+                    if page_count >= PARALLEL_PAGE_THRESHOLD:
+                        return page_count, metadata, None
+                    return page_count, metadata, [_pdfium_page_text(pdf, index) for index in range(page_count)]
+                finally:
+                    pdf.close()
+
+        pdf_reader = PyPDF2.PdfReader(file_obj)
+        page_count = len(pdf_reader.pages)
+        metadata = pdf_reader.metadata or {}
+        if page_count >= PARALLEL_PAGE_THRESHOLD:
+            return page_count, metadata, None
+        return page_count, metadata, [page.extract_text() for page in pdf_reader.pages]
+
+    def _extract_pages_parallel(self, file_obj: BinaryIO, page_count: int) -> List[str]:
+        """
+        Extract page texts across the process pool, one contiguous page range per worker
+
+        The upload is written to a temporary file once and the workers open
+        it by path, so the PDF isn't pickled to every worker.
+        """
+        pages_per_worker = -(-page_count // PAGE_WORKERS)
+        pool = _get_page_process_pool()
+
+        with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf_file:
+            file_obj.seek(0)
+            shutil.copyfileobj(file_obj, pdf_file)
+            pdf_file.flush()
+
+            futures = [
+                pool.submit(_extract_page_range, pdf_file.name, start, min(start + pages_per_worker, page_count))
+                for start in range(0, page_count, pages_per_worker)
+            ]
+            return [page_text for future in futures for page_text in future.result()]
+
+    def _process_pdf_with_ocr(self, file_obj: BinaryIO) -> Dict[str, Any]:
         """Process PDF using OCR (for scanned documents)"""
         if not self.ocr_available:
             return {"text_content": "", "extraction_method": "ocr_unavailable"}
 
         try:
             # Convert PDF pages to images
-            images = convert_from_bytes(content)
+            file_obj.seek(0)
+            images = convert_from_bytes(file_obj.read(), thread_count=PAGE_WORKERS)
+
+            # OCR the pages, in parallel for longer documents
+            if len(images) >= PARALLEL_PAGE_THRESHOLD:
+                page_texts = list(_ocr_page_pool.map(_ocr_image, images))
+            else:
+                page_texts = [_ocr_image(image) for image in images]
 
-            # OCR each page
             text_parts = []
-            for page_num, image in enumerate(images, 1):
-                page_text = pytesseract.image_to_string(image)
+            for page_num, page_text in enumerate(page_texts, 1):
                 if page_text.strip():
                     text_parts.append(f"--- Page {page_num} (OCR) ---\n{page_text}")
 
@@ -195,13 +580,13 @@ class DocumentProcessor:
             print(f"OCR processing failed: {e}")
             return {"text_content": "", "extraction_method": "ocr_failed"}
 
-    async def _process_image(self, content: bytes) -> Dict[str, Any]:
+    def _process_image(self, file_obj: BinaryIO) -> Dict[str, Any]:
         """Extract text from image using OCR"""
         if not self.ocr_available:
             raise Exception("OCR is not available. Install pytesseract and tesseract-ocr")
 
         try:
-            image = Image.open(io.BytesIO(content))
+            image = Image.open(file_obj)
 
             # Get image metadata
             metadata = {
@@ -211,7 +596,7 @@ class DocumentProcessor:
             }
 
             # Extract text using OCR
-            text = pytesseract.image_to_string(image)
+            text = _ocr_image(image)
 
             return {
                 "text_content": text,
@@ -223,10 +608,10 @@ class DocumentProcessor:
         except Exception as e:
             raise Exception(f"Failed to process image: {e}")
 
-    async def _process_docx(self, content: bytes) -> Dict[str, Any]:
+    def _process_docx(self, file_obj: BinaryIO) -> Dict[str, Any]:
         """Extract text from Word document"""
         try:
-            doc = Document(io.BytesIO(content))
+            doc = Document(file_obj)
 
             # Extract all paragraphs
             text_parts = [paragraph.text for paragraph in doc.paragraphs if paragraph.text.strip()]
@@ -250,23 +635,30 @@ class DocumentProcessor:
         except Exception as e:
             raise Exception(f"Failed to process DOCX: {e}")
 
-    async def _process_xlsx(self, content: bytes) -> Dict[str, Any]:
+    def _process_xlsx(self, file_obj: BinaryIO) -> Dict[str, Any]:
         """Extract text from Excel spreadsheet"""
         try:
-            workbook = openpyxl.load_workbook(io.BytesIO(content), data_only=True)
+            # read_only streams rows from the file instead of building the
+            # whole cell graph in memory
+            workbook = openpyxl.load_workbook(file_obj, data_only=True, read_only=True)
+        except Exception as e:
+            raise Exception(f"Failed to process XLSX: {e}")
 
-            text_parts = []
-            for sheet_name in workbook.sheetnames:
-                sheet = workbook[sheet_name]
-                text_parts.append(f"--- Sheet: {sheet_name} ---")
+        try:
+            text = io.StringIO()
+            for index, sheet_name in enumerate(workbook.sheetnames):
+                if index:
+                    text.write("\n")
+                text.write(f"--- Sheet: {sheet_name} ---")
 
-                for row in sheet.iter_rows(values_only=True):
+                for row in workbook[sheet_name].iter_rows(values_only=True):
                     row_text = " | ".join(str(cell) if cell is not None else "" for cell in row)
                     if row_text.strip():
-                        text_parts.append(row_text)
+                        text.write("\n")
+                        text.write(row_text)
 
             return {
-                "text_content": "\n".join(text_parts),
+                "text_content": text.getvalue(),
                 "pages": len(workbook.sheetnames),
                 "metadata": {
                     "sheets": workbook.sheetnames
@@ -276,11 +668,13 @@ class DocumentProcessor:
 
         except Exception as e:
             raise Exception(f"Failed to process XLSX: {e}")
+        finally:
+            workbook.close()
 
-    async def _process_text(self, content: bytes) -> Dict[str, Any]:
+    def _process_text(self, file_obj: BinaryIO) -> Dict[str, Any]:
         """Extract text from plain text file"""
         try:
-            text = content.decode('utf-8')
+            text = file_obj.read().decode('utf-8')
 
             return {
                 "text_content": text,
@@ -294,4 +688,4 @@ class DocumentProcessor:
 
     def get_supported_types(self) -> List[str]:
         """Get list of supported file types"""
-        return list(self.SUPPORTED_MIME_TYPES.keys())
+        return list(self.supported_mime_types.keys())
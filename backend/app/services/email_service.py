@@ -2,13 +2,25 @@
 Email Service for handling email forwarding and inbox monitoring
 """
 import os
+import re
+import time
+import binascii
+import codecs
 import imaplib
 import email
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from email.header import decode_header
-from typing import List, Dict, Any, Optional
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterator, List, Dict, Any, NamedTuple, Optional, Tuple
 from datetime import datetime
 import asyncio
-from functools import wraps
+from functools import lru_cache, wraps
+
+log = logging.getLogger(__name__)
+
 
 def sync_to_async(func):
     """Decorator to run sync functions in async context"""
@@ -19,6 +31,301 @@ def sync_to_async(func):
     return wrapper
 
 
+# The summary comes from the server-parsed ENVELOPE; the body is fetched
+# separately, and only its first BODY_PREVIEW_OCTETS octets. The raw headers
+# are only fetched for messages whose ENVELOPE can't be read. PEEK leaves
+# messages unread.
+STRUCTURE_ITEMS = "(UID ENVELOPE BODYSTRUCTURE)"
+HEADER_ITEM = "BODY.PEEK[HEADER.FIELDS (SUBJECT FROM DATE)]"
+# Enough encoded octets for the 500 characters kept, even as base64
+BODY_PREVIEW_OCTETS = 1024
+
+# Tokens of a FETCH response: parentheses, quoted strings, a literal marker
+# (its data is the next item imaplib returns), or an atom. Atoms include
+# section specs like BODY[HEADER.FIELDS (SUBJECT)]<0>, parentheses and all.
+IMAP_TOKEN = re.compile(
+    rb'\s*(?:(\()|(\))|"((?:[^"\\]|\\.)*)"|\{(\d+)\}|([^\s()"\[{]+(?:\[[^\]]*\](?:<\d+>)?)?))'
+)
+
+
+def _tokenize_fetch_response(msg_data: List[Any]) -> Iterator[Any]:
+    """Yield "(", ")", and bytes/None values from imaplib's FETCH response list"""
+    for part in msg_data:
+        line, literal = (part[0], part[1]) if isinstance(part, tuple) else (part, None)
+        if not isinstance(line, bytes):
+            continue
+
+        position = 0
+        while position < len(line):
+            match = IMAP_TOKEN.match(line, position)
+            if not match or match.end() == position:
+                break
+            position = match.end()
+            opening, closing, quoted, literal_size, atom = match.groups()
+            if opening:
+                yield "("
+            elif closing:
+                yield ")"
+            elif quoted is not None:
+                yield re.sub(rb'\\(.)', rb'\1', quoted)
+            elif literal_size is not None:
+                yield literal
+            elif atom is not None:
+                yield None if atom.upper() == b"NIL" else atom
+
+
+def _parse_fetch_response(msg_data: List[Any]) -> Dict[bytes, Dict[bytes, Any]]:
+    """
+    Parse a multi-message UID FETCH response into its items per UID
+
+    Parenthesized lists become Python lists, NIL becomes None, and item
+    names are upper-cased (e.g. {b"BODYSTRUCTURE": [...], b"BODY[1]<0>": b"..."}).
+    Unsolicited responses without a UID are skipped.
+    """
+    stack: List[List[Any]] = [[]]
+    for token in _tokenize_fetch_response(msg_data):
+        if token == "(":
+            stack.append([])
+        elif token == ")" and len(stack) > 1:
+            closed = stack.pop()
+            stack[-1].append(closed)
+        elif token != ")":
+            stack[-1].append(token)
+
+    # Top level: <seq> (<name> <value> ...) <seq> (...) ...
+    messages = {}
+    for items in stack[0]:
+        if not isinstance(items, list):
+            continue
+        fields = {
+            name.upper(): value
+            for name, value in zip(items[0::2], items[1::2])
+            if isinstance(name, bytes)
+        }
+        uid = fields.get(b"UID")
+        if uid is not None:
+            messages[uid] = fields
+    return messages
+
+
+def _find_preview_part(structure: List[Any], prefix: str = "") -> Optional[Tuple[str, List[Any]]]:
+    """
+    Find the section number and BODYSTRUCTURE of the body part to preview
+
+    That's the first text/plain part of a multipart message, or the whole
+    body of a single-part message (section "1").
+    """
+    if not structure:
+        return None
+
+    if not isinstance(structure[0], list):
+        # Single-part message
+        return "1", structure
+
+    for index, child in enumerate(structure, 1):
+        if not isinstance(child, list):
+            break  # The multipart subtype follows the parts
+        section = f"{prefix}{index}"
+        if isinstance(child[0], list):
+            found = _find_preview_part(child, f"{section}.")
+            if found:
+                return found
+        elif (child[0] or b"").lower() == b"text" and (child[1] or b"").lower() == b"plain":
+            return section, child
+    return None
+
+
+def _decode_part(data: bytes, structure: List[Any]) -> str:
+    """Decode (possibly truncated) part content using its BODYSTRUCTURE encoding and charset"""
+    params = structure[2] if len(structure) > 2 and isinstance(structure[2], list) else []
+    charset = "utf-8"
+    for name, value in zip(params[0::2], params[1::2]):
+        if (name or b"").lower() == b"charset" and value:
+            charset = value.decode("ascii", "replace")
+
+    encoding = (structure[5] or b"").lower() if len(structure) > 5 else b""
+    if encoding == b"base64":
+        data = b"".join(data.split())
+        data = binascii.a2b_base64(data[:len(data) - len(data) % 4])
+    elif encoding == b"quoted-printable":
+        data = binascii.a2b_qp(data)
+
+    try:
+        return data.decode(charset, "replace")
+    except LookupError:
+        return data.decode("utf-8", "replace")
+
+
+@lru_cache(maxsize=64)
+def _codec(charset: Optional[str]) -> codecs.CodecInfo:
+    """Resolve a header charset once (unknown charsets fall back to UTF-8)"""
+    try:
+        return codecs.lookup(charset or "utf-8")
+    except LookupError:
+        return codecs.lookup("utf-8")
+
+
+def _decode_header_value(value: str) -> str:
+    """Decode RFC 2047 encoded-words in a header (most headers have none)"""
+    if "=?" not in value:
+        return value
+
+    return "".join(
+        _codec(charset).decode(chunk, "replace")[0] if isinstance(chunk, bytes) else chunk
+        for chunk, charset in decode_header(value)
+    )
+
+
+def _envelope_text(value: Any) -> str:
+    """Decode an ENVELOPE string field (NIL becomes "")"""
+    if not isinstance(value, bytes):
+        return ""
+    return _decode_header_value(value.decode("utf-8", "replace"))
+
+
+def _envelope_address(addresses: Any) -> str:
+    """Format the first address of an ENVELOPE address list, e.g. Name <mailbox@host>"""
+    if not isinstance(addresses, list) or not addresses:
+        return ""
+    address = addresses[0]
+    if not isinstance(address, list) or len(address) < 4:
+        return ""
+
+    name = _envelope_text(address[0])
+    mailbox = _envelope_text(address[2])
+    host = _envelope_text(address[3])
+    addr_spec = f"{mailbox}@{host}" if host else mailbox
+    return f"{name} <{addr_spec}>" if name else addr_spec
+
+
+def _parse_envelope(envelope: Any) -> Optional[Dict[str, str]]:
+    """
+    Read subject, sender and date from an ENVELOPE
+
+    ENVELOPE is (date subject from sender reply-to to cc bcc in-reply-to
+    message-id). Returns None if it's missing or malformed.
+    """
+    if not isinstance(envelope, list) or len(envelope) < 3:
+        return None
+    return {
+        "subject": _envelope_text(envelope[1]),
+        "from": _envelope_address(envelope[2]),
+        "date": _envelope_text(envelope[0])
+    }
+
+
+def _parse_header(header: bytes) -> Dict[str, str]:
+    """Read subject, sender and date from raw header bytes"""
+    msg = email.message_from_bytes(header)
+    return {
+        "subject": _decode_header_value(msg.get("Subject", "")),
+        "from": msg.get("From", ""),
+        "date": msg.get("Date", "")
+    }
+
+
+def _received_at(date_str: str) -> str:
+    """Normalize a Date header to ISO 8601 (malformed dates are kept as-is)"""
+    if not date_str:
+        return datetime.utcnow().isoformat()
+    try:
+        return parsedate_to_datetime(date_str).isoformat()
+    except (TypeError, ValueError, IndexError):
+        return date_str
+
+
+def _uid_state(mail: imaplib.IMAP4_SSL) -> Optional[Tuple[int, int]]:
+    """Get UIDVALIDITY and UIDNEXT from the last SELECT, if the server sent them"""
+    try:
+        uidvalidity = mail.response("UIDVALIDITY")[1][0]
+        uidnext = mail.response("UIDNEXT")[1][0]
+        return int(uidvalidity), int(uidnext)
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class _InboxSnapshot(NamedTuple):
+    """INBOX state at the last fetch, with the summaries fetched (newest first)"""
+    uidvalidity: int
+    uidnext: int
+    exists: int
+    emails: List[Dict[str, Any]]
+
+
+class _ImapPool:
+    """
+    Logged-in IMAP connections reused across fetches
+
+    Saves the TLS handshake and LOGIN on every fetch. A connection idle for
+    longer than keepalive_seconds is checked with NOOP before reuse; one that
+    fails (or anything fails while it is in use) is dropped and replaced. At most max_size
+    connections are open at once, since providers limit sessions per account.
+    """
+
+    def __init__(
+        self,
+        connect: Callable[[], imaplib.IMAP4_SSL],
+        max_size: int = 2,
+        keepalive_seconds: float = 60
+    ):
+        self._connect = connect
+        self.keepalive_seconds = keepalive_seconds
+
+        # (connection, last used) for connections not currently borrowed
+        self._idle: List[Tuple[imaplib.IMAP4_SSL, float]] = []
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_size)
+
+    @contextmanager
+    def connection(self) -> Iterator[imaplib.IMAP4_SSL]:
+        """Borrow a connection (blocks while max_size are in use)"""
+        with self._slots:
+            mail = self._checkout()
+            try:
+                yield mail
+            except BaseException:
+                # The session may be mid-command - never hand it out again
+                _logout_quietly(mail)
+                raise
+            with self._lock:
+                self._idle.append((mail, time.monotonic()))
+
+    def _checkout(self) -> imaplib.IMAP4_SSL:
+        while True:
+            with self._lock:
+                if not self._idle:
+                    break
+                mail, last_used = self._idle.pop()
+
+            if time.monotonic() - last_used <= self.keepalive_seconds:
+                return mail
+            try:
+                mail.noop()
+                return mail
+            except (imaplib.IMAP4.error, OSError):
+                _logout_quietly(mail)
+
+        return self._connect()
+
+    def close_idle(self, max_idle_seconds: float = 0) -> int:
+        """Log out connections idle for longer than max_idle_seconds; returns how many"""
+        cutoff = time.monotonic() - max_idle_seconds
+        with self._lock:
+            expired = [mail for mail, last_used in self._idle if last_used <= cutoff]
+            self._idle = [(mail, last_used) for mail, last_used in self._idle if last_used > cutoff]
+
+        for mail in expired:
+            _logout_quietly(mail)
+        return len(expired)
+
+
+def _logout_quietly(mail: imaplib.IMAP4_SSL):
+    try:
+        mail.logout()
+    except Exception:
+        pass
+
+
 class EmailService:
     """Service for email operations"""
 
@@ -29,6 +336,34 @@ class EmailService:
         self.email_password = os.getenv("EMAIL_PASSWORD")
         self.enabled = bool(self.email_address and self.email_password)
 
+        # Pooled IMAP sessions; ones idle past the timeout are closed by the reaper
+        self.imap_idle_timeout_seconds = int(os.getenv("IMAP_IDLE_TIMEOUT_SECONDS", "300"))
+        imap_pool_size = int(os.getenv("IMAP_POOL_SIZE", "2"))
+        self._imap_pool = _ImapPool(self._open_imap, max_size=imap_pool_size)
+
+        # IMAP calls block, so they run on threads of their own - one per pooled
+        # connection, as no more can be talking to the server at once. Fetches
+        # beyond that queue here instead of tying up the default executor.
+        self.imap_executor = ThreadPoolExecutor(
+            max_workers=imap_pool_size,
+            thread_name_prefix="imap"
+        )
+        self._reaper: Optional[asyncio.Task] = None
+
+        # Last INBOX fetch, so later ones only fetch messages that arrived since
+        self._inbox_snapshot: Optional[_InboxSnapshot] = None
+        self._inbox_lock = threading.Lock()
+
+    def _open_imap(self) -> imaplib.IMAP4_SSL:
+        """Open a logged-in IMAP connection (fetches select INBOX themselves)"""
+        mail = imaplib.IMAP4_SSL(self.imap_server, self.imap_port)
+        try:
+            mail.login(self.email_address, self.email_password)
+        except Exception:
+            _logout_quietly(mail)
+            raise
+        return mail
+
     @sync_to_async
     def _connect_imap(self) -> Optional[imaplib.IMAP4_SSL]:
         """Connect to IMAP server"""
@@ -43,101 +378,207 @@ class EmailService:
             print(f"Failed to connect to IMAP: {e}")
             return None
 
-    @sync_to_async
     def _fetch_emails(self, limit: int = 50) -> List[Dict[str, Any]]:
-        """Fetch emails from inbox"""
+        """Fetch emails from inbox (blocking - runs on imap_executor)"""
         emails = []
 
         try:
-            mail = imaplib.IMAP4_SSL(self.imap_server, self.imap_port)
-            mail.login(self.email_address, self.email_password)
-            mail.select("INBOX")
-
-            # Search for all emails
-            status, messages = mail.search(None, "ALL")
-            if status != "OK":
-                return emails
-
-            email_ids = messages[0].split()
-            # Get the last N emails
-            email_ids = email_ids[-limit:] if len(email_ids) > limit else email_ids
-
-            for email_id in reversed(email_ids):
-                try:
-                    status, msg_data = mail.fetch(email_id, "(RFC822)")
-                    if status != "OK":
-                        continue
-
-                    for response_part in msg_data:
-                        if isinstance(response_part, tuple):
-                            msg = email.message_from_bytes(response_part[1])
-
-                            # Decode subject
-                            subject = msg.get("Subject", "")
-                            if subject:
-                                decoded = decode_header(subject)
-                                subject = decoded[0][0]
-                                if isinstance(subject, bytes):
-                                    subject = subject.decode(decoded[0][1] or 'utf-8')
-
-                            # Get sender
-                            from_addr = msg.get("From", "")
-
-                            # Get date
-                            date_str = msg.get("Date", "")
-
-                            # Get body
-                            body = ""
-                            if msg.is_multipart():
-                                for part in msg.walk():
-                                    content_type = part.get_content_type()
-                                    if content_type == "text/plain":
-                                        try:
-                                            body = part.get_payload(decode=True).decode()
-                                            break
-                                        except:
-                                            pass
-                            else:
-                                try:
-                                    body = msg.get_payload(decode=True).decode()
-                                except:
-                                    body = str(msg.get_payload())
-
-                            emails.append({
-                                "id": email_id.decode(),
-                                "subject": subject,
-                                "from": from_addr,
-                                "body": body[:500],  # Limit body length
-                                "received_at": date_str or datetime.utcnow().isoformat(),
-                                "processed": False
-                            })
-
-                except Exception as e:
-                    print(f"Error processing email {email_id}: {e}")
-                    continue
-
-            mail.close()
-            mail.logout()
+            with self._imap_pool.connection() as mail:
+                emails = self._fetch_from(mail, limit)
 
         except Exception as e:
             print(f"Error fetching emails: {e}")
 
         return emails
 
+    def _fetch_from(self, mail: imaplib.IMAP4_SSL, limit: int) -> List[Dict[str, Any]]:
+        """
+        Fetch the last `limit` emails from INBOX over an open connection
+
+        The newest messages are the highest sequence numbers, so re-selecting
+        INBOX (which returns the current message count) is enough to address
+        them without listing every ID in the mailbox. SELECT also reports
+        UIDVALIDITY and UIDNEXT: if the mailbox has only grown since the last
+        fetch, just the new messages are fetched and the rest come from the
+        previous result, and an unchanged mailbox costs no FETCH at all.
+        IDs are UIDs, which stay stable across sessions.
+        """
+        status, data = mail.select("INBOX")
+        if status != "OK":
+            return []
+
+        exists = int(data[0])
+        if exists == 0 or limit < 1:
+            return []
+        uid_state = _uid_state(mail)
+
+        with self._inbox_lock:
+            snapshot = self._inbox_snapshot
+
+        emails = None
+        if snapshot and uid_state and snapshot.uidvalidity == uid_state[0]:
+            new_count = exists - snapshot.exists
+            # Equal growth in message count and UIDNEXT means nothing was expunged.
+            # A burst of limit or more new messages replaces the whole result,
+            # so it's cheaper to fetch just the last `limit` below.
+            if (
+                new_count < limit
+                and new_count == uid_state[1] - snapshot.uidnext
+                and len(snapshot.emails) + new_count >= min(limit, exists)
+            ):
+                new_emails = self._fetch_range(mail, f"{snapshot.exists + 1}:{exists}") if new_count else []
+                # Any message missing (failed fetch) or with an older UID (moved
+                # sequence numbers) means the delta can't be trusted - fall back
+                if len(new_emails) == new_count and all(
+                    int(e["id"]) >= snapshot.uidnext for e in new_emails
+                ):
+                    emails = (new_emails + snapshot.emails)[:max(limit, len(snapshot.emails))]
+
+        if emails is None:
+            emails = self._fetch_range(mail, f"{max(1, exists - limit + 1)}:{exists}")
+
+        if uid_state:
+            with self._inbox_lock:
+                self._inbox_snapshot = _InboxSnapshot(uid_state[0], uid_state[1], exists, emails)
+        return emails[:limit]
+
+    def _fetch_range(self, mail: imaplib.IMAP4_SSL, sequence_set: str) -> List[Dict[str, Any]]:
+        """
+        Fetch summaries for a range of sequence numbers in the selected mailbox, newest first
+
+        One FETCH gets their UIDs, ENVELOPE and BODYSTRUCTURE, and only the
+        start of each message's text/plain part is fetched, one round-trip per
+        distinct part number. Attachments and HTML alternatives never cross
+        the wire.
+        """
+        status, msg_data = mail.fetch(sequence_set, STRUCTURE_ITEMS)
+        if status != "OK":
+            return []
+        fetched = _parse_fetch_response(msg_data)
+        uids = sorted(fetched, key=int)
+
+        # Group messages by the section holding their preview text
+        preview_parts: Dict[bytes, Tuple[str, List[Any]]] = {}
+        uids_by_section: Dict[str, List[bytes]] = {}
+        for uid, fields in fetched.items():
+            found = _find_preview_part(fields.get(b"BODYSTRUCTURE") or [])
+            if found:
+                preview_parts[uid] = found
+                uids_by_section.setdefault(found[0], []).append(uid)
+
+        bodies: Dict[bytes, str] = {}
+        for section, section_uids in uids_by_section.items():
+            status, msg_data = mail.uid(
+                "FETCH",
+                b",".join(section_uids).decode(),
+                f"(BODY.PEEK[{section}]<0.{BODY_PREVIEW_OCTETS}>)"
+            )
+            if status != "OK":
+                continue
+            for uid, fields in _parse_fetch_response(msg_data).items():
+                data = next(
+                    (value for name, value in fields.items() if name.startswith(b"BODY[")),
+                    None
+                )
+                if isinstance(data, bytes) and uid in preview_parts:
+                    bodies[uid] = _decode_part(data, preview_parts[uid][1])
+
+        summaries: Dict[bytes, Dict[str, str]] = {}
+        for uid, fields in fetched.items():
+            summary = _parse_envelope(fields.get(b"ENVELOPE"))
+            if summary is not None:
+                summaries[uid] = summary
+        summaries.update(self._fetch_headers(mail, [uid for uid in uids if uid not in summaries]))
+
+        # Everything that can fail is parsed by now, so build the list in one pass
+        return [
+            self._parse_message(uid, summaries[uid], bodies.get(uid, ""))
+            for uid in reversed(uids)
+            if uid in summaries
+        ]
+
+    def _fetch_headers(self, mail: imaplib.IMAP4_SSL, uids: List[bytes]) -> Dict[bytes, Dict[str, str]]:
+        """Fetch and parse raw headers for messages whose ENVELOPE couldn't be read"""
+        if not uids:
+            return {}
+
+        status, msg_data = mail.uid("FETCH", b",".join(uids).decode(), f"({HEADER_ITEM})")
+        if status != "OK":
+            return {}
+
+        summaries = {}
+        for uid, fields in _parse_fetch_response(msg_data).items():
+            header = next(
+                (value for name, value in fields.items() if name.startswith(b"BODY[HEADER")),
+                None
+            )
+            try:
+                summaries[uid] = _parse_header(header if isinstance(header, bytes) else b"")
+            except Exception as e:
+                log.debug("Error processing email %s: %s", uid, e)
+        return summaries
+
+    def _parse_message(self, uid: bytes, summary: Dict[str, str], body: str) -> Dict[str, Any]:
+        """Build an email summary from its envelope fields and preview text"""
+        return {
+            "id": uid.decode(),
+            "subject": summary["subject"],
+            "from": summary["from"],
+            "body": body[:500],  # Limit body length
+            "received_at": _received_at(summary["date"]),
+            "processed": False
+        }
+
     async def get_emails(self, limit: int = 50) -> List[Dict[str, Any]]:
         """Get emails from inbox"""
         if not self.enabled:
             return []
 
-        return await self._fetch_emails(limit)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.imap_executor, self._fetch_emails, limit)
+
+    async def _reap_idle_connections(self):
+        """Periodically log out IMAP connections nobody has used for a while"""
+        while True:
+            await asyncio.sleep(60)
+            closed = await asyncio.get_running_loop().run_in_executor(
+                self.imap_executor, self._imap_pool.close_idle, self.imap_idle_timeout_seconds
+            )
+            if closed:
+                print(f"Closed {closed} idle IMAP connection(s)")
+
+    def start_reaper(self):
+        """Start the idle connection reaper (call from the app lifespan)"""
+        if self._reaper is None or self._reaper.done():
+            self._reaper = asyncio.create_task(self._reap_idle_connections())
+
+    async def stop_reaper(self):
+        """Cancel the reaper and log out every pooled connection"""
+        if self._reaper:
+            self._reaper.cancel()
+            try:
+                await self._reaper
+            except asyncio.CancelledError:
+                pass
+            self._reaper = None
+        await asyncio.get_running_loop().run_in_executor(
+            self.imap_executor, self._imap_pool.close_idle
+        )
 
-    async def forward_email_to_agent(self, email_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def forward_email_to_agent(
+        self,
+        subject: str,
+        from_email: str,
+        body: str,
+        attachments: Optional[List[str]] = None,
+        email_id: Optional[str] = None
+    ) -> Dict[str, Any]:
         """Process forwarded email and route to appropriate agent"""
         # This would integrate with your task router
         # For now, just return a mock response
         return {
             "status": "received",
-            "email_id": email_data.get("id", "unknown"),
+            "email_id": email_id or "unknown",
             "message": "Email received and will be processed"
         }
 
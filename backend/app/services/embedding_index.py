@@ -0,0 +1,86 @@
+"""
+Embedding Index shared by the caches' similarity lookups
+
+Keeps a unit-length sentence embedding per cache key and finds the cached key
+whose text is most similar to a new one. Embeddings are computed in worker
+threads, and stored in the background so callers never wait on them.
+Requires sentence-transformers; callers check EMBEDDINGS_AVAILABLE first.
+"""
+import asyncio
+from typing import Callable, Hashable, Optional
+
+from cachetools import LRUCache, TTLCache
+
+try:
+    from sentence_transformers import SentenceTransformer
+    import numpy as np
+    EMBEDDINGS_AVAILABLE = True
+except ImportError:
+    EMBEDDINGS_AVAILABLE = False
+
+
+class EmbeddingIndex:
+    """TTL-bounded key -> text embedding map with nearest-neighbour lookup"""
+
+    def __init__(self, model_name: str, max_size: int, ttl_seconds: int, memo_size: int = 0, name: str = "cache"):
+        self.model_name = model_name
+        self.name = name
+        # Evicted on the same schedule as the cached values they point at
+        self._embeddings: TTLCache = TTLCache(maxsize=max_size, ttl=ttl_seconds)
+        # Text -> embedding, so repeated probes for the same text skip the model
+        self._memo: Optional[LRUCache] = LRUCache(maxsize=memo_size) if memo_size else None
+        self._model = None
+
+    def __len__(self) -> int:
+        return len(self._embeddings)
+
+    def _embed(self, text: str):
+        """Encode a text (CPU-bound - call from a worker thread)"""
+        if self._model is None:
+            self._model = SentenceTransformer(self.model_name)
+        return self._model.encode(text, normalize_embeddings=True)
+
+    async def embedding(self, text: str):
+        """Get a text's embedding, computing it in a worker thread on a memo miss"""
+        embedding = self._memo.get(text) if self._memo is not None else None
+        if embedding is None:
+            embedding = await asyncio.to_thread(self._embed, text)
+            if self._memo is not None:
+                self._memo[text] = embedding
+        return embedding
+
+    async def find(
+        self,
+        text: str,
+        threshold: float,
+        in_scope: Callable[[Hashable], bool]
+    ) -> Optional[Hashable]:
+        """
+        Find the in-scope key whose text is most similar to `text`
+
+        Returns None unless the best cosine similarity reaches `threshold`.
+        """
+        candidates = [
+            (key, embedding)
+            for key, embedding in list(self._embeddings.items())
+            if in_scope(key)
+        ]
+        if not candidates:
+            return None
+
+        embedding = await self.embedding(text)
+        scores = np.stack([cached for _, cached in candidates]) @ embedding
+        best = int(np.argmax(scores))
+        if scores[best] < threshold:
+            return None
+        return candidates[best][0]
+
+    def add(self, key: Hashable, text: str):
+        """Index a key's text in the background"""
+        asyncio.create_task(self._store(key, text))
+
+    async def _store(self, key: Hashable, text: str):
+        try:
+            self._embeddings[key] = await self.embedding(text)
+        except Exception as e:
+            print(f"⚠️ {self.name} embedding failed: {e}")
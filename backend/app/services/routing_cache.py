@@ -0,0 +1,112 @@
+"""
+Routing Cache for task routing decisions
+
+Caches TaskRouter decisions so repeated tasks skip the (AI-assisted) routing
+step. Exact matches are keyed on task type, priority and the normalized
+description. An optional semantic layer (ROUTING_CACHE_SEMANTIC=true) also
+reuses a decision when a new description's sentence embedding is close
+enough to a cached one.
+
+Cache hits don't go through the router, so they don't count towards agent
+load or routing stats. Load-aware routing therefore never uses the cache:
+its decision depends on the agents' current load, not just the task.
+"""
+import os
+import hashlib
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+import orjson
+from cachetools import TTLCache
+
+from .embedding_index import EMBEDDINGS_AVAILABLE, EmbeddingIndex
+
+
+# (task type, priority, extracted data hash, normalized description)
+CacheKey = Tuple[str, str, str, str]
+
+
+class RoutingCache:
+    """TTL cache of routing decisions with an optional embedding-similarity fallback"""
+
+    def __init__(self):
+        self.max_size = int(os.getenv("ROUTING_CACHE_MAX_SIZE", "10000"))
+        self.ttl_seconds = int(os.getenv("ROUTING_CACHE_TTL_SECONDS", "300"))
+        self.similarity_threshold = float(os.getenv("ROUTING_CACHE_SIMILARITY", "0.9"))
+        self.semantic_enabled = (
+            EMBEDDINGS_AVAILABLE
+            and os.getenv("ROUTING_CACHE_SEMANTIC", "false").lower() == "true"
+        )
+
+        self._decisions: TTLCache = TTLCache(maxsize=self.max_size, ttl=self.ttl_seconds)
+        self._index = EmbeddingIndex(
+            os.getenv("ROUTING_CACHE_EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+            max_size=self.max_size,
+            ttl_seconds=self.ttl_seconds,
+            name="Routing cache"
+        ) if self.semantic_enabled else None
+
+    @staticmethod
+    def make_key(task: Dict[str, Any]) -> CacheKey:
+        """
+        Build the exact-match key for a router task dict
+
+        extracted_data feeds the confidence score and the routing prompt, so
+        it's part of the key (as a stable hash of its sorted JSON).
+        """
+        extracted_data = orjson.dumps(
+            task.get("extracted_data") or {},
+            option=orjson.OPT_SORT_KEYS,
+            default=str
+        )
+        return (
+            str(task.get("task_type", "")),
+            str(task.get("priority", "medium")),
+            hashlib.blake2b(extracted_data, digest_size=16).hexdigest(),
+            str(task.get("description", "")).strip().lower()
+        )
+
+    def _fresh(self, decision: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy a cached decision with a current routing timestamp"""
+        return {**decision, "routed_at": datetime.utcnow().isoformat()}
+
+    async def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        """Get a cached decision, or None on a miss"""
+        decision = self._decisions.get(key)
+        if decision is not None:
+            return self._fresh(decision)
+
+        if self._index is None:
+            return None
+
+        similar_key = await self._index.find(
+            key[3],
+            self.similarity_threshold,
+            lambda cached_key: cached_key[:3] == key[:3]
+        )
+        decision = self._decisions.get(similar_key) if similar_key else None
+        return self._fresh(decision) if decision is not None else None
+
+    def put(self, key: CacheKey, decision: Dict[str, Any]):
+        """
+        Cache a decision
+
+        The exact-match entry is stored immediately; the embedding for the
+        semantic layer is computed in the background so callers never wait on it.
+        """
+        self._decisions[key] = decision
+
+        if self._index is not None:
+            self._index.add(key, key[3])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._decisions),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "semantic_enabled": self.semantic_enabled
+        }
+
+
+# Singleton instance
+routing_cache = RoutingCache()
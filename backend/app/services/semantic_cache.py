@@ -0,0 +1,114 @@
+"""
+Semantic Cache for specialist responses
+
+Caches specialist (LLM) results so a repeated request skips the model call.
+Entries live in a namespace per endpoint (e.g. "records_analyze") and are
+scoped by a context tuple of the request's other fields (case ID, filename,
+...), so only the free text is ever matched loosely.
+
+Lookups first try the normalized text exactly. Paraphrase matching is opt-in
+twice over: it needs sentence-transformers and SEMANTIC_CACHE_EMBEDDINGS=true,
+and only lookups made with allow_similar=True use it. Extraction endpoints
+(dates, amounts, names parsed out of the text) must never pass it - a
+reworded request with a different date would get another request's result.
+"""
+import os
+from typing import Dict, Any, Hashable, Optional, Tuple
+
+from cachetools import TTLCache
+
+from .embedding_index import EMBEDDINGS_AVAILABLE, EmbeddingIndex
+
+
+# (namespace, context, normalized text)
+CacheKey = Tuple[str, Tuple[Hashable, ...], str]
+
+
+class SemanticCache:
+    """TTL/LRU cache of specialist responses with opt-in embedding-similarity lookup"""
+
+    def __init__(self):
+        self.max_size = int(os.getenv("SEMANTIC_CACHE_MAX_SIZE", "10000"))
+        self.ttl_seconds = int(os.getenv("SEMANTIC_CACHE_TTL_SECONDS", "3600"))
+        self.similarity_threshold = float(os.getenv("SEMANTIC_CACHE_SIMILARITY", "0.92"))
+        self.embeddings_enabled = (
+            EMBEDDINGS_AVAILABLE
+            and os.getenv("SEMANTIC_CACHE_EMBEDDINGS", "false").lower() == "true"
+        )
+
+        self._values: TTLCache = TTLCache(maxsize=self.max_size, ttl=self.ttl_seconds)
+        self._index = EmbeddingIndex(
+            os.getenv("SEMANTIC_CACHE_EMBEDDING_MODEL", "all-MiniLM-L6-v2"),
+            max_size=self.max_size,
+            ttl_seconds=self.ttl_seconds,
+            memo_size=int(os.getenv("SEMANTIC_CACHE_EMBEDDING_MEMO_SIZE", "8192")),
+            name="Semantic cache"
+        ) if self.embeddings_enabled else None
+
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(namespace: str, text: Optional[str], context: Tuple[Hashable, ...] = ()) -> CacheKey:
+        """Build the exact-match key: whitespace-collapsed, lowercased text"""
+        return (namespace, context, " ".join((text or "").split()).lower())
+
+    async def get(self, key: CacheKey, allow_similar: bool = False) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached response, or None on a miss
+
+        With allow_similar, a paraphrase of a cached text (in the same
+        namespace and context) is also a hit, if embeddings are enabled.
+        """
+        value = self._values.get(key)
+        if value is not None:
+            self.hits += 1
+            return value
+
+        if allow_similar:
+            value = await self._get_similar(key)
+            if value is not None:
+                self.semantic_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def _get_similar(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        if self._index is None or not key[2]:
+            return None
+
+        similar_key = await self._index.find(
+            key[2],
+            self.similarity_threshold,
+            lambda cached_key: cached_key[:2] == key[:2]
+        )
+        return self._values.get(similar_key) if similar_key else None
+
+    def put(self, key: CacheKey, value: Dict[str, Any], allow_similar: bool = False):
+        """
+        Cache a response
+
+        The exact-match entry is stored immediately. With allow_similar, the
+        text is also indexed for paraphrase lookups in the background.
+        """
+        self._values[key] = value
+
+        if allow_similar and self._index is not None and key[2]:
+            self._index.add(key, key[2])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._values),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "embeddings_enabled": self.embeddings_enabled,
+            "hits": self.hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses
+        }
+
+
+# Singleton instance
+semantic_cache = SemanticCache()
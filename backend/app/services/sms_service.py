@@ -2,10 +2,18 @@
 SMS Service using Twilio for sending and receiving text messages
 """
 import os
-from typing import Dict, Any, List, Optional
+from collections import deque
+from email.utils import parsedate_to_datetime
+from functools import cached_property
+from itertools import islice
+from typing import Deque, Dict, Any, List, Optional
 from datetime import datetime
+import httpx
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
+from twilio.http.http_client import TwilioHttpClient
+
+TWILIO_API_ROOT = "https://api.twilio.com/2010-04-01"
 
 
 class SMSService:
@@ -17,13 +25,54 @@ class SMSService:
         self.from_number = os.getenv("TWILIO_PHONE_NUMBER")
         self.enabled = bool(self.account_sid and self.auth_token and self.from_number)
 
-        if self.enabled:
-            self.client = Client(self.account_sid, self.auth_token)
-        else:
-            self.client = None
+        # In-memory storage for demo (use database in production); the
+        # oldest messages are dropped once it's full
+        self.message_history: Deque[Dict[str, Any]] = deque(
+            maxlen=int(os.getenv("SMS_HISTORY_MAX_SIZE", "10000"))
+        )
+
+        # Async client for reads, so listing messages doesn't block the event loop
+        self._http_client: Optional[httpx.AsyncClient] = None
+
+    @cached_property
+    def client(self) -> Optional[Client]:
+        """
+        Twilio client, built on first use
+
+        Building it sets up an HTTP session, which processes that never send
+        SMS shouldn't pay for. The pooled session is kept for the life of the
+        process, so consecutive requests reuse its keep-alive connection.
+        """
+        if not self.enabled:
+            return None
+        return Client(
+            self.account_sid,
+            self.auth_token,
+            http_client=TwilioHttpClient(pool_connections=True)
+        )
+
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Get the pooled Twilio REST client, creating it on first use"""
+        if self._http_client is None or self._http_client.is_closed:
+            self._http_client = httpx.AsyncClient(
+                base_url=f"{TWILIO_API_ROOT}/Accounts/{self.account_sid}",
+                auth=(self.account_sid, self.auth_token),
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=8, keepalive_expiry=60)
+            )
+        return self._http_client
+
+    async def close(self):
+        """Close the Twilio REST client (call from the app lifespan)"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
 
-        # In-memory storage for demo (use database in production)
-        self.message_history: List[Dict[str, Any]] = []
+    def _recent_history(self, limit: int) -> List[Dict[str, Any]]:
+        """Get the last `limit` stored messages, oldest first, without copying the rest"""
+        recent = list(islice(reversed(self.message_history), max(limit, 0)))
+        recent.reverse()
+        return recent
 
     async def send_sms(self, to: str, message: str) -> Dict[str, Any]:
         """Send an SMS message"""
@@ -76,39 +125,50 @@ class SMSService:
         """Get SMS message history"""
         if not self.enabled:
             # Return mock history
-            return self.message_history[-limit:] if len(self.message_history) > limit else self.message_history
+            return self._recent_history(limit)
 
         try:
-            messages = self.client.messages.list(limit=limit)
+            response = await self._get_http_client().get(
+                "/Messages.json",
+                params={"PageSize": limit}
+            )
+            response.raise_for_status()
 
             history = []
-            for msg in messages:
+            for msg in response.json().get("messages", []):
+                date_sent = msg.get("date_sent")
                 history.append({
-                    "sid": msg.sid,
-                    "to": msg.to,
-                    "from": msg.from_,
-                    "message": msg.body,
-                    "status": msg.status,
-                    "timestamp": msg.date_sent.isoformat() if msg.date_sent else datetime.utcnow().isoformat(),
-                    "direction": msg.direction
+                    "sid": msg.get("sid"),
+                    "to": msg.get("to"),
+                    "from": msg.get("from"),
+                    "message": msg.get("body"),
+                    "status": msg.get("status"),
+                    "timestamp": parsedate_to_datetime(date_sent).isoformat() if date_sent else datetime.utcnow().isoformat(),
+                    "direction": msg.get("direction")
                 })
 
             return history
 
-        except TwilioRestException as e:
-            raise Exception(f"Failed to get message history: {e.msg}")
+        except httpx.HTTPStatusError as e:
+            raise Exception(f"Failed to get message history: {e.response.text}")
         except Exception as e:
             # Return local history as fallback
-            return self.message_history[-limit:] if len(self.message_history) > limit else self.message_history
-
-    async def receive_webhook(self, data: Dict[str, Any]) -> Dict[str, Any]:
+            return self._recent_history(limit)
+
+    async def receive_webhook(
+        self,
+        message_sid: str,
+        from_number: str,
+        to_number: str,
+        body: str
+    ) -> Dict[str, Any]:
         """Handle incoming SMS webhook from Twilio"""
         # Store incoming message
         incoming_message = {
-            "sid": data.get("MessageSid"),
-            "from": data.get("From"),
-            "to": data.get("To"),
-            "message": data.get("Body"),
+            "sid": message_sid,
+            "from": from_number,
+            "to": to_number,
+            "message": body,
             "status": "received",
             "timestamp": datetime.utcnow().isoformat(),
             "direction": "inbound"
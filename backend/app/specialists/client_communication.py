@@ -1,7 +1,48 @@
-from typing import List, Optional
+from typing import List, Optional, Set
 import re
 
-from ..schemas import CommunicationResponse
+# Keyword topics for subject and follow-up suggestions, matched in a single
+# pass over the text; the named group says which topic a match belongs to
+_RE_TOPICS = re.compile(
+    r"(?P<schedule>appointment|schedule|deposition|med(?:ia|iation))"
+    r"|(?P<medical>mri|x-?ray|surgery|therapy|pt)"
+    r"|(?P<insurance>insurance|adjuster|limits|settle|tender)",
+    re.I
+)
+
+
+_SYSTEM_INSTRUCTION = (
+    "You are an experienced legal assistant specializing in client communications for a personal "
+    "injury law firm. Your role is to draft clear, empathetic, and professional messages to clients. "
+    "Always maintain a warm but professional tone, avoid legal jargon unless necessary (and explain it "
+    "when used), show genuine concern for the client's wellbeing, provide clear next steps, and ensure "
+    "all communications comply with legal and ethical standards. Focus on building trust and keeping "
+    "clients informed about their case progress."
+)
+
+_PROMPT_TMPL = """You are an experienced legal assistant helping to draft clear, empathetic client communications.
+
+Client Name: {client_name}
+Purpose: {purpose}
+Context: {text}
+
+Please draft a professional, empathetic email message to this client. The message should:
+1. Be warm and compassionate while maintaining professionalism
+2. Clearly address their concerns or questions
+3. Provide specific next steps or timeline when appropriate
+4. Use plain language (avoid excessive legal jargon)
+5. Be concise but thorough (2-4 paragraphs)
+6. Include an appropriate greeting and closing
+
+Draft the complete email message:"""
+
+
+# Draft returned by the mock adapter (polite, empathetic, for testing)
+_MOCK_DRAFT = (
+    "Hi [Client Name],\n\nThank you for reaching out and I'm sorry to hear about your accident. "
+    "We recommend collecting your medical records and we will follow up with next steps.\n\n"
+    "Sincerely,\nYour Legal Team"
+)
 
 
 class ClientCommAdapter:
@@ -13,12 +54,7 @@ class ClientCommAdapter:
 
 class MockCommAdapter(ClientCommAdapter):
     async def complete(self, prompt: str) -> str:
-        # Return a polite, empathetic draft for testing.
-        return (
-            "Hi [Client Name],\n\nThank you for reaching out and I'm sorry to hear about your accident. "
-            "We recommend collecting your medical records and we will follow up with next steps.\n\n" 
-            "Sincerely,\nYour Legal Team"
-        )
+        return _MOCK_DRAFT
 
 
 class ClientCommunicator:
@@ -35,52 +71,40 @@ class ClientCommunicator:
         
         # Set system instruction if using Gemini adapter
         if self.llm and hasattr(self.llm, 'set_system_instruction'):
-            self.llm.set_system_instruction(
-                "You are an experienced legal assistant specializing in client communications for a personal "
-                "injury law firm. Your role is to draft clear, empathetic, and professional messages to clients. "
-                "Always maintain a warm but professional tone, avoid legal jargon unless necessary (and explain it "
-                "when used), show genuine concern for the client's wellbeing, provide clear next steps, and ensure "
-                "all communications comply with legal and ethical standards. Focus on building trust and keeping "
-                "clients informed about their case progress."
-            )
-
-    def _suggest_subject(self, purpose: Optional[str], text: str) -> str:
+            self.llm.set_system_instruction(_SYSTEM_INSTRUCTION)
+
+    def _find_topics(self, text: str) -> Set[str]:
+        """Get the keyword topics ("schedule", "medical", "insurance") mentioned in text"""
+        return {match.lastgroup for match in _RE_TOPICS.finditer(text)}
+
+    def _suggest_subject(self, purpose: Optional[str], topics: Set[str]) -> str:
         if purpose:
             return f"{purpose.capitalize()} - Update from Your Legal Team"
         # fallback simple subject extraction
-        if re.search(r"appointment|schedule|deposition|med(ia|iation)", text, re.I):
+        if "schedule" in topics:
             return "Scheduling: Next Steps"
         return "Update from Your Legal Team"
 
-    def _suggest_followups(self, text: str) -> List[str]:
+    def _suggest_followups(self, topics: Set[str]) -> List[str]:
         followups = []
-        if re.search(r"mri|x-?ray|surgery|therapy|pt", text, re.I):
+        if "medical" in topics:
             followups.append("Please provide medical records and billing statements.")
-        if re.search(r"insurance|adjuster|limits|settle|tender", text, re.I):
+        if "insurance" in topics:
             followups.append("Confirm insurance details and policy limits.")
         if not followups:
             followups.append("Confirm any outstanding questions the client may have.")
         return followups
 
     async def draft(self, client_name: Optional[str], purpose: Optional[str], text: str) -> dict:
-        subject = self._suggest_subject(purpose, text)
-        suggested_followups = self._suggest_followups(text)
-
-        prompt = f"""You are an experienced legal assistant helping to draft clear, empathetic client communications.
-
-Client Name: {client_name or '[Client Name]'}
-Purpose: {purpose or 'general update'}
-Context: {text}
-
-Please draft a professional, empathetic email message to this client. The message should:
-1. Be warm and compassionate while maintaining professionalism
-2. Clearly address their concerns or questions
-3. Provide specific next steps or timeline when appropriate
-4. Use plain language (avoid excessive legal jargon)
-5. Be concise but thorough (2-4 paragraphs)
-6. Include an appropriate greeting and closing
-
-Draft the complete email message:"""
+        topics = self._find_topics(text)
+        subject = self._suggest_subject(purpose, topics)
+        suggested_followups = self._suggest_followups(topics)
+
+        prompt = _PROMPT_TMPL.format_map({
+            "client_name": client_name or "[Client Name]",
+            "purpose": purpose or "general update",
+            "text": text
+        })
 
         brief = await self.llm.complete(prompt)
 
@@ -10,10 +10,52 @@ Responsibilities:
 - Suggest filing structure
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, NamedTuple, Optional, Dict, Any, Set, Tuple, Union
 from datetime import datetime
-import re
+import asyncio
 import hashlib
+import itertools
+import json
+import os
+import re
+import time
+
+from cachetools import LRUCache
+
+# pyahocorasick is optional - without it category keywords are matched with
+# one combined regex
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# RE2 is optional - it scans in linear time with no backtracking. The bulk
+# text patterns below use syntax both engines accept (inline flags included).
+# RE2's \b, \d and \w are ASCII-only, so the re fallback compiles these
+# patterns with re.ASCII and both engines match the same text.
+try:
+    import re2
+    _compile_ascii = re2.compile
+except ImportError:
+    def _compile_ascii(pattern: str) -> "re.Pattern":
+        return re.compile(pattern, re.ASCII)
+
+# xxHash is optional - without it duplicate hashes use BLAKE2b from hashlib
+try:
+    import xxhash
+    XXHASH_AVAILABLE = True
+except ImportError:
+    XXHASH_AVAILABLE = False
+
+
+# Classification returned by the mock adapter (for testing)
+_MOCK_CLASSIFICATION = (
+    "Document Classification:\n"
+    "This appears to be a medical record based on the content. "
+    "Recommended category: Medical Evidence > Treatment Records. "
+    "Suggested tags: medical, treatment, diagnosis."
+)
 
 
 class EvidenceSorterAdapter:
@@ -27,12 +69,138 @@ class MockEvidenceSorterAdapter(EvidenceSorterAdapter):
     """Mock adapter for testing"""
 
     async def complete(self, prompt: str) -> str:
-        return (
-            "Document Classification:\n"
-            "This appears to be a medical record based on the content. "
-            "Recommended category: Medical Evidence > Treatment Records. "
-            "Suggested tags: medical, treatment, diagnosis."
-        )
+        return _MOCK_CLASSIFICATION
+
+
+# Words that tag a document, and words that place a medical document in a
+# subcategory (checked in this order); matched as whole lowercase words
+_TAG_WORDS = {
+    "urgent": ("urgent", "asap", "deadline"),
+    "confidential": ("confidential", "privileged"),
+    "settlement": ("settlement", "demand", "offer"),
+    "medical": ("medical", "doctor", "hospital"),
+    "billing": ("bill", "invoice", "charge"),
+    "injury": ("injury", "accident", "crash")
+}
+_MEDICAL_SUBCATEGORY_WORDS = {
+    "Diagnostic Imaging": ("mri", "ct", "x-ray", "imaging"),
+    "Bills": ("bill", "invoice", "charges", "payment"),
+    "Prescriptions": ("prescription",)
+}
+_WORD_TAGS = {word: tag for tag, words in _TAG_WORDS.items() for word in words}
+_WORD_SUBCATEGORIES = {
+    word: subcategory
+    for subcategory, words in _MEDICAL_SUBCATEGORY_WORDS.items()
+    for word in words
+}
+
+# Everything extracted from document text, in a single pass over the
+# lowercased text: dates, monetary amounts, and tag/subcategory words
+_RE_SCAN = _compile_ascii(
+    r'(?P<date>\b\d{1,2}/\d{1,2}/\d{2,4}\b)'
+    r'|(?P<money>\$\s*\d{1,3}(?:,\d{3})*(?:\.\d{2})?)'
+    r'|\b(?P<word>'
+    + "|".join(map(re.escape, sorted({*_WORD_TAGS, *_WORD_SUBCATEGORIES}, key=len, reverse=True)))
+    + r')\b'
+)
+
+
+class _TextScan(NamedTuple):
+    """Results of scanning a document's text once"""
+    dates: List[str]
+    amounts: List[str]
+    tags: Set[str]
+    subcategories: Set[str]
+    keywords: Set[str]
+
+
+# Near-duplicate detection: 64-bit SimHash fingerprints over word shingles.
+# Fingerprints at most SIMHASH_MAX_DISTANCE bits apart count as near-duplicates
+# (e.g. the same letter re-OCR'd, or a reply quoting an earlier email).
+SIMHASH_SHINGLE_SIZE = 4
+SIMHASH_MAX_DISTANCE = 3
+# Always re, not RE2: words must split on Unicode letters (an ASCII \w would
+# cut "café" in two), and fingerprints must not depend on the installed engine
+_RE_WORD = re.compile(r'\w+')
+
+
+def _hash64(data: bytes) -> int:
+    if XXHASH_AVAILABLE:
+        return xxhash.xxh3_64_intdigest(data)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+def _simhash(text: str) -> Optional[int]:
+    """Compute the SimHash fingerprint of a text, or None if it has no words"""
+    words = _RE_WORD.findall(text.lower())
+    if not words:
+        return None
+
+    counts = [0] * 64
+    for start in range(max(1, len(words) - SIMHASH_SHINGLE_SIZE + 1)):
+        shingle = _hash64(" ".join(words[start:start + SIMHASH_SHINGLE_SIZE]).encode())
+        for bit in range(64):
+            counts[bit] += 1 if shingle >> bit & 1 else -1
+
+    return sum(1 << bit for bit, count in enumerate(counts) if count > 0)
+
+
+class _SimHashIndex:
+    """
+    Fingerprints indexed for Hamming-distance lookups
+
+    Each fingerprint is split into SIMHASH_MAX_DISTANCE + 1 blocks. Two
+    fingerprints within the distance must agree on at least one whole block,
+    so only fingerprints sharing a block are compared.
+    """
+
+    def __init__(self):
+        self._blocks = SIMHASH_MAX_DISTANCE + 1
+        self._width = -(-64 // self._blocks)
+        self._buckets: Dict[Tuple[int, int], List[Tuple[int, Any]]] = {}
+
+    def _keys(self, fingerprint: int) -> List[Tuple[int, int]]:
+        mask = (1 << self._width) - 1
+        return [(block, fingerprint >> (block * self._width) & mask) for block in range(self._blocks)]
+
+    def find(self, fingerprint: int) -> Optional[Tuple[Any, int]]:
+        """Get (value, distance) for the closest indexed fingerprint within the distance"""
+        best = None
+        for key in self._keys(fingerprint):
+            for other, value in self._buckets.get(key, ()):
+                distance = bin(fingerprint ^ other).count("1")
+                if distance <= SIMHASH_MAX_DISTANCE and (best is None or distance < best[1]):
+                    best = (value, distance)
+        return best
+
+    def add(self, fingerprint: int, value: Any):
+        for key in self._keys(fingerprint):
+            self._buckets.setdefault(key, []).append((fingerprint, value))
+
+
+# Characters of document text encoded per hash update
+HASH_CHUNK_CHARS = 65536
+
+# Document IDs count up from the process start time in milliseconds, so they
+# stay unique within a batch (where many documents share a millisecond)
+_DOCUMENT_IDS = itertools.count(time.time_ns() // 1_000_000)
+
+
+# Response schema for structured LLM classification: everything the
+# classification prompt asks for comes back as one JSON object
+DOCUMENT_ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "document_type": {"type": "STRING"},
+        "key_information": {"type": "STRING"},
+        "filing_category": {"type": "STRING"},
+        "important_dates": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "important_amounts": {"type": "ARRAY", "items": {"type": "STRING"}},
+        "priority": {"type": "STRING", "enum": ["high", "medium", "low"]},
+        "suggested_tags": {"type": "ARRAY", "items": {"type": "STRING"}}
+    },
+    "required": ["document_type", "filing_category", "priority"]
+}
 
 
 class EvidenceSorter:
@@ -50,6 +218,13 @@ class EvidenceSorter:
 
     def __init__(self, llm_adapter: Optional[EvidenceSorterAdapter] = None):
         self.llm = llm_adapter or MockEvidenceSorterAdapter()
+        # Max documents analyzed at once in process_batch (LLM rate-limit budget)
+        self.batch_concurrency = int(os.getenv("SPECIALIST_CONCURRENCY", "8"))
+        # LLM classifications by prompt hash, so re-uploaded documents (same
+        # filename and opening text) don't cost another model call
+        self._llm_cache: LRUCache = LRUCache(
+            maxsize=int(os.getenv("EVIDENCE_LLM_CACHE_SIZE", "1024"))
+        )
         
         # Set Gemini system instruction if using GeminiAdapter
         if self.llm and hasattr(self.llm, 'set_system_instruction'):
@@ -99,43 +274,110 @@ class EvidenceSorter:
             }
         }
 
+        # Keyword -> categories, matched against lowercased text in one pass
+        self._keyword_categories: Dict[str, List[str]] = {}
+        for category_key, category_info in self.document_categories.items():
+            for keyword in category_info["keywords"]:
+                self._keyword_categories.setdefault(keyword.lower(), []).append(category_key)
+        self._keyword_matcher = self._build_keyword_matcher()
+
+    def _build_keyword_matcher(self):
+        """Build an Aho-Corasick automaton (or fallback regex) over every category keyword"""
+        if AHOCORASICK_AVAILABLE:
+            automaton = ahocorasick.Automaton()
+            for keyword in self._keyword_categories:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            return automaton
+
+        # A lookahead matches at every position, so overlapping keywords all count
+        keywords = sorted(self._keyword_categories, key=len, reverse=True)
+        return re.compile("(?=(" + "|".join(map(re.escape, keywords)) + "))")
+
+    def _find_keywords(self, text_lower: str) -> Set[str]:
+        """Get the category keywords that occur in lowercased text"""
+        if AHOCORASICK_AVAILABLE:
+            return {keyword for _, keyword in self._keyword_matcher.iter(text_lower)}
+        return {match.group(1) for match in self._keyword_matcher.finditer(text_lower)}
+
+    def _scan_text(self, text: str) -> _TextScan:
+        """
+        Scan document text for everything the analysis needs
+
+        One regex pass collects dates, amounts (both deduplicated in first-seen
+        order), tags and subcategory words, and one keyword-matcher pass over
+        the same lowercased text collects the category keywords.
+        """
+        text_lower = text.lower()
+        dates: Dict[str, None] = {}
+        amounts: Dict[str, None] = {}
+        tags = set()
+        subcategories = set()
+
+        for match in _RE_SCAN.finditer(text_lower):
+            kind = match.lastgroup
+            if kind == "word":
+                word = match.group("word")
+                if word in _WORD_TAGS:
+                    tags.add(_WORD_TAGS[word])
+                if word in _WORD_SUBCATEGORIES:
+                    subcategories.add(_WORD_SUBCATEGORIES[word])
+            elif kind == "date":
+                dates[match.group("date")] = None
+            else:
+                amounts[match.group("money")] = None
+
+        return _TextScan(
+            dates=list(dates),
+            amounts=list(amounts),
+            tags=tags,
+            subcategories=subcategories,
+            keywords=self._find_keywords(text_lower)
+        )
+
     def _classify_document_by_filename(self, filename: str) -> Optional[str]:
         """
         Classify document based on filename
 
         Returns primary category
         """
-        filename_lower = filename.lower()
+        matched = {
+            category_key
+            for keyword in self._find_keywords(filename.lower())
+            for category_key in self._keyword_categories[keyword]
+        }
 
-        # Check each category's keywords
-        for category_key, category_info in self.document_categories.items():
-            for keyword in category_info["keywords"]:
-                if keyword in filename_lower:
-                    return category_key
+        # First category (in definition order) with a keyword in the name
+        for category_key in self.document_categories:
+            if category_key in matched:
+                return category_key
 
         return None
 
-    def _classify_document_by_content(self, text_content: str) -> Optional[str]:
+    def _classify_document_by_content(
+        self,
+        text_content: str,
+        scan: Optional[_TextScan] = None
+    ) -> Optional[str]:
         """
         Classify document based on text content
 
         Returns primary category
         """
-        content_lower = text_content.lower()
+        keywords = scan.keywords if scan else self._find_keywords(text_content.lower())
 
-        # Score each category based on keyword matches
-        category_scores = {}
-        for category_key, category_info in self.document_categories.items():
-            score = 0
-            for keyword in category_info["keywords"]:
-                if keyword in content_lower:
-                    score += 1
-            if score > 0:
-                category_scores[category_key] = score
+        # Score each category by how many of its keywords occur
+        category_scores: Dict[str, int] = {}
+        for keyword in keywords:
+            for category_key in self._keyword_categories[keyword]:
+                category_scores[category_key] = category_scores.get(category_key, 0) + 1
 
-        # Return category with highest score
+        # Return category with highest score (ties go to the first defined)
         if category_scores:
-            return max(category_scores, key=category_scores.get)
+            return max(
+                (key for key in self.document_categories if key in category_scores),
+                key=category_scores.get
+            )
 
         return None
 
@@ -143,7 +385,8 @@ class EvidenceSorter:
         self,
         filename: str,
         file_size: Optional[int] = None,
-        text_content: Optional[str] = None
+        text_content: Optional[str] = None,
+        scan: Optional[_TextScan] = None
     ) -> Dict[str, Any]:
         """
         Extract metadata from document
@@ -161,15 +404,10 @@ class EvidenceSorter:
         }
 
         if text_content:
-            # Extract dates
-            date_pattern = r'\b\d{1,2}/\d{1,2}/\d{2,4}\b'
-            dates = re.findall(date_pattern, text_content)
-            metadata["extracted_dates"] = list(set(dates))
-
-            # Extract monetary amounts
-            money_pattern = r'\$\s*\d{1,3}(?:,\d{3})*(?:\.\d{2})?'
-            amounts = re.findall(money_pattern, text_content)
-            metadata["extracted_amounts"] = list(set(amounts))
+            # Extract dates and monetary amounts
+            scan = scan or self._scan_text(text_content)
+            metadata["extracted_dates"] = scan.dates
+            metadata["extracted_amounts"] = scan.amounts
 
             # Estimate page count from content length (rough estimate)
             if text_content:
@@ -204,14 +442,27 @@ class EvidenceSorter:
 
         return file_type_map.get(extension, "Unknown")
 
-    def _generate_document_hash(self, content: str) -> str:
-        """Generate hash for duplicate detection"""
-        return hashlib.md5(content.encode()).hexdigest()
+    def _generate_document_hash(self, content: Union[str, bytes]) -> str:
+        """
+        Generate hash for duplicate detection
+
+        Only used to compare documents, so a fast non-cryptographic 128-bit
+        hash (XXH3) does; hashlib's BLAKE2b is the fallback. Text is encoded
+        and hashed HASH_CHUNK_CHARS at a time rather than copied whole.
+        """
+        hasher = xxhash.xxh3_128() if XXHASH_AVAILABLE else hashlib.blake2b(digest_size=16)
+        if isinstance(content, bytes):
+            hasher.update(content)
+        else:
+            for start in range(0, len(content), HASH_CHUNK_CHARS):
+                hasher.update(content[start:start + HASH_CHUNK_CHARS].encode("utf-8", "ignore"))
+        return hasher.hexdigest()
 
     def _suggest_subcategory(
         self,
         primary_category: str,
-        text_content: Optional[str] = None
+        text_content: Optional[str] = None,
+        scan: Optional[_TextScan] = None
     ) -> Optional[str]:
         """
         Suggest appropriate subcategory
@@ -219,6 +470,7 @@ class EvidenceSorter:
         Args:
             primary_category: Main category
             text_content: Document text content
+            scan: Scan of text_content, if already done
 
         Returns:
             Suggested subcategory
@@ -232,14 +484,11 @@ class EvidenceSorter:
         # Simple keyword matching for subcategory
         # In production, would use more sophisticated NLP
         if text_content and primary_category == "medical":
-            if re.search(r'\b(?:MRI|CT|X-ray|imaging)\b', text_content, re.IGNORECASE):
-                return "Diagnostic Imaging"
-            elif re.search(r'\b(?:bill|invoice|charges|payment)\b', text_content, re.IGNORECASE):
-                return "Bills"
-            elif re.search(r'\bprescription\b', text_content, re.IGNORECASE):
-                return "Prescriptions"
-            else:
-                return "Treatment Records"
+            found = (scan or self._scan_text(text_content)).subcategories
+            for subcategory in _MEDICAL_SUBCATEGORY_WORDS:
+                if subcategory in found:
+                    return subcategory
+            return "Treatment Records"
 
         # Default to first subcategory
         return subcategories[0] if subcategories else None
@@ -263,8 +512,71 @@ class EvidenceSorter:
         Returns:
             Classification and metadata
         """
+        # Use LLM for enhanced classification if content available
+        llm_classification, llm_analysis = None, None
+        if text_content:
+            llm_classification, llm_analysis = await self._classify_with_llm(filename, text_content)
+
+        return self._build_analysis(
+            filename, text_content, file_size, case_id, llm_classification, llm_analysis
+        )
+
+    async def _classify_with_llm(
+        self,
+        filename: str,
+        text_content: str
+    ) -> Tuple[str, Optional[Dict[str, Any]]]:
+        """
+        Get the LLM classification of a document in one call
+
+        Adapters with complete_json (Gemini) return every field of
+        DOCUMENT_ANALYSIS_SCHEMA as structured JSON; otherwise, or if the
+        JSON can't be parsed, the free-text classification is used. Results
+        are cached by prompt, which covers everything the model sees.
+
+        Returns:
+            (classification text, parsed analysis or None)
+        """
+        prompt = self._build_classification_prompt(filename, text_content)
+        cache_key = self._generate_document_hash(prompt)
+        cached = self._llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        result = None
+        if hasattr(self.llm, "complete_json"):
+            try:
+                llm_analysis = await self.llm.complete_json(prompt, DOCUMENT_ANALYSIS_SCHEMA)
+                result = json.dumps(llm_analysis), llm_analysis
+            except ValueError as e:
+                print(f"⚠️ Structured classification failed, falling back to text: {e}")
+
+        if result is None:
+            result = await self.llm.complete(prompt), None
+
+        self._llm_cache[cache_key] = result
+        return result
+
+    def _build_analysis(
+        self,
+        filename: str,
+        text_content: Optional[str],
+        file_size: Optional[int],
+        case_id: Optional[str],
+        llm_classification: Optional[str],
+        llm_analysis: Optional[Dict[str, Any]] = None,
+        analyzed_at: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Classify a document by filename and content around an LLM classification
+
+        `analyzed_at` lets a batch stamp all of its documents with one timestamp.
+        """
+        # Scan the text once; every step below reads from the scan
+        scan = self._scan_text(text_content) if text_content else None
+
         # Extract basic metadata
-        metadata = self._extract_document_metadata(filename, file_size, text_content)
+        metadata = self._extract_document_metadata(filename, file_size, text_content, scan)
 
         # Classify by filename
         category_by_filename = self._classify_document_by_filename(filename)
@@ -272,38 +584,35 @@ class EvidenceSorter:
         # Classify by content if available
         category_by_content = None
         if text_content:
-            category_by_content = self._classify_document_by_content(text_content)
+            category_by_content = self._classify_document_by_content(text_content, scan)
 
-        # Determine primary category (content takes precedence)
-        primary_category = category_by_content or category_by_filename or "correspondence"
+        # A valid filing category from the structured LLM analysis
+        category_by_llm = (llm_analysis or {}).get("filing_category")
+        if category_by_llm not in self.document_categories:
+            category_by_llm = None
+
+        # Determine primary category (content takes precedence, then the LLM)
+        primary_category = category_by_content or category_by_llm or category_by_filename or "correspondence"
 
         # Suggest subcategory
-        subcategory = self._suggest_subcategory(primary_category, text_content)
+        subcategory = self._suggest_subcategory(primary_category, text_content, scan)
 
         # Generate suggested tags
-        tags = self._generate_tags(filename, text_content, primary_category)
-
-        # Use LLM for enhanced classification if content available
-        llm_classification = None
-        if text_content:
-            prompt = f"""
-            Analyze this document and provide classification guidance.
-
-            Filename: {filename}
-            Content preview: {text_content[:500]}...
+        tags = self._generate_tags(filename, text_content, primary_category, scan)
+        for tag in (llm_analysis or {}).get("suggested_tags", []):
+            tag = tag.lower()
+            if tag not in tags:
+                tags.append(tag)
 
-            Determine:
-            1. Document type (medical record, legal pleading, correspondence, etc.)
-            2. Key information contained
-            3. Suggested filing category
-            4. Important dates or amounts
-            5. Priority level (high/medium/low)
-            """
-            llm_response = await self.llm.complete(prompt)
-            llm_classification = llm_response
+        if category_by_content:
+            classification_method, confidence = "content_analysis", 0.85
+        elif category_by_llm:
+            classification_method, confidence = "llm_analysis", 0.75
+        else:
+            classification_method, confidence = "filename_analysis", 0.65
 
         return {
-            "document_id": f"DOC-{int(datetime.utcnow().timestamp() * 1000)}",
+            "document_id": f"DOC-{next(_DOCUMENT_IDS)}",
             "case_id": case_id,
             "filename": filename,
             "metadata": metadata,
@@ -311,44 +620,51 @@ class EvidenceSorter:
                 "primary_category": primary_category,
                 "category_name": self.document_categories[primary_category]["name"],
                 "subcategory": subcategory,
-                "confidence": 0.85 if category_by_content else 0.65,
-                "classification_method": "content_analysis" if category_by_content else "filename_analysis"
+                "confidence": confidence,
+                "classification_method": classification_method
             },
             "suggested_tags": tags,
             "llm_classification": llm_classification,
+            "llm_analysis": llm_analysis,
             "filing_recommendation": {
                 "folder_path": f"{self.document_categories[primary_category]['name']}/{subcategory or 'General'}",
-                "requires_review": category_by_content is None
+                "requires_review": category_by_content is None and category_by_llm is None
             },
-            "analyzed_at": datetime.utcnow().isoformat()
+            "analyzed_at": analyzed_at or datetime.utcnow().isoformat()
         }
 
+    def _build_classification_prompt(self, filename: str, text_content: str) -> str:
+        """Build the LLM classification prompt for a document"""
+        return f"""
+            Analyze this document and provide classification guidance.
+
+            Filename: {filename}
+            Content preview: {text_content[:500]}...
+
+            Determine:
+            1. Document type (medical record, legal pleading, correspondence, etc.)
+            2. Key information contained
+            3. Suggested filing category (one of: {", ".join(self.document_categories)})
+            4. Important dates or amounts
+            5. Priority level (high/medium/low)
+            """
+
     def _generate_tags(
         self,
         filename: str,
         text_content: Optional[str],
-        category: str
+        category: str,
+        scan: Optional[_TextScan] = None
     ) -> List[str]:
         """Generate suggested tags for document"""
-        tags = [category]
-
-        combined_text = f"{filename} {text_content or ''}".lower()
-
-        # Add tags based on content
-        tag_patterns = {
-            "urgent": r'\b(?:urgent|asap|deadline)\b',
-            "confidential": r'\b(?:confidential|privileged)\b',
-            "settlement": r'\b(?:settlement|demand|offer)\b',
-            "medical": r'\b(?:medical|doctor|hospital)\b',
-            "billing": r'\b(?:bill|invoice|charge)\b',
-            "injury": r'\b(?:injury|accident|crash)\b'
-        }
+        tags = {category}
 
-        for tag, pattern in tag_patterns.items():
-            if re.search(pattern, combined_text):
-                tags.append(tag)
+        # Add tags based on filename and content
+        tags.update(self._scan_text(filename).tags)
+        if text_content:
+            tags.update((scan or self._scan_text(text_content)).tags)
 
-        return list(set(tags))
+        return list(tags)
 
     async def process_batch(
         self,
@@ -366,22 +682,47 @@ class EvidenceSorter:
         Returns:
             Batch processing results
         """
+        # Documents with identical text (e.g. the same exhibit attached to
+        # several threads) share one LLM classification
+        doc_hashes = [
+            self._generate_document_hash(doc["text_content"]) if doc.get("text_content") else None
+            for doc in documents
+        ]
+        unique_docs: Dict[str, Dict[str, Any]] = {}
+        for doc, doc_hash in zip(documents, doc_hashes):
+            if doc_hash is not None and doc_hash not in unique_docs:
+                unique_docs[doc_hash] = doc
+
+        # Classify unique texts concurrently; the semaphore caps in-flight LLM calls
+        semaphore = asyncio.Semaphore(self.batch_concurrency)
+
+        async def classify(doc: Dict[str, Any]) -> Tuple[str, Optional[Dict[str, Any]]]:
+            async with semaphore:
+                return await self._classify_with_llm(doc.get("filename"), doc["text_content"])
+
+        classifications = await asyncio.gather(
+            *(classify(doc) for doc in unique_docs.values()),
+            return_exceptions=True
+        )
+        llm_by_hash = dict(zip(unique_docs, classifications))
+
+        processed_at = datetime.utcnow()
+        analyzed_at = processed_at.isoformat()
+
         results = []
+        errors = []
         duplicates = []
         seen_hashes = set()
+        near_duplicates = _SimHashIndex()
 
-        for doc in documents:
-            # Analyze document
-            analysis = await self.analyze_document(
-                filename=doc.get("filename"),
-                text_content=doc.get("text_content"),
-                file_size=doc.get("file_size"),
-                case_id=case_id
-            )
+        for doc, doc_hash in zip(documents, doc_hashes):
+            llm_result = llm_by_hash.get(doc_hash, (None, None))
+            if isinstance(llm_result, Exception):
+                errors.append({"filename": doc.get("filename"), "error": str(llm_result)})
+                continue
 
-            # Check for duplicates
-            if doc.get("text_content"):
-                doc_hash = self._generate_document_hash(doc["text_content"])
+            # Check for duplicates, then near-duplicates of earlier documents
+            if doc_hash is not None:
                 if doc_hash in seen_hashes:
                     duplicates.append({
                         "filename": doc.get("filename"),
@@ -390,8 +731,34 @@ class EvidenceSorter:
                     })
                 else:
                     seen_hashes.add(doc_hash)
-
-            results.append(analysis)
+                    fingerprint = _simhash(doc["text_content"])
+                    if fingerprint is not None:
+                        near = near_duplicates.find(fingerprint)
+                        if near:
+                            duplicates.append({
+                                "filename": doc.get("filename"),
+                                "hash": doc_hash,
+                                "is_duplicate": False,
+                                "near_duplicate_of": near[0],
+                                "hamming_distance": near[1]
+                            })
+                        else:
+                            near_duplicates.add(fingerprint, doc.get("filename"))
+
+            try:
+                results.append(self._build_analysis(
+                    filename=doc.get("filename"),
+                    text_content=doc.get("text_content"),
+                    file_size=doc.get("file_size"),
+                    case_id=case_id,
+                    llm_classification=llm_result[0],
+                    llm_analysis=llm_result[1],
+                    analyzed_at=analyzed_at
+                ))
+            except Exception as e:
+                errors.append({"filename": doc.get("filename"), "error": str(e)})
+
+        docs_with_text = sum(1 for doc_hash in doc_hashes if doc_hash is not None)
 
         # Generate summary
         category_counts = {}
@@ -400,20 +767,88 @@ class EvidenceSorter:
             category_counts[cat] = category_counts.get(cat, 0) + 1
 
         return {
-            "batch_id": f"BATCH-{int(datetime.utcnow().timestamp())}",
+            "batch_id": f"BATCH-{int(processed_at.timestamp())}",
             "case_id": case_id,
             "total_documents": len(documents),
             "successfully_processed": len(results),
-            "duplicates_found": len(duplicates),
+            "duplicates_found": sum(1 for d in duplicates if d["is_duplicate"]),
+            "near_duplicates_found": sum(1 for d in duplicates if not d["is_duplicate"]),
+            "llm_calls": len(unique_docs),
+            "deduplication_ratio": (
+                round(1 - len(unique_docs) / docs_with_text, 3) if docs_with_text else 0.0
+            ),
             "category_breakdown": category_counts,
             "documents": results,
             "duplicates": duplicates,
+            "errors": errors,
             "processing_summary": {
                 "most_common_category": max(category_counts, key=category_counts.get) if category_counts else None,
                 "requires_human_review": sum(1 for r in results if r["filing_recommendation"]["requires_review"]),
                 "ready_for_filing": sum(1 for r in results if not r["filing_recommendation"]["requires_review"])
             },
-            "processed_at": datetime.utcnow().isoformat()
+            "processed_at": analyzed_at
+        }
+
+    async def process_batch_async(
+        self,
+        documents: List[Dict[str, Any]],
+        case_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Submit the LLM classification of a batch as one Gemini Batch API job
+
+        Only documents with text content need the LLM; their results come
+        back keyed "doc_<index>" (index into `documents`) from
+        get_batch_status once the job has finished.
+
+        Args:
+            documents: List of documents to process
+                Each dict should have: filename, text_content
+            case_id: Associated case ID
+
+        Returns:
+            Submitted job details
+        """
+        if not hasattr(self.llm, "submit_batch"):
+            raise ValueError("Batch submission requires the Gemini adapter")
+
+        prompts = {
+            f"doc_{index}": self._build_classification_prompt(doc.get("filename", ""), doc["text_content"])
+            for index, doc in enumerate(documents)
+            if doc.get("text_content")
+        }
+        if not prompts:
+            raise ValueError("No documents with text content to classify")
+
+        job_name = await self.llm.submit_batch(
+            prompts,
+            display_name=f"evidence-sorter-{case_id or 'batch'}"
+        )
+
+        return {
+            "batch_job_name": job_name,
+            "status": "submitted",
+            "case_id": case_id,
+            "total_documents": len(documents),
+            "submitted_documents": len(prompts),
+            "submitted_at": datetime.utcnow().isoformat()
+        }
+
+    async def get_batch_status(self, job_name: str) -> Dict[str, Any]:
+        """
+        Get the state of a Batch API classification job
+
+        Returns:
+            Job state, plus LLM classifications keyed "doc_<index>" once succeeded
+        """
+        if not hasattr(self.llm, "get_batch"):
+            raise ValueError("Batch submission requires the Gemini adapter")
+
+        status = await self.llm.get_batch(job_name)
+        return {
+            "batch_job_name": job_name,
+            "state": status["state"],
+            "llm_classifications": status.get("results")
         }
 
     def generate_salesforce_payload(
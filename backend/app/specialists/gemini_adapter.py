@@ -1,7 +1,88 @@
 import os
+import json
+import time
+import asyncio
 import typing as t
 import httpx
-from typing import List, Dict, Any, Optional
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List, Dict, Any, Iterator, Literal, Optional
+
+# HTTP/2 needs the h2 package (httpx[http2]); without it requests use HTTP/1.1
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+
+# Conversation turns (user + assistant pairs) kept verbatim; older turns are
+# collapsed into a summary so each request doesn't resend the full history
+MAX_TURNS = int(os.getenv("GEMINI_MAX_TURNS", "10"))
+
+
+# Model and API root for Batch API jobs (50% of the interactive price)
+BATCH_MODEL = os.getenv("GEMINI_BATCH_MODEL", "gemini-2.5-flash")
+API_ROOT = "https://generativelanguage.googleapis.com/v1beta"
+
+
+# Lifetime of explicit context caches for adapters that opt in; 0 (the
+# default) disables caching. Only enable it for a model that supports
+# cachedContents (the -exp models don't).
+CONTEXT_CACHE_TTL_SECONDS = int(os.getenv("GEMINI_CONTEXT_CACHE_TTL_SECONDS", "0"))
+# Gemini rejects caches below a minimum size (1024 tokens on Flash), so
+# shorter system instructions are never sent to be cached
+CONTEXT_CACHE_MIN_TOKENS = int(os.getenv("GEMINI_CONTEXT_CACHE_MIN_TOKENS", "1024"))
+# Rough characters per token, for estimating an instruction's size locally
+CHARS_PER_TOKEN = 4
+# Recreate a cache this long before it expires, so requests never reference
+# a cache that has just been deleted
+CONTEXT_CACHE_REFRESH_MARGIN = 60
+
+
+# Gemini service tiers: "priority" trades a price premium for lower latency,
+# "flex" is discounted for latency-tolerant work
+ServiceTier = Literal["standard", "priority", "flex"]
+
+# Tier for calls made in the current request, set with use_service_tier();
+# takes precedence over an adapter's default tier
+_service_tier_override: ContextVar[Optional[str]] = ContextVar("gemini_service_tier", default=None)
+
+
+@contextmanager
+def use_service_tier(service_tier: Optional[str]) -> Iterator[None]:
+    """Run Gemini calls made inside the block at `service_tier` (None keeps the adapter default)"""
+    token = _service_tier_override.set(service_tier)
+    try:
+        yield
+    finally:
+        _service_tier_override.reset(token)
+
+
+# One pooled HTTP client shared by every adapter, so requests reuse warm
+# TLS connections to the Gemini endpoint instead of opening a new one per call.
+# With HTTP/2, concurrent requests are multiplexed over those connections.
+_http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared Gemini HTTP client, creating it on first use"""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            timeout=60.0,
+            http2=HTTP2_AVAILABLE,
+            limits=httpx.Limits(max_keepalive_connections=50, max_connections=100)
+        )
+    return _http_client
+
+
+async def close_http_client():
+    """Close the shared Gemini HTTP client (call from the app lifespan)"""
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
 class GeminiAdapter:
@@ -12,6 +93,8 @@ class GeminiAdapter:
     - Multi-turn conversations with history
     - System instructions for better context
     - Proper role-based message formatting
+    - Optional explicit context caching of the system instruction
+    - Per-adapter and per-request service tiers
 
     Usage:
       # Single-shot:
@@ -33,7 +116,10 @@ class GeminiAdapter:
         model: str = "gemini-2.0-flash-exp",
         system_instruction: t.Optional[str] = None,
         temperature: float = 0.3,
-        max_output_tokens: int = 2048
+        max_output_tokens: int = 2048,
+        max_turns: int = MAX_TURNS,
+        context_cache_ttl: int = 0,
+        service_tier: ServiceTier = "standard"
     ):
         self.api_key = api_key or os.environ.get("GOOGLE_AI_API_KEY")
         if not self.api_key:
@@ -42,18 +128,36 @@ class GeminiAdapter:
         self.system_instruction = system_instruction
         self.temperature = temperature
         self.max_output_tokens = max_output_tokens
-        self._endpoint = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+        self.max_turns = max_turns
+        self.service_tier = service_tier
+        # Cleared when the API rejects serviceTier for this model
+        self.service_tiers_supported = True
+        self._endpoint = f"{API_ROOT}/models/{model}:generateContent"
+
+        # Server-side cache of the system instruction (disabled when the TTL is 0)
+        self.context_cache_ttl = context_cache_ttl
+        self.cached_content: t.Optional[str] = None
+        self._cache_expires_at = 0.0
+        self._cache_lock = asyncio.Lock()
         
         # Conversation history for stateful mode
         self.conversation_history: List[Dict[str, Any]] = []
 
-    async def complete(self, prompt: str, system_instruction: t.Optional[str] = None) -> str:
+    async def complete(
+        self,
+        prompt: str,
+        system_instruction: t.Optional[str] = None,
+        service_tier: t.Optional[ServiceTier] = None,
+        response_schema: t.Optional[Dict[str, Any]] = None
+    ) -> str:
         """
         Call Gemini API to complete a single prompt (stateless).
 
         Args:
             prompt: The prompt text to send to Gemini
             system_instruction: Optional system instruction to override default
+            service_tier: Optional service tier to override default
+            response_schema: Optional schema constraining the response to JSON
 
         Returns:
             The generated text response
@@ -94,19 +198,27 @@ class GeminiAdapter:
             ]
         }
 
-        # Add system instruction if provided
+        if response_schema:
+            payload["generationConfig"]["responseMimeType"] = "application/json"
+            payload["generationConfig"]["responseSchema"] = response_schema
+
+        # Reference the cached default system instruction, or send it inline
         system_inst = system_instruction or self.system_instruction
-        if system_inst:
+        cached_content = None if system_instruction else await self._context_cache()
+        if cached_content:
+            payload["cachedContent"] = cached_content
+        elif system_inst:
             payload["systemInstruction"] = {
                 "parts": [{
                     "text": system_inst
                 }]
             }
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            r = await client.post(self._endpoint, params=params, json=payload)
-            r.raise_for_status()
-            data = r.json()
+        tier = self._service_tier(service_tier)
+        if tier != "standard":
+            payload["serviceTier"] = tier
+
+        data = await self._generate(params, payload)
 
         # Extract text from Gemini response
         try:
@@ -115,10 +227,32 @@ class GeminiAdapter:
             # Fallback if structure differs
             raise ValueError(f"Unexpected Gemini API response structure: {data}")
 
+    async def complete_json(
+        self,
+        prompt: str,
+        response_schema: Dict[str, Any],
+        system_instruction: t.Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Complete a prompt as a JSON object matching response_schema.
+
+        Lets a caller get several fields from one request instead of one
+        request per field.
+
+        Raises:
+            ValueError: If the response isn't valid JSON
+        """
+        text = await self.complete(prompt, system_instruction, response_schema=response_schema)
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Gemini returned invalid JSON: {e}")
+
     async def chat(
         self, 
         messages: List[Dict[str, str]], 
-        system_instruction: t.Optional[str] = None
+        system_instruction: t.Optional[str] = None,
+        service_tier: t.Optional[ServiceTier] = None
     ) -> str:
         """
         Have a multi-turn conversation with Gemini, maintaining context.
@@ -127,6 +261,7 @@ class GeminiAdapter:
             messages: List of message dicts with 'role' and 'content' keys
                      Role can be 'user' or 'assistant'
             system_instruction: Optional system instruction to set context
+            service_tier: Optional service tier to override default
 
         Returns:
             The assistant's response text
@@ -142,10 +277,16 @@ class GeminiAdapter:
 
         # Convert messages to Gemini format
         contents = []
+        summaries = []
         for msg in messages:
             role = msg.get("role", "user")
             content = msg.get("content", "")
             
+            # Summaries of earlier turns go into the system instruction
+            if role == "system":
+                summaries.append(content)
+                continue
+            
             # Gemini uses "model" instead of "assistant"
             gemini_role = "model" if role == "assistant" else "user"
             
@@ -184,19 +325,28 @@ class GeminiAdapter:
             ]
         }
 
-        # Add system instruction if provided
-        system_inst = system_instruction or self.system_instruction
-        if system_inst:
+        # Reference the cached default system instruction unless it has to be
+        # extended with summaries, otherwise send it inline
+        system_inst = "\n\n".join(
+            part for part in [system_instruction or self.system_instruction, *summaries] if part
+        )
+        cached_content = None
+        if system_instruction in (None, self.system_instruction) and not summaries:
+            cached_content = await self._context_cache()
+        if cached_content:
+            payload["cachedContent"] = cached_content
+        elif system_inst:
             payload["systemInstruction"] = {
                 "parts": [{
                     "text": system_inst
                 }]
             }
 
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            r = await client.post(self._endpoint, params=params, json=payload)
-            r.raise_for_status()
-            data = r.json()
+        tier = self._service_tier(service_tier)
+        if tier != "standard":
+            payload["serviceTier"] = tier
+
+        data = await self._generate(params, payload)
 
         # Extract text from Gemini response
         try:
@@ -204,6 +354,167 @@ class GeminiAdapter:
         except (KeyError, IndexError):
             raise ValueError(f"Unexpected Gemini API response structure: {data}")
 
+    def _service_tier(self, service_tier: t.Optional[str]) -> str:
+        """Resolve a call's tier: explicit argument, then request override, then default"""
+        if not self.service_tiers_supported:
+            return "standard"
+        return service_tier or _service_tier_override.get() or self.service_tier
+
+    async def _generate(self, params: Dict[str, str], payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        POST a generateContent request and return the response JSON
+
+        Not every model or API version accepts serviceTier. If the request is
+        rejected over it, it is retried once at the standard tier, and this
+        adapter sends only standard-tier requests from then on.
+        """
+        r = await get_http_client().post(self._endpoint, params=params, json=payload)
+        if (
+            r.status_code == 400
+            and "serviceTier" in payload
+            and "servicetier" in r.text.lower().replace("_", "")
+        ):
+            print(f"⚠️ Gemini rejected service tier '{payload.pop('serviceTier')}', using standard")
+            self.service_tiers_supported = False
+            r = await get_http_client().post(self._endpoint, params=params, json=payload)
+        r.raise_for_status()
+        return r.json()
+
+    async def create_context_cache(self) -> t.Optional[str]:
+        """
+        Store the system instruction server-side as Gemini cached content.
+
+        Requests that use the default system instruction then reference the
+        cache instead of resending it, and its tokens are billed at the
+        cached rate. On failure the instruction keeps being sent inline and
+        caching is retried after another TTL.
+
+        Instructions estimated below CONTEXT_CACHE_MIN_TOKENS are too small
+        for Gemini to cache, so they are always sent inline and no cache is
+        ever requested for them.
+
+        Returns:
+            The cached content name (e.g. "cachedContents/abc"), or None
+        """
+        if not self.context_cache_ttl or not self.system_instruction:
+            return None
+        if len(self.system_instruction) < CONTEXT_CACHE_MIN_TOKENS * CHARS_PER_TOKEN:
+            self.cached_content = None
+            self._cache_expires_at = float("inf")
+            return None
+
+        payload = {
+            "model": f"models/{self.model}",
+            "systemInstruction": {"parts": [{"text": self.system_instruction}]},
+            "ttl": f"{self.context_cache_ttl}s"
+        }
+
+        try:
+            r = await get_http_client().post(
+                f"{API_ROOT}/cachedContents",
+                params={"key": self.api_key},
+                json=payload
+            )
+            r.raise_for_status()
+            self.cached_content = r.json()["name"]
+            self._cache_expires_at = time.monotonic() + self.context_cache_ttl - CONTEXT_CACHE_REFRESH_MARGIN
+        except (httpx.HTTPError, KeyError) as e:
+            print(f"⚠️ Gemini context cache creation failed: {e}")
+            self.cached_content = None
+            self._cache_expires_at = time.monotonic() + self.context_cache_ttl
+
+        return self.cached_content
+
+    async def _context_cache(self) -> t.Optional[str]:
+        """Get the live context cache name, (re)creating it when due"""
+        if not self.context_cache_ttl or not self.system_instruction:
+            return None
+        if time.monotonic() < self._cache_expires_at:
+            return self.cached_content
+
+        async with self._cache_lock:
+            if time.monotonic() >= self._cache_expires_at:
+                await self.create_context_cache()
+        return self.cached_content
+
+    async def submit_batch(
+        self,
+        prompts: Dict[str, str],
+        display_name: str = "batch",
+        system_instruction: t.Optional[str] = None
+    ) -> str:
+        """
+        Submit prompts as one Gemini Batch API job (asynchronous, half price).
+
+        Requests are sent inline, so the whole batch must stay under the
+        inline request size limit (20MB).
+
+        Args:
+            prompts: Prompt text keyed by an ID used to match up results
+            display_name: Human-readable job name
+            system_instruction: Optional system instruction to override default
+
+        Returns:
+            The job name (e.g. "batches/123") to poll with get_batch
+        """
+        system_inst = system_instruction or self.system_instruction
+        requests = []
+        for key, prompt in prompts.items():
+            request = {
+                "contents": [{"role": "user", "parts": [{"text": prompt}]}],
+                "generationConfig": {
+                    "temperature": self.temperature,
+                    "maxOutputTokens": self.max_output_tokens,
+                }
+            }
+            if system_inst:
+                request["systemInstruction"] = {"parts": [{"text": system_inst}]}
+            requests.append({"request": request, "metadata": {"key": key}})
+
+        payload = {
+            "batch": {
+                "display_name": display_name,
+                "input_config": {"requests": {"requests": requests}}
+            }
+        }
+
+        r = await get_http_client().post(
+            f"{API_ROOT}/models/{BATCH_MODEL}:batchGenerateContent",
+            params={"key": self.api_key},
+            json=payload
+        )
+        r.raise_for_status()
+        return r.json()["name"]
+
+    async def get_batch(self, job_name: str) -> Dict[str, Any]:
+        """
+        Get the state of a Batch API job, with its results once it has succeeded.
+
+        Returns:
+            {"state": "BATCH_STATE_...", "results": {key: text or None}}
+            where "results" is only present for a succeeded job
+        """
+        r = await get_http_client().get(f"{API_ROOT}/{job_name}", params={"key": self.api_key})
+        r.raise_for_status()
+        data = r.json()
+
+        state = data.get("metadata", {}).get("state", "BATCH_STATE_UNSPECIFIED")
+        status: Dict[str, Any] = {"state": state}
+        if state != "BATCH_STATE_SUCCEEDED":
+            return status
+
+        results = {}
+        inlined = data.get("response", {}).get("inlinedResponses", {}).get("inlinedResponses", [])
+        for item in inlined:
+            key = item.get("metadata", {}).get("key")
+            try:
+                results[key] = item["response"]["candidates"][0]["content"]["parts"][0]["text"].strip()
+            except (KeyError, IndexError):
+                # Failed requests carry an "error" instead of a response
+                results[key] = None
+        status["results"] = results
+        return status
+
     async def add_to_conversation(self, user_message: str) -> str:
         """
         Add a message to the ongoing conversation and get a response (stateful).
@@ -231,8 +542,37 @@ class GeminiAdapter:
             "content": response
         })
 
+        # Summarize once history reaches twice the window, so the extra
+        # summarization call is amortized over max_turns turns
+        if len(self.conversation_history) > 4 * self.max_turns:
+            await self._summarize_older_turns()
+
         return response
 
+    async def _summarize_older_turns(self):
+        """Collapse all but the last max_turns turns into a single summary message."""
+        keep = 2 * self.max_turns
+        older = self.conversation_history[:-keep]
+
+        transcript = "\n".join(f"{msg['role']}: {msg['content']}" for msg in older)
+        prompt = (
+            "Summarize the following conversation so it can be continued without it. "
+            "Keep names, dates, facts and any open questions.\n\n"
+            f"{transcript}"
+        )
+
+        try:
+            summary = await self.complete(prompt, system_instruction="You summarize conversations concisely.")
+        except Exception as e:
+            # Keep the full history and try again on the next turn
+            print(f"⚠️ Conversation summarization failed: {e}")
+            return
+
+        self.conversation_history = [
+            {"role": "system", "content": f"Summary of the earlier conversation: {summary}"},
+            *self.conversation_history[-keep:]
+        ]
+
     def clear_conversation(self):
         """Clear the conversation history."""
         self.conversation_history = []
@@ -240,3 +580,6 @@ class GeminiAdapter:
     def set_system_instruction(self, instruction: str):
         """Set or update the system instruction."""
         self.system_instruction = instruction
+        # A cache of the previous instruction no longer applies
+        self.cached_content = None
+        self._cache_expires_at = 0.0
@@ -3,6 +3,38 @@ from typing import List
 
 from ..schemas import Citation
 
+# RE2 is optional - it scans in linear time with no backtracking, and the
+# issue patterns below are valid in both engines. RE2's \b is ASCII-only, so
+# the re fallback compiles with re.ASCII and both engines match the same text.
+try:
+    import re2
+    _compile_ascii = re2.compile
+except ImportError:
+    def _compile_ascii(pattern: str) -> "re.Pattern":
+        return re.compile(pattern, re.ASCII)
+
+# Issue heuristics, matched in a single pass over the lowercased text; the
+# named group says which issue a match belongs to
+_RE_ISSUES = _compile_ascii(
+    r"(?P<injury>\bneck|back|head|arm|leg|fracture|broken\b)"
+    r"|(?P<auto>\bdriv|accident|crash|collision\b)"
+    r"|(?P<negligence>\bnegligence|careless|reckless\b)"
+    r"|(?P<settlement>\bsettle|settlement|limits|tender\b)"
+    r"|(?P<medical>\bMRI|x-?ray|ct scan|prescription|surgery|therapy|pt\b)"
+)
+
+_ISSUES = {
+    "injury": "Injury / bodily harm described — check medical records and bills",
+    "auto": "Auto accident — possible third-party liability and PIP/UM coverage checks",
+    "negligence": "Allegation of negligence — identify potential duty, breach, causation",
+    "settlement": "Settlement / tender language — prepare demand and policy analysis",
+    "medical": "Medical treatments referenced — gather records and billing codes",
+}
+
+
+# Brief returned by the mock adapter
+_MOCK_BRIEF = "MockLLM: summarized research findings."
+
 
 class LLMAdapter:
     """Abstract adapter interface for an LLM. Implementations should provide `complete` method.
@@ -17,7 +49,7 @@ class LLMAdapter:
 class MockLLMAdapter(LLMAdapter):
     async def complete(self, prompt: str) -> str:
         # Very small deterministic mock that echoes prompt summary lines.
-        return "MockLLM: summarized research findings."
+        return _MOCK_BRIEF
 
 
 class LegalResearcher:
@@ -44,20 +76,9 @@ class LegalResearcher:
             )
 
     def _extract_issues(self, text: str) -> List[str]:
-        issues = set()
-        t = text.lower()
         # very simple key phrase heuristics — placeholders for ML/LLM
-        if re.search(r"\bneck|back|head|arm|leg|fracture|broken\b", t):
-            issues.add("Injury / bodily harm described — check medical records and bills")
-        if re.search(r"\bdriv|accident|crash|collision\b", t):
-            issues.add("Auto accident — possible third-party liability and PIP/UM coverage checks")
-        if re.search(r"\bnegligence|careless|reckless\b", t):
-            issues.add("Allegation of negligence — identify potential duty, breach, causation")
-        if re.search(r"\bsettle|settlement|limits|tender\b", t):
-            issues.add("Settlement / tender language — prepare demand and policy analysis")
-        if re.search(r"\bMRI|x-?ray|ct scan|prescription|surgery|therapy|pt\b", t):
-            issues.add("Medical treatments referenced — gather records and billing codes")
-        return list(issues)
+        found = {match.lastgroup for match in _RE_ISSUES.finditer(text.lower())}
+        return [issue for key, issue in _ISSUES.items() if key in found]
 
     def _find_citations(self, text: str) -> List[Citation]:
         # Mock citation finder: returns a couple of representative citations when 'negligence' appears
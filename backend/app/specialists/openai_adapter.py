@@ -9,6 +9,7 @@ class OpenAIAdapter:
     Usage:
       adapter = OpenAIAdapter(api_key=os.environ.get('OPENAI_API_KEY'))
       await adapter.complete(prompt)
+      await adapter.aclose()
 
     This keeps the dependency surface small (only httpx required). If you prefer the
     official `openai` package or LangChain, use those instead.
@@ -20,6 +21,22 @@ class OpenAIAdapter:
             raise ValueError("OPENAI_API_KEY is required for OpenAIAdapter")
         self.model = model
         self._endpoint = "https://api.openai.com/v1/chat/completions"
+        # Kept open so calls reuse the TLS connection; close with aclose()
+        self._client: t.Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_connections=32, max_keepalive_connections=16)
+            )
+        return self._client
+
+    async def aclose(self):
+        """Close the adapter's HTTP client"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
 
     async def complete(self, prompt: str) -> str:
         headers = {
@@ -36,10 +53,9 @@ class OpenAIAdapter:
             "max_tokens": 800,
         }
 
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            r = await client.post(self._endpoint, headers=headers, json=payload)
-            r.raise_for_status()
-            data = r.json()
+        r = await self._get_client().post(self._endpoint, headers=headers, json=payload)
+        r.raise_for_status()
+        data = r.json()
         # basic extraction of text
         try:
             return data["choices"][0]["message"]["content"].strip()
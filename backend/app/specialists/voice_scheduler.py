@@ -12,8 +12,11 @@ Responsibilities:
 
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta
+import os
 import re
 
+from cachetools import TTLCache
+
 
 class SchedulerAdapter:
     """Adapter interface for LLM provider"""
@@ -54,6 +57,13 @@ class VoiceScheduler:
 
     def __init__(self, llm_adapter: Optional[SchedulerAdapter] = None):
         self.llm = llm_adapter or MockSchedulerAdapter()
+
+        # Slots handed out by generate_scheduling_options, by slot ID, so a
+        # message can be drafted from the IDs without regenerating the slots
+        self.offered_slots: TTLCache = TTLCache(
+            maxsize=int(os.getenv("OFFERED_SLOTS_MAX_SIZE", "10000")),
+            ttl=int(os.getenv("OFFERED_SLOTS_TTL_SECONDS", "86400"))
+        )
         
         # Set Gemini system instruction if using GeminiAdapter
         if self.llm and hasattr(self.llm, 'set_system_instruction'):
@@ -248,7 +258,9 @@ class VoiceScheduler:
                 slot_time = option_date.replace(hour=hour, minute=0, second=0)
 
                 options.append({
-                    "slot_id": f"SLOT-{int(slot_time.timestamp())}",
+                    # Unique per type and duration as well as time: offers for
+                    # different appointments share the offered_slots store
+                    "slot_id": f"SLOT-{appointment_type}-{duration_minutes}-{int(slot_time.timestamp())}",
                     "datetime": slot_time.isoformat(),
                     "display": slot_time.strftime("%A, %B %d, %Y at %I:%M %p"),
                     "duration_minutes": duration_minutes,
@@ -256,7 +268,20 @@ class VoiceScheduler:
                     "appointment_type": appointment_type
                 })
 
-        return options[:5]  # Return top 5 options
+        options = options[:5]  # Return top 5 options
+        for option in options:
+            self.offered_slots[option["slot_id"]] = option
+
+        return options
+
+    def get_offered_slots(self, slot_ids: List[str]) -> List[Dict[str, Any]]:
+        """
+        Look up previously offered slots by ID
+
+        Returns:
+            The slots found, in the order of slot_ids; unknown or expired IDs are skipped
+        """
+        return [self.offered_slots[slot_id] for slot_id in slot_ids if slot_id in self.offered_slots]
 
     async def draft_scheduling_message(
         self,
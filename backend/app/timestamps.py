@@ -0,0 +1,29 @@
+"""
+Timestamp helpers for API responses
+
+Response timestamps are timezone-aware UTC datetimes built from
+time.time(); orjson serializes them directly, so no intermediate
+ISO string is formatted per response. Where a string is needed,
+now_iso() formats at most once per second.
+"""
+import time
+from datetime import datetime, timezone
+from typing import Tuple
+
+
+def utc_now() -> datetime:
+    """Get the current time as a timezone-aware UTC datetime"""
+    return datetime.fromtimestamp(time.time(), tz=timezone.utc)
+
+
+# (second, formatted string) of the last now_iso() call
+_cached_iso: Tuple[int, str] = (0, "")
+
+
+def now_iso() -> str:
+    """Get the current UTC time as an ISO 8601 string ("...Z"), at 1-second resolution"""
+    global _cached_iso
+    second = int(time.time())
+    if second != _cached_iso[0]:
+        _cached_iso = (second, time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(second)))
+    return _cached_iso[1]
@@ -0,0 +1,24 @@
+"""
+Worker pool sizing
+
+The CPU-bound pools (document parsing, page extraction, page OCR) and the
+event loop's default executor are all sized from one budget, WORKER_BUDGET
+(default: the CPU count), so together they don't oversubscribe the machine.
+Each size can still be overridden on its own.
+"""
+import os
+
+
+WORKER_BUDGET = int(os.getenv("WORKER_BUDGET", str(os.cpu_count() or 4)))
+
+# Long documents fan out to the page pools, so document threads spend most
+# of their time waiting on them
+DOCUMENT_WORKERS = int(os.getenv("DOCUMENT_POOL_SIZE", str(max(1, WORKER_BUDGET // 2))))
+
+# Page text extraction (processes) and page OCR (threads); a document only
+# uses one of the two at a time
+PAGE_WORKERS = int(os.getenv("PAGE_POOL_SIZE", str(WORKER_BUDGET)))
+
+# asyncio.to_thread / run_in_executor(None) mostly run blocking I/O rather
+# than CPU work, so this pool is a multiple of the budget
+DEFAULT_EXECUTOR_WORKERS = int(os.getenv("THREAD_POOL_SIZE", str(WORKER_BUDGET * 4)))
@@ -1,7 +1,11 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import traceback
 import uvicorn
 from dotenv import load_dotenv
 import os
@@ -19,6 +23,11 @@ from api.routers import (
     conversation_endpoints,
     document_endpoints
 )
+from app.services.conversation_store import conversation_store
+from app.services.email_service import email_service
+from app.services.sms_service import sms_service
+from app.specialists.gemini_adapter import close_http_client
+from app.worker_budget import DEFAULT_EXECUTOR_WORKERS
 
 
 # Lifespan context manager for startup/shutdown events
@@ -34,8 +43,22 @@ async def lifespan(app: FastAPI):
     print(f"API Docs: http://localhost:{os.getenv('PORT', '8000')}/docs")
     print("=" * 60)
     
+    # Size the default pool used by asyncio.to_thread / run_in_executor(None)
+    default_executor = ThreadPoolExecutor(max_workers=DEFAULT_EXECUTOR_WORKERS)
+    asyncio.get_running_loop().set_default_executor(default_executor)
+
     # Initialize database connection pool, Redis, etc. (if needed later)
     # await database.connect()
+    conversation_store.start_sweeper()
+    email_service.start_reaper()
+    # Build the shared services in this worker before taking traffic
+    orchestrator_endpoints.get_orchestrator()
+    router_endpoints.get_task_router()
+    document_endpoints.get_document_processor()
+    orchestrator_endpoints.input_batcher.start()
+    orchestrator_endpoints.approval_queue.start()
+    await specialist_endpoints.warm_specialists()
+    specialist_endpoints.batch_callbacks.start()
     
     yield
     
@@ -43,6 +66,15 @@ async def lifespan(app: FastAPI):
     print("\n" + "=" * 60)
     print("👋 Shutting down Morgan Legal Tender API...")
     print("=" * 60)
+    await conversation_store.stop_sweeper()
+    await email_service.stop_reaper()
+    await orchestrator_endpoints.input_batcher.stop()
+    await orchestrator_endpoints.approval_queue.stop()
+    await specialist_endpoints.batch_callbacks.stop()
+    await close_http_client()
+    await sms_service.close()
+    document_endpoints.get_document_processor().shutdown()
+    default_executor.shutdown(wait=False, cancel_futures=True)
     # await database.disconnect()
 
 
@@ -72,6 +104,7 @@ app = FastAPI(
     docs_url="/docs",
     redoc_url="/redoc",
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     contact={
         "name": "Morgan Legal Tender Team",
         "email": "dhyan.sur@gmail.com",
@@ -81,6 +114,61 @@ app = FastAPI(
     }
 )
 
+# Unhandled errors are turned into responses by this middleware rather than
+# an Exception handler: Starlette runs that handler in ServerErrorMiddleware,
+# outside CORS, so a 500 would reach the browser without CORS headers. It is
+# added before CORSMiddleware so it sits inside it.
+class UnhandledErrorMiddleware:
+    """Convert unhandled endpoint errors into 500 JSON responses"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message):
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            # Too late for an error response once headers have gone out
+            if response_started:
+                raise
+            traceback.print_exc()
+            response = unhandled_error_response(Request(scope), exc)
+            await response(scope, receive, send)
+
+
+def unhandled_error_response(request: Request, exc: Exception) -> ORJSONResponse:
+    """
+    Build the response for an unhandled error
+
+    Endpoints let unexpected errors propagate here instead of wrapping
+    their bodies in try/except; "detail" matches HTTPException responses.
+    """
+    return ORJSONResponse(
+        status_code=500,
+        content={
+            "detail": str(exc),
+            "error": "Internal server error",
+            "message": str(exc),
+            "path": str(request.url),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+    )
+
+
+app.add_middleware(UnhandledErrorMiddleware)
+
 # CORS Configuration
 cors_origins = os.getenv("CORS_ORIGINS", "http://localhost:3000,http://localhost:3001").split(",")
 
@@ -92,6 +180,10 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress JSON list responses (history, stats, batch routing); level 1 keeps
+# the CPU cost low, and small payloads like /source-types stay uncompressed
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=1)
+
 # Include routers
 app.include_router(
     router_endpoints.router,
@@ -207,23 +299,6 @@ async def api_info():
     }
 
 
-# Global exception handler
-@app.exception_handler(Exception)
-async def global_exception_handler(request, exc):
-    """
-    Global exception handler for unhandled errors
-    """
-    return JSONResponse(
-        status_code=500,
-        content={
-            "error": "Internal server error",
-            "message": str(exc),
-            "path": str(request.url),
-            "timestamp": datetime.utcnow().isoformat()
-        }
-    )
-
-
 # 404 handler
 @app.exception_handler(404)
 async def not_found_handler(request, exc):
@@ -241,13 +316,28 @@ async def not_found_handler(request, exc):
     )
 
 
+# uvloop and httptools come with uvicorn[standard] (uvloop is not available on
+# Windows); fall back to the pure-Python loop and parser without them
+try:
+    import uvloop  # noqa: F401
+    UVICORN_LOOP = "uvloop"
+except ImportError:
+    UVICORN_LOOP = "asyncio"
+
+try:
+    import httptools  # noqa: F401
+    UVICORN_HTTP = "httptools"
+except ImportError:
+    UVICORN_HTTP = "h11"
+
+
 # Run the application
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
     host = os.getenv("HOST", "0.0.0.0")
     reload = os.getenv("ENVIRONMENT", "development") == "development"
     
-    print(f"\nStarting server on {host}:{port}")
+    print(f"\nStarting server on {host}:{port} (loop: {UVICORN_LOOP}, http: {UVICORN_HTTP})")
     print(f"Documentation: http://localhost:{port}/docs\n")
     
     # Disable auto-reload to prevent .venv file watching issues
@@ -257,5 +347,7 @@ if __name__ == "__main__":
         host=host,
         port=port,
         reload=False,  # Disabled to prevent .venv watching issues
-        log_level="info"
+        log_level="info",
+        loop=UVICORN_LOOP,
+        http=UVICORN_HTTP
     )
\ No newline at end of file
@@ -7,6 +7,8 @@ Main orchestration system for the Tender for Lawyers AI platform.
 from .tender_orchestrator import TenderOrchestrator, SourceType, ApprovalStatus
 from .advanced_router import TaskRouter, TaskType, AgentType
 from .gemini_router import GeminiTaskRouter
+from .micro_batcher import MicroBatcher
+from .background_queue import BackgroundQueue
 
 __all__ = [
     "TenderOrchestrator",
@@ -16,5 +18,7 @@ __all__ = [
     "TaskType",
     "AgentType",
     "GeminiTaskRouter",
+    "MicroBatcher",
+    "BackgroundQueue",
 ]
 
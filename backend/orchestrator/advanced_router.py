@@ -2,6 +2,7 @@
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 from enum import Enum
+import asyncio
 import os
 
 
@@ -297,6 +298,23 @@ class TaskRouter:
         
         return routing_decision
     
+    async def route_tasks(
+        self,
+        tasks: List[Dict[str, Any]],
+        consider_load: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Route several tasks, returning one routing decision per task in order
+
+        The per-task AI calls run concurrently. Load is checked and updated
+        after each task's AI call without awaiting in between, so the load
+        counters stay consistent. Subclasses may override this to route the
+        whole list in one AI call.
+        """
+        return list(await asyncio.gather(
+            *[self.route_task(task, consider_load) for task in tasks]
+        ))
+    
     def _get_primary_agent(self, task_type: str) -> AgentType:
         """Get the primary agent for a task type"""
         # Convert string to enum if needed
@@ -420,7 +438,8 @@ class TaskRouter:
     ):
         """Record routing decision for analytics"""
         self.routing_history.append({
-            "task_id": task.get("id"),
+            # Orchestrator tasks carry "id"; API TaskInput dumps carry "task_id"
+            "task_id": task.get("id") or task.get("task_id"),
             "task_type": task.get("task_type"),
             "priority": task.get("priority"),
             "agent_id": routing_decision["agent_id"],
@@ -0,0 +1,62 @@
+"""
+Background Work Queue
+
+Lets a request hand off follow-up work (e.g. notifying the assigned
+specialist of an approval decision) and respond without waiting for it.
+Items are processed in order by a single long-running worker, and stop()
+drains whatever is still queued so nothing is lost on shutdown.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+
+class BackgroundQueue:
+    """
+    Queue drained by a worker task that calls `handler` for each item
+
+    A failing item is logged and skipped; it doesn't stop the worker.
+    """
+
+    def __init__(self, handler: Callable[[Any], Awaitable[None]], name: str = "background queue"):
+        self.handler = handler
+        self.name = name
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    def enqueue(self, item: Any):
+        """Queue an item without waiting for it to be handled"""
+        if self._worker is None or self._worker.done():
+            self.start()
+        self._queue.put_nowait(item)
+
+    def start(self):
+        """Start the worker (call from the app lifespan)"""
+        if self._worker is None or self._worker.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run_loop())
+
+    async def stop(self):
+        """Handle everything already queued, then stop the worker"""
+        if self._worker is None:
+            return
+
+        await self._queue.join()
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+    async def _run_loop(self):
+        while True:
+            item = await self._queue.get()
+            try:
+                await self.handler(item)
+            except Exception as e:
+                print(f"⚠️ {self.name} failed to handle an item: {e}")
+            finally:
+                self._queue.task_done()
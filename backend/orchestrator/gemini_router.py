@@ -7,7 +7,8 @@ for each task, going beyond simple pattern matching.
 
 import os
 import json
-from typing import Dict, Any, Optional
+import asyncio
+from typing import Dict, Any, List, Optional
 import google.generativeai as genai
 
 from .advanced_router import TaskRouter, AgentType, TaskType
@@ -84,6 +85,56 @@ class GeminiTaskRouter(TaskRouter):
             print(f"⚠️ AI routing failed: {e}, falling back to rule-based")
             return await super().route_task(task, consider_load)
 
+    async def route_tasks(
+        self,
+        tasks: List[Dict[str, Any]],
+        consider_load: bool = False
+    ) -> List[Dict[str, Any]]:
+        """
+        Route several tasks with a single Gemini call
+
+        Tasks the AI answer doesn't cover (or assigns an invalid agent) fall
+        back to route_task individually; if the batch call fails entirely,
+        every task does.
+        """
+        if len(tasks) < 2 or not self.use_ai_routing or not self.gemini_model:
+            return await super().route_tasks(tasks, consider_load)
+
+        try:
+            available_agents = self._get_available_agents_info(consider_load, "medium")
+            prompt = self._build_batch_routing_prompt(tasks, available_agents)
+            response = await asyncio.to_thread(self.gemini_model.generate_content, prompt)
+            ai_decisions = self._parse_batch_ai_response(response.text, len(tasks))
+        except Exception as e:
+            print(f"⚠️ Batch AI routing failed: {e}, routing tasks individually")
+            return await super().route_tasks(tasks, consider_load)
+
+        routing_decisions = []
+        for task, ai_decision in zip(tasks, ai_decisions):
+            try:
+                agent_id = AgentType((ai_decision or {}).get("agent_id"))
+            except ValueError:
+                routing_decisions.append(await self.route_task(task, consider_load))
+                continue
+
+            agent_info = self.agents[agent_id]
+            routing_decision = {
+                "agent_id": agent_id.value,
+                "agent_name": agent_info["name"],
+                "confidence": ai_decision.get("confidence", 0.9),
+                "reasoning": ai_decision.get("reasoning", "AI-selected based on task analysis"),
+                "estimated_completion_time": agent_info["average_completion_time"],
+                "agent_specialties": agent_info["specialties"],
+                "routed_at": self._get_timestamp(),
+                "routing_method": "gemini_ai"
+            }
+
+            self._record_routing(task, routing_decision)
+            agent_info["current_load"] += 1
+            routing_decisions.append(routing_decision)
+
+        return routing_decisions
+
     async def _ai_route_task(
         self,
         task: Dict[str, Any],
@@ -192,6 +243,88 @@ JSON RESPONSE:"""
 
         return prompt
 
+    def _build_batch_routing_prompt(
+        self,
+        tasks: List[Dict[str, Any]],
+        available_agents: Dict[str, Dict[str, Any]]
+    ) -> str:
+        """
+        Build a prompt for Gemini to route several tasks at once
+        """
+        prompt = """You are an intelligent task routing system for a legal case management platform.
+
+Your job is to select the BEST AI specialist for EACH of the numbered tasks below.
+
+TASKS:
+"""
+
+        for index, task in enumerate(tasks):
+            prompt += f"""
+TASK {index}:
+- Description: {task.get("description", "")}
+- Type: {task.get("task_type", "")}
+- Priority: {task.get("priority", "medium")}
+- Extracted Information: {json.dumps(task.get("extracted_data", {}))}
+"""
+
+        prompt += """
+AVAILABLE SPECIALISTS:
+"""
+
+        for agent_id, agent_info in available_agents.items():
+            prompt += f"""
+{agent_id.upper()}:
+- Name: {agent_info['name']}
+- Specialties: {', '.join(agent_info['specialties'])}
+- Average completion time: {agent_info['avg_time']} seconds
+- Current load: {agent_info['load']}/{agent_info['max_load']} tasks
+"""
+
+        prompt += """
+
+INSTRUCTIONS:
+1. Analyze each task's description and extracted information
+2. Match each task to the specialist whose expertise best fits it
+3. Consider the specialists' current workload if relevant
+4. Provide your decisions in STRICT JSON format, one object per task, in task order
+
+RESPOND WITH ONLY THIS JSON ARRAY (no other text):
+[
+  {
+    "task": 0,
+    "agent_id": "one of: records_wrangler, communication_guru, legal_researcher, voice_scheduler, evidence_sorter",
+    "confidence": 0.0-1.0 (how confident you are in this choice),
+    "reasoning": "brief explanation of why this specialist is best suited"
+  }
+]
+
+JSON RESPONSE:"""
+
+        return prompt
+
+    def _parse_batch_ai_response(
+        self,
+        response_text: str,
+        task_count: int
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Parse Gemini's JSON array response into one decision (or None) per task
+        """
+        start = response_text.find('[')
+        end = response_text.rfind(']') + 1
+        if start < 0 or end <= start:
+            raise ValueError("No JSON array found in response")
+
+        decisions: List[Optional[Dict[str, Any]]] = [None] * task_count
+        for position, decision in enumerate(json.loads(response_text[start:end])):
+            if not isinstance(decision, dict):
+                continue
+            index = decision.get("task", position)
+            if isinstance(index, int) and 0 <= index < task_count:
+                decisions[index] = decision
+
+        return decisions
+
     def _parse_ai_response(self, response_text: str) -> Dict[str, Any]:
         """
         Parse Gemini's JSON response
@@ -0,0 +1,120 @@
+"""
+Async Micro-Batcher
+
+Collects concurrent requests into small batches so a batch handler (e.g.
+TenderOrchestrator.process_batch) can share one AI round-trip between them.
+A batch is flushed when it reaches max_batch_size or max_wait_ms after its
+first item arrived, whichever comes first.
+"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, List, Optional, Set, Tuple
+
+
+class MicroBatcher:
+    """
+    Queue that groups submitted items into batches for a batch handler
+
+    The handler receives a list of items and must return one result per item,
+    in order. A result that is an Exception is raised to that item's caller
+    only; if the handler itself raises, every caller in the batch gets the error.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 10
+    ):
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait_seconds = max_wait_ms / 1000
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Items taken off the queue for the batch currently being collected
+        self._collecting: List[Tuple[Any, asyncio.Future]] = []
+        # Batches being processed, kept referenced until they finish
+        self._in_flight: Set[asyncio.Task] = set()
+
+    async def submit(self, item: Any) -> Any:
+        """Queue an item and wait for its result"""
+        if self._worker is None or self._worker.done():
+            self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    def start(self):
+        """Start the batching loop (call from the app lifespan)"""
+        if self._worker is None or self._worker.done():
+            if self._queue is None:
+                self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run_loop())
+
+    async def stop(self):
+        """Stop collecting batches, dispatch everything already queued and wait for it all"""
+        if self._worker:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        # Callers of the half-collected batch and of still-queued items are
+        # waiting on their futures, so they're dispatched rather than dropped
+        pending, self._collecting = self._collecting, []
+        while self._queue is not None and not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for start in range(0, len(pending), self.max_batch_size):
+            self._start_dispatch(pending[start:start + self.max_batch_size])
+
+        if self._in_flight:
+            await asyncio.gather(*list(self._in_flight), return_exceptions=True)
+
+    async def _run_loop(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            self._collecting = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_seconds
+
+            while len(self._collecting) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    self._collecting.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            batch, self._collecting = self._collecting, []
+            self._start_dispatch(batch)
+
+    def _start_dispatch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        """Process a batch in the background so the next batch can start filling"""
+        task = asyncio.create_task(self._dispatch(batch))
+        self._in_flight.add(task)
+        task.add_done_callback(self._in_flight.discard)
+
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]):
+        items = [item for item, _ in batch]
+
+        try:
+            results = await self.handler(items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                # The caller went away (e.g. client disconnected)
+                continue
+            if isinstance(result, Exception):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
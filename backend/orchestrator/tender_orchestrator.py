@@ -10,9 +10,11 @@ This is the core AI Orchestrator that:
 6. Labels PII/PHI for data protection
 """
 
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, Iterator, List, Optional
+from collections import Counter
 from datetime import datetime
 from enum import Enum
+import asyncio
 import re
 import os
 
@@ -68,6 +70,9 @@ class TenderOrchestrator:
 
         self.processing_history = []
 
+        # Running totals for /stats, updated as each input is recorded
+        self._stats = {"total_processed": 0, "total_tasks": 0, "by_source": Counter()}
+
         # Initialize specialists with Gemini
         self._initialize_specialists()
 
@@ -126,9 +131,77 @@ class TenderOrchestrator:
                 - approval_required: Whether human approval is needed
                 - proposed_actions: Draft outputs for human review
         """
-        metadata = metadata or {}
-        attachments = attachments or []
+        analysis = self._analyze_input(raw_text, source_type)
+        routing_decisions = await self.task_router.route_tasks(analysis["detected_tasks"])
 
+        return await self._complete_processing(
+            analysis,
+            routing_decisions,
+            raw_text,
+            source_type,
+            metadata,
+            case_id,
+            attachments
+        )
+
+    async def process_batch(self, inputs: List[Dict[str, Any]]) -> List[Any]:
+        """
+        Process several inputs together, routing all of their tasks in one call
+
+        Args:
+            inputs: List of dicts holding process_input's keyword arguments
+                (raw_text, source_type, and optionally metadata, case_id, attachments)
+
+        Returns:
+            One entry per input, in order: the process_input result, or the
+            exception raised while processing that input
+        """
+        analyses = []
+        for item in inputs:
+            try:
+                analyses.append(self._analyze_input(item["raw_text"], item["source_type"]))
+            except Exception as e:
+                analyses.append(e)
+
+        # Route every detected task in the batch together
+        all_tasks = [
+            task
+            for analysis in analyses
+            if not isinstance(analysis, Exception)
+            for task in analysis["detected_tasks"]
+        ]
+        all_routing = await self.task_router.route_tasks(all_tasks)
+
+        results: List[Any] = list(analyses)
+        pending = []
+        offset = 0
+        for index, (item, analysis) in enumerate(zip(inputs, analyses)):
+            if isinstance(analysis, Exception):
+                continue
+
+            task_count = len(analysis["detected_tasks"])
+            pending.append((index, self._complete_processing(
+                analysis,
+                all_routing[offset:offset + task_count],
+                item["raw_text"],
+                item["source_type"],
+                item.get("metadata"),
+                item.get("case_id"),
+                item.get("attachments")
+            )))
+            offset += task_count
+
+        outcomes = await asyncio.gather(
+            *[coro for _, coro in pending],
+            return_exceptions=True
+        )
+        for (index, _), outcome in zip(pending, outcomes):
+            results[index] = outcome
+
+        return results
+
+    def _analyze_input(self, raw_text: str, source_type: SourceType) -> Dict[str, Any]:
+        """Run the local (non-AI) steps: normalize, extract, label and detect tasks"""
         # Step 1: Normalize the messy input
         normalized = self._normalize_text(raw_text, source_type)
 
@@ -141,11 +214,31 @@ class TenderOrchestrator:
         # Step 4: Detect actionable tasks
         detected_tasks = self._detect_tasks(normalized, entities, source_type)
 
-        # Step 5: Route tasks to specialists
-        routing_decisions = []
-        for task in detected_tasks:
-            routing = await self.task_router.route_task(task)
-            routing_decisions.append(routing)
+        return {
+            "normalized": normalized,
+            "entities": entities,
+            "pii_labels": pii_labels,
+            "detected_tasks": detected_tasks
+        }
+
+    async def _complete_processing(
+        self,
+        analysis: Dict[str, Any],
+        routing_decisions: List[Dict[str, Any]],
+        raw_text: str,
+        source_type: SourceType,
+        metadata: Optional[Dict[str, Any]] = None,
+        case_id: Optional[str] = None,
+        attachments: Optional[List[Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """Run the specialists on routed tasks and build the process_input response"""
+        metadata = metadata or {}
+        attachments = attachments or []
+
+        normalized = analysis["normalized"]
+        entities = analysis["entities"]
+        pii_labels = analysis["pii_labels"]
+        detected_tasks = analysis["detected_tasks"]
 
         # Step 6: Execute specialists and get AI responses
         specialist_responses = await self._execute_specialists(
@@ -857,14 +950,32 @@ class TenderOrchestrator:
 
     def _record_processing(self, response: Dict[str, Any]):
         """Record processing in history for analytics"""
+        tasks_detected = len(response["detected_tasks"])
         self.processing_history.append({
             "processing_id": response["processing_id"],
             "case_id": response.get("case_id"),
             "source_type": response["source_type"],
-            "tasks_detected": len(response["detected_tasks"]),
+            "tasks_detected": tasks_detected,
             "processed_at": response["processed_at"]
         })
 
+        self._stats["total_processed"] += 1
+        self._stats["total_tasks"] += tasks_detected
+        self._stats["by_source"][response["source_type"]] += 1
+
+    async def record_approval(self, approval_record: Dict[str, Any]):
+        """
+        Notify the assigned specialist of an approval decision
+
+        Runs off the request path (see BackgroundQueue). Decisions aren't
+        stored anywhere yet.
+        """
+        # In production, would notify the specialist the task was routed to
+        print(
+            f"Approval recorded: task {approval_record['task_id']} "
+            f"{approval_record['approval_status']}"
+        )
+
     def get_processing_history(
         self,
         case_id: Optional[str] = None,
@@ -880,3 +991,38 @@ class TenderOrchestrator:
             history = self.processing_history
 
         return history[-limit:]
+
+    def iter_processing_history(
+        self,
+        case_id: Optional[str] = None,
+        limit: int = 100
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Yield the same records as get_processing_history, oldest first,
+        without building an intermediate list
+        """
+        history = self.processing_history
+
+        # Walk back to where the last `limit` matching records start
+        start, remaining = len(history), limit
+        while start > 0 and remaining > 0:
+            start -= 1
+            if not case_id or history[start].get("case_id") == case_id:
+                remaining -= 1
+
+        for index in range(start, len(history)):
+            record = history[index]
+            if not case_id or record.get("case_id") == case_id:
+                yield record
+
+    def get_stats_snapshot(self) -> Dict[str, Any]:
+        """Get processing statistics from the running totals"""
+        total_processed = self._stats["total_processed"]
+        total_tasks = self._stats["total_tasks"]
+
+        return {
+            "total_inputs_processed": total_processed,
+            "total_tasks_detected": total_tasks,
+            "average_tasks_per_input": round(total_tasks / total_processed, 2) if total_processed > 0 else 0,
+            "by_source_type": dict(self._stats["by_source"])
+        }
@@ -0,0 +1,124 @@
+"""
+Tests for IMAP FETCH response parsing in the email service
+"""
+from app.services.email_service import EmailService, _ImapPool, _parse_envelope, _parse_fetch_response
+
+
+STRUCTURE_RESPONSE = [
+    (
+        b'1 (UID 42 ENVELOPE ("Mon, 1 Jan 2024 10:00:00 +0000" {25}',
+        b"=?utf-8?q?W=C3=B6rld?= hi"
+    ),
+    b' (("John Doe" NIL "john" "example.com")) NIL NIL NIL NIL NIL NIL "<id@x>")'
+    b' BODYSTRUCTURE ("text" "plain" ("charset" "utf-8") NIL NIL "7bit" 11 1))',
+]
+BODY_RESPONSE = [(b"1 (UID 42 BODY[1]<0> {11}", b"Hello there"), b")"]
+
+
+class FakeImap:
+    """Serves canned FETCH responses in place of an IMAP connection"""
+
+    def __init__(self):
+        self.commands = []
+
+    def fetch(self, sequence_set, items):
+        self.commands.append(("FETCH", sequence_set, items))
+        return "OK", STRUCTURE_RESPONSE
+
+    def uid(self, command, uids, items):
+        self.commands.append((command, uids, items))
+        return "OK", BODY_RESPONSE
+
+
+def test_parse_envelope():
+    envelope = _parse_fetch_response(STRUCTURE_RESPONSE)[b"42"][b"ENVELOPE"]
+
+    assert _parse_envelope(envelope) == {
+        "subject": "Wörld hi",
+        "from": "John Doe <john@example.com>",
+        "date": "Mon, 1 Jan 2024 10:00:00 +0000"
+    }
+
+
+def test_parse_envelope_malformed():
+    assert _parse_envelope(None) is None
+    assert _parse_envelope([b"date"]) is None
+
+
+def test_fetch_range():
+    mail = FakeImap()
+
+    emails = EmailService()._fetch_range(mail, "1:1")
+
+    assert len(emails) == 1
+    assert emails[0]["id"] == "42"
+    assert emails[0]["subject"] == "Wörld hi"
+    assert emails[0]["from"] == "John Doe <john@example.com>"
+    assert emails[0]["body"] == "Hello there"
+    assert emails[0]["received_at"] == "2024-01-01T10:00:00+00:00"
+    # The ENVELOPE parsed, so no header fallback was fetched
+    assert [command[0] for command in mail.commands] == ["FETCH", "FETCH"]
+
+
+class FakeConnection:
+    def __init__(self):
+        self.logged_out = False
+
+    def logout(self):
+        self.logged_out = True
+
+
+def test_pool_drops_connection_on_any_error():
+    opened = []
+
+    def connect():
+        opened.append(FakeConnection())
+        return opened[-1]
+
+    pool = _ImapPool(connect, max_size=1)
+    try:
+        with pool.connection():
+            raise ValueError("bad SELECT response")
+    except ValueError:
+        pass
+
+    assert opened[0].logged_out
+    # A failed connection isn't reused, and its slot is free again
+    with pool.connection() as mail:
+        assert mail is opened[1]
+
+
+class FakeInbox(FakeImap):
+    """FakeImap that reports a mailbox state on SELECT"""
+
+    def __init__(self, exists, uidnext):
+        super().__init__()
+        self.exists = exists
+        self.uidnext = uidnext
+
+    def select(self, mailbox):
+        return "OK", [str(self.exists).encode()]
+
+    def response(self, code):
+        return code, [b"1" if code == "UIDVALIDITY" else str(self.uidnext).encode()]
+
+
+def test_fetch_from_large_burst_fetches_only_limit():
+    service = EmailService()
+    service._fetch_from(FakeInbox(exists=10, uidnext=43), limit=5)
+
+    mail = FakeInbox(exists=10010, uidnext=10043)
+    service._fetch_from(mail, limit=5)
+
+    assert mail.commands[0][:2] == ("FETCH", "10006:10010")
+
+
+def test_fetch_from_unchanged_mailbox_skips_fetch():
+    service = EmailService()
+    service._fetch_from(FakeInbox(exists=1, uidnext=43), limit=5)
+
+    mail = FakeInbox(exists=1, uidnext=43)
+    emails = service._fetch_from(mail, limit=5)
+
+    assert mail.commands == []
+    assert [email["id"] for email in emails] == ["42"]
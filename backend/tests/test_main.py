@@ -0,0 +1,25 @@
+"""
+Tests for app-level error handling in main.py
+"""
+from fastapi.testclient import TestClient
+
+import main
+from api.routers import orchestrator_endpoints
+
+
+def test_unhandled_error_keeps_cors_headers(monkeypatch):
+    async def fail(item):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(orchestrator_endpoints.input_batcher, "submit", fail)
+    client = TestClient(main.app, raise_server_exceptions=False)
+
+    response = client.post(
+        "/api/orchestrator/process",
+        json={"raw_text": "Client called about the MRI bill", "source_type": "email"},
+        headers={"Origin": "http://localhost:3000"}
+    )
+
+    assert response.status_code == 500
+    assert response.headers["access-control-allow-origin"] == "http://localhost:3000"
+    assert response.json()["detail"] == "boom"
@@ -0,0 +1,53 @@
+"""
+Tests that the specialists' regexes match the same text with RE2 and re
+"""
+import re
+
+from app.specialists import evidence_sorter
+
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+
+SAMPLES = [
+    "Invoice dated 1/2/2024 for $1,250.00 after the crash",
+    # Non-ASCII letters next to keywords, Arabic-Indic digits
+    "éinvoice crashé ١/٢/٢٠٢٤ $١٠٠ 3/4/2024",
+    "Café MRI résumé, x-ray and surgery; driving recklessly",
+]
+
+
+def _matches(pattern, text):
+    return [(match.lastgroup, match.group()) for match in pattern.finditer(text.lower())]
+
+
+def _assert_engines_agree(pattern):
+    if re2 is None:
+        return
+    ascii_re = re.compile(pattern.pattern, re.ASCII)
+    with_re2 = re2.compile(pattern.pattern)
+    for text in SAMPLES:
+        assert _matches(with_re2, text) == _matches(ascii_re, text)
+
+
+def test_scan_uses_ascii_word_boundaries_and_digits():
+    assert _matches(evidence_sorter._RE_SCAN, SAMPLES[1]) == [
+        ("word", "invoice"),
+        ("word", "crash"),
+        ("date", "3/4/2024"),
+    ]
+
+
+def test_scan_engines_agree():
+    _assert_engines_agree(evidence_sorter._RE_SCAN)
+
+
+def test_issue_patterns_engines_agree():
+    from app.specialists import legal_researcher
+    _assert_engines_agree(legal_researcher._RE_ISSUES)
+
+
+def test_simhash_words_split_on_unicode_letters():
+    assert evidence_sorter._RE_WORD.findall("café résumé") == ["café", "résumé"]